@@ -0,0 +1,158 @@
+import numpy
+
+def erlangB(load, servers):
+    """ Blocking probability of an M/M/c/c system by the Erlang B recursion
+        B(0) = 1,  B(k) = a B(k-1) / (k + a B(k-1))
+    which stays within [0, 1] and so cannot overflow for any number of servers.
+    The loads and server counts may be NumPy arrays, which are broadcast
+    against one another.
+
+    Params:
+        - load :: The offered load, the arrival rate over the departure rate.
+        - servers :: The number of servers of the system.
+
+    Returns:
+        - float or ndarray :: Blocking probability of each system.
+    """
+    load, servers = numpy.broadcast_arrays(numpy.asarray(load, dtype=float),
+                                           numpy.asarray(servers))
+    blocking = numpy.ones(load.shape)
+    for k in range(1, int(servers.max(initial=0)) + 1):
+        step = load*blocking
+        blocking = numpy.where(k <= servers, step/(k + step), blocking)
+    return blocking if blocking.ndim else float(blocking)
+
+def erlangUtilisation(load, servers):
+    """ The mean number of busy servers of an M/M/c/c system, the load carried
+    by the servers once blocked arrivals are removed.
+
+    Params:
+        - load :: The offered load, the arrival rate over the departure rate.
+        - servers :: The number of servers of the system.
+
+    Returns:
+        - float or ndarray :: Mean number of busy servers of each system.
+    """
+    return numpy.asarray(load)*(1 - erlangB(load, servers))
+
+def erlangDistribution(load: float, servers: int) -> numpy.ndarray:
+    """ Stationary distribution of the number of busy servers of an M/M/c/c
+    system, the Poisson distribution truncated at the number of servers
+        pi(n) = (a^n / n!) / sum_k (a^k / k!)
+    evaluated in log space so that large loads and server counts do not
+    overflow. Comparable with MMCC.occupancyDistribution.
+
+    Params:
+        - load :: The offered load, the arrival rate over the departure rate.
+        - servers :: The number of servers of the system.
+
+    Returns:
+        - ndarray :: Probability of each number of busy servers, 0 to servers.
+    """
+    busy = numpy.arange(servers + 1)
+    if load <= 0:   # Never busy, log(0) would give NaN weights
+        return (busy == 0).astype(float)
+    weights = busy*numpy.log(load) - numpy.cumsum(numpy.log(numpy.maximum(busy, 1)))
+    weights = numpy.exp(weights - weights.max())
+    return weights/weights.sum()
+
+def guardChannel(servers, threshold, handover_rate, newcall_rate, departure_rate):
+    """ Exact blocking probabilities of the M1+M2/M/c/c handover reservation
+    (guard channel) system. New calls are admitted while more than threshold
+    servers are free, hand overs while any server is free. The number of busy
+    servers is a birth-death process, and the stationary distribution is solved
+    with the Erlang B style recursion
+        b(0) = 1,  b(n) = l(n-1) b(n-1) / (n mu + l(n-1) b(n-1))
+    where b(n) is pi(n) over the probability of n or fewer busy servers and
+    l(n) is the admitted arrival rate with n busy servers. The hand over
+    blocking is b(c), and the probability of fewer than c - threshold busy
+    servers is the product of 1 - b(n) over the remaining states, accumulated
+    in log space. Nothing overflows for any number of servers.
+
+    All parameters may be NumPy arrays and are broadcast together; memory is
+    linear in the number of systems, not in the number of servers.
+
+    Params:
+        - servers :: The number of servers of the system.
+        - threshold :: The number of servers reserved for hand overs.
+        - handover_rate :: The hand over arrival rate.
+        - newcall_rate :: The new call arrival rate.
+        - departure_rate :: The departure rate of a call.
+
+    Returns:
+        - tuple :: Hand over blocking and new call blocking probabilities.
+    """
+    servers, threshold, handover_rate, newcall_rate, departure_rate = \
+        numpy.broadcast_arrays(*[numpy.asarray(p, dtype=float) for p in
+            (servers, threshold, handover_rate, newcall_rate, departure_rate)])
+
+    limit = servers - threshold          # Occupancy from which new calls block
+    total_rate = handover_rate + newcall_rate
+
+    ratio = numpy.ones(servers.shape)    # b(n), starting from b(0)
+    log_admit = numpy.where(limit <= 0, -numpy.inf, 0.0) # Log P(n < limit)
+
+    for n in range(1, int(servers.max(initial=0)) + 1):
+        active = n <= servers
+        arrival = numpy.where(n - 1 < limit, total_rate, handover_rate)*ratio
+        ratio = numpy.where(active, arrival/(arrival + n*departure_rate), ratio)
+        log_admit += numpy.where(active & (n >= limit), numpy.log1p(-ratio), 0.0)
+
+    handover, newcall = ratio, -numpy.expm1(log_admit)
+    if not servers.ndim:
+        return float(handover), float(newcall)
+    return handover, newcall
+
+def aggregatedBlocking(servers, threshold, handover_rate, newcall_rate, departure_rate):
+    """ The aggregated blocking probability of the guard channel system, the
+    new call blocking plus ten times the hand over blocking, as reported by
+    M1M2CC.blockingProbability.
+
+    Params:
+        - servers :: The number of servers of the system.
+        - threshold :: The number of servers reserved for hand overs.
+        - handover_rate :: The hand over arrival rate.
+        - newcall_rate :: The new call arrival rate.
+        - departure_rate :: The departure rate of a call.
+
+    Returns:
+        - float or ndarray :: Aggregated blocking probability of each system.
+    """
+    handover, newcall = guardChannel(servers, threshold, handover_rate,
+                                     newcall_rate, departure_rate)
+    return newcall + 10*handover
+
+def handoverFixedPoint(servers: int, threshold: int, newcall_rate: float,
+                       departure_rate: float, mobility_rate: float,
+                       tolerance: float = 1e-12, iterations: int = 10000) -> tuple:
+    """ The hand over arrival rate of a cell of a homogeneous network of guard
+    channel cells, as simulated by Network. A call occupies its cell for an
+    exponential time of rate departure_rate + mobility_rate, after which it
+    hands over with probability mobility_rate over that rate, so in balance
+    the hand over rate into a cell equals the mean number of busy servers times
+    the mobility rate. The rate is found by iterating this balance, each step
+    solving the cell with guardChannel.
+
+    Params:
+        - servers :: The number of servers of each cell.
+        - threshold :: The number of servers reserved for hand overs.
+        - newcall_rate :: The new call arrival rate of each cell.
+        - departure_rate :: The rate at which calls end.
+        - mobility_rate :: The rate at which users leave their cell.
+        - tolerance :: The relative change in rate at which to stop.
+        - iterations :: The largest number of iterations.
+
+    Returns:
+        - tuple :: The hand over arrival rate, the hand over blocking and the
+                   new call blocking probabilities of a cell.
+    """
+    residence = departure_rate + mobility_rate
+    handover_rate = 0.0
+    for _ in range(iterations):
+        handover, newcall = guardChannel(servers, threshold, handover_rate,
+                                         newcall_rate, residence)
+        busy = (newcall_rate*(1 - newcall) + handover_rate*(1 - handover))/residence
+        rate, handover_rate = handover_rate, busy*mobility_rate
+        if abs(handover_rate - rate) <= tolerance*handover_rate:
+            break
+    return handover_rate, handover, newcall
@@ -0,0 +1,134 @@
+import numpy
+
+from Event import HANDOVER, NEWCALL
+from Streams import Streams
+
+class BatchCC:
+    """ Simulation object conducting many independent M1+M2/M/c/c guard channel
+    systems at once, MMCC systems being those without hand overs. With
+    exponential times the state of a system is only its number of busy
+    servers, so no events or server ids are needed: every step draws the next
+    transition of each system from its current rates, hand over arrival, new
+    call arrival or departure, together with the exponential time to it. All
+    systems are advanced by the same NumPy operations on arrays indexed by
+    system, so the Python work of a step is shared by the whole batch.
+
+    As in M1M2CC, each system stops at its total_arrival-th arrival, the first
+    arrival being placed at time zero.
+    """
+
+    def run(self, total_servers, total_arrival, threshold = 0, handover_rate = 0.0,
+            newcall_rate = 0.1, departure_rate = 0.01, seed = None,
+            block: int = 256) -> None:
+        """ Begin the simulation of the batch. Every parameter may be given for
+        all systems or as an array with one value per system, the number of
+        systems being the length of the arrays after broadcasting.
+
+        Params:
+            - total_servers :: The number of servers of each system.
+            - total_arrival :: The number of arrivals of each system.
+            - threshold :: The number of servers reserved for hand overs.
+            - handover_rate :: The hand over arrival rate, zero for MMCC.
+            - newcall_rate :: The new call arrival rate, the arrival rate of
+                              MMCC systems.
+            - departure_rate :: The departure rate of a call.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+            - block :: The number of steps whose variates are drawn at a time.
+        """
+        servers, arrivals_total, threshold, handover_rate, newcall_rate, departure_rate = \
+            numpy.broadcast_arrays(*[numpy.atleast_1d(numpy.asarray(p)) for p in
+                (total_servers, total_arrival, threshold, handover_rate,
+                 newcall_rate, departure_rate)])
+        systems = len(servers)
+
+        streams = seed if isinstance(seed, Streams) else Streams(seed)
+        uniforms, exponentials = streams.arrival.generator, streams.service.generator
+
+        limit = servers - threshold              # Occupancy blocking new calls
+        arrival_rate = handover_rate + newcall_rate
+
+        busy = numpy.zeros(systems, dtype=numpy.int64)
+        arrived = numpy.zeros((2, systems), dtype=numpy.int64) # By path
+        blocked = numpy.zeros((2, systems), dtype=numpy.int64) # By path
+        area = numpy.zeros(systems)      # Time integral of the busy servers
+        clock = numpy.zeros(systems)     # Time of the latest arrival
+        time = numpy.zeros(systems)      # Time of the latest event
+        active = numpy.arange(systems)   # Systems yet to see every arrival
+
+        while len(active):
+            u = uniforms.random((block, len(active)))
+            e = exponentials.standard_exponential((block, len(active)))
+
+            for step in range(block):
+                n = busy[active]
+                hrate, arate = handover_rate[active], arrival_rate[active]
+                rate = arate + n*departure_rate[active]
+
+                # The first arrival of every system is placed at time zero
+                count = arrived[HANDOVER, active] + arrived[NEWCALL, active]
+                elapsed = numpy.where(count > 0, e[step]/rate, 0.0)
+                area[active] += n*elapsed
+                time[active] += elapsed
+
+                pick = u[step]*rate
+                handover = pick < hrate
+                newcall = ~handover & (pick < arate)
+                departure = ~(handover | newcall)
+
+                admitted = (handover & (n < servers[active])) | (newcall & (n < limit[active]))
+                busy[active] = n + admitted - departure
+
+                arrival = handover | newcall
+                arrived[HANDOVER, active] += handover
+                arrived[NEWCALL, active] += newcall
+                blocked[HANDOVER, active] += handover & ~admitted
+                blocked[NEWCALL, active] += newcall & ~admitted
+                clock[active] = numpy.where(arrival, time[active], clock[active])
+
+                done = count + arrival >= arrivals_total[active]
+                if done.any():
+                    active = active[~done]
+                    break
+
+        self.systems = systems
+        self.arrived, self.blocked = arrived, blocked
+        self.num_arrival = arrived.sum(axis=0)
+        self.num_blocked = blocked.sum(axis=0)
+        self.num_busy = busy
+        self.sim_time = clock
+        self.busy_area = area
+
+    def blockingProbability(self) -> numpy.ndarray:
+        """ Calculate the blocking probability of each system, aggregated as in
+        M1M2CC: the new call blocking plus ten times the hand over blocking. For
+        MMCC systems, without hand overs, this is the plain blocking.
+
+        Returns:
+            - ndarray :: Probability of blocking of each system.
+        """
+        rates = numpy.divide(self.blocked, self.arrived, out = numpy.zeros(self.blocked.shape),
+                             where = self.arrived > 0)
+        return rates[NEWCALL] + 10*rates[HANDOVER]
+
+    def serverUtilisation(self) -> numpy.ndarray:
+        """ Calculate the server utilisation of each system, the time averaged
+        number of busy servers up to its final arrival.
+
+        Returns:
+            - ndarray :: Server utilisation of each system.
+        """
+        return numpy.divide(self.busy_area, self.sim_time, out = numpy.zeros(self.systems),
+                            where = self.sim_time > 0)
+
+    def report(self) -> None:
+        """ Display a summary of the batch in a readible fashion. """
+
+        blocking, utilisation = self.blockingProbability(), self.serverUtilisation()
+        print("\tSystems:", self.systems)
+        print("\tArrivals:", int(self.num_arrival.sum()))
+        print("\tBlocked:", int(self.num_blocked.sum()))
+        print("\tBlocking rate (min, mean, max):",
+              blocking.min(), blocking.mean(), blocking.max())
+        print("\tServer Utilisation (min, mean, max):",
+              utilisation.min(), utilisation.mean(), utilisation.max())
@@ -0,0 +1,411 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy
+
+from Event import Event, ARRIVAL
+from EventHandler import EventHandler
+from Servers import Servers
+
+# Directory of the simulation modules, the working directory of measured runs
+SOURCE = os.path.dirname(os.path.abspath(__file__))
+
+# Settings covered by the simulation benchmarks. The load is the offered load
+# per server, so that the systems are equally stressed at every size. Each
+# measurement is repeated and the median kept, to suppress scheduling noise;
+# the quick suite runs long enough for its medians to be stable between runs,
+# the full suite short enough to be run routinely.
+SUITES = {
+    "full": {"servers": (16, 256, 4096), "loads": (0.5, 0.9, 1.1),
+             "arrivals": (2*10**5,), "operations": 10**5, "repeats": 5},
+    "quick": {"servers": (16, 256), "loads": (0.9,),
+              "arrivals": (10**5,), "operations": 10**5, "repeats": 5}
+}
+
+# Longest time in seconds a run from the command line may take to start and
+# finish a single arrival, on a warm file system cache
+COLD_START_BUDGET = 0.3
+
+# Command lines whose start up is measured against the budget
+COLD_STARTS = {
+    "MMCC": ["Command.py", "MMCC", "--servers", "16", "--arrivals", "1"],
+    "M1M2CC": ["Command.py", "M1M2CC", "--servers", "16", "--arrivals", "1",
+               "--threshold", "2"]
+}
+
+def withoutSlots(cls: type, name: str) -> type:
+    """ A copy of a slotted class, with the same methods and class attributes,
+    whose instances keep their fields in a per instance dictionary instead.
+
+    Params:
+        - cls :: The slotted class.
+        - name :: The name of the copy.
+
+    Returns:
+        - type :: The class without slots.
+    """
+    dropped = set(cls.__slots__) | {"__slots__", "__dict__", "__weakref__"}
+    return type(name, (), {key: value for key, value in vars(cls).items()
+                           if key not in dropped})
+
+# Events keeping their fields in a dictionary, as every event did before slots
+# were introduced. Used to measure the saving of the compact layout.
+DictEvent = withoutSlots(Event, "DictEvent")
+
+class ListEventHandler(EventHandler):
+    """ The original sorted list event handler, kept as a reference point for
+    the benchmarks. Insertion is a linear scan and removal copies the list.
+    """
+
+    def add(self, event: Event) -> None:
+        """ Add a new event by scanning for its position in the sorted list.
+
+        Params:
+            - event :: Event to be stored in the list
+        """
+        for i, e in enumerate(self.container):
+            if e.time() > event.time():
+                self.container.insert(i, event)
+                return
+        self.container.append(event)
+
+    def next(self) -> Event:
+        """ Remove the next event by slicing the front off of the list.
+
+        Returns:
+            - Event :: The next event to be enacted in the simulation
+        """
+        e = self.container[0]
+        self.container = self.container[1:]
+        return e
+
+def holdEventList(handler: EventHandler, pending: int, operations: int) -> float:
+    """ Time the classic hold model on an event handler: the list is filled
+    with a number of pending events, then each operation removes the next
+    event and schedules a replacement in its future.
+
+    Params:
+        - handler :: An empty event handler to be measured.
+        - pending :: The number of events held in the list, one per busy server.
+        - operations :: The number of next/add pairs to be timed.
+
+    Returns:
+        - float :: Average time in seconds of a single next/add pair.
+    """
+
+    # Fill the list, one pending departure per server
+    for _ in range(pending):
+        handler.add(Event(ARRIVAL, 0))
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        event = handler.next()
+        handler.add(Event(ARRIVAL, event.time()))
+    return (time.perf_counter() - start)/operations
+
+def benchmarkEventList(server_counts = (16, 256, 4096), operations: int = 20000) -> None:
+    """ Compare the heap based event handler against the original list based
+    handler for a range of server counts, printing the cost per event.
+
+    Params:
+        - server_counts :: The number of pending events to test the lists with.
+        - operations :: The number of next/add pairs to time for each setting.
+    """
+
+    print("Event list hold benchmark (microseconds per event):")
+    print("\t{:>8} {:>12} {:>12} {:>8}".format("servers", "list", "heap", "speedup"))
+    for servers in server_counts:
+        old = holdEventList(ListEventHandler(), servers, operations)*1e6
+        new = holdEventList(EventHandler(), servers, operations)*1e6
+        print("\t{:>8} {:>12.3f} {:>12.3f} {:>8.1f}".format(servers, old, new, old/new))
+
+def allocationPerEvent(eventClass: type, count: int = 100000) -> float:
+    """ Measure the memory allocated for each event object of a given class.
+
+    Params:
+        - eventClass :: The event class to construct.
+        - count :: The number of events held alive while measuring.
+
+    Returns:
+        - float :: The average number of bytes allocated per event.
+    """
+    tracemalloc.start()
+    events = [eventClass(ARRIVAL, 0) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size/len(events)
+
+def peakMemory(arrivals: int, compact: bool = True, retain: bool = False) -> int:
+    """ Run a MMCC simulation in a fresh interpreter and report its peak
+    resident set size, so that measurements do not interfere.
+
+    Params:
+        - arrivals :: The number of arrivals to simulate.
+        - compact :: Use the slotted events, otherwise events with a dictionary.
+        - retain :: Keep every departed and blocked event during the run.
+
+    Returns:
+        - int :: Peak resident set size of the run in kilobytes.
+    """
+    script = "\n".join([
+        "import resource, Simulation, Benchmark",
+        "if not {}: Simulation.Event = Benchmark.DictEvent".format(compact),
+        "Simulation.MMCC().run(16, {}, retain={})".format(arrivals, retain),
+        "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    ])
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                            text=True, check=True, cwd=SOURCE)
+    return int(output.stdout.split()[-1])
+
+def benchmarkEventMemory(arrivals: int = 10**7, retain: bool = False) -> None:
+    """ Compare the memory used by slotted events against dictionary events,
+    per event object and as the peak resident set size of a full run.
+
+    Params:
+        - arrivals :: The number of arrivals of the measured MMCC runs.
+        - retain :: Keep every departed and blocked event during the runs.
+    """
+
+    print("Event memory benchmark:")
+    print("\t{:>10} {:>12} {:>12}".format("", "dict", "slots"))
+    print("\t{:>10} {:>12.1f} {:>12.1f}".format("bytes", allocationPerEvent(DictEvent),
+                                               allocationPerEvent(Event)))
+    print("\t{:>10} {:>12} {:>12}".format("peak kB", peakMemory(arrivals, False, retain),
+                                         peakMemory(arrivals, True, retain)))
+
+def holdServers(servers: Servers, operations: int) -> float:
+    """ Time allocate/deallocate pairs on a half occupied server pool.
+
+    Params:
+        - servers :: A server pool with every server free.
+        - operations :: The number of allocate/deallocate pairs to be timed.
+
+    Returns:
+        - float :: Average time in seconds of a single allocate/deallocate pair.
+    """
+    busy = [servers.allocate() for _ in range(len(servers)//2)]
+
+    start = time.perf_counter()
+    for i in range(operations):
+        servers.deallocate(busy[i % len(busy)])
+        busy[i % len(busy)] = servers.allocate()
+    return (time.perf_counter() - start)/operations
+
+def measureRun(model: str, params: dict) -> dict:
+    """ Run a simulation in a fresh interpreter, measuring its throughput and
+    its peak resident set size in isolation from the other benchmarks.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - params :: The run parameters of the simulation.
+
+    Returns:
+        - dict :: The run time, events processed, events per second and peak
+                  memory of the run.
+    """
+    script = "\n".join([
+        "import json, resource, time, Sweep",
+        "machine = Sweep.models[{!r}]()".format(model),
+        "start = time.perf_counter()",
+        "machine.run(**{!r})".format(params),
+        "seconds = time.perf_counter() - start",
+        "stats = machine.events.stats",
+        "print(json.dumps({'seconds': seconds, 'events': stats.arrivals + stats.departed,",
+        "    'peak_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))"
+    ])
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                            text=True, check=True, cwd=SOURCE)
+    result = json.loads(output.stdout.splitlines()[-1])
+    result["events_per_second"] = result["events"]/result["seconds"]
+    return result
+
+def coldStart(argv: list, repeats: int = 5) -> float:
+    """ Time a command in a fresh interpreter from launch to exit, covering the
+    interpreter start up and every module it imports.
+
+    Params:
+        - argv :: The arguments given to the interpreter.
+        - repeats :: The number of launches, the fastest is kept.
+
+    Returns:
+        - float :: The wall time of the fastest launch in seconds.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, capture_output=True, check=True, cwd=SOURCE)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def checkColdStart(budget: float = COLD_START_BUDGET) -> bool:
+    """ Measure the start up of the command line runs against a budget.
+
+    Params:
+        - budget :: The longest start up allowed, in seconds.
+
+    Returns:
+        - bool :: Whether every command started within the budget.
+    """
+    within = True
+    print("Cold start benchmark (budget {:.3f}s):".format(budget))
+    for name, argv in COLD_STARTS.items():
+        seconds = coldStart(argv)
+        within = within and seconds <= budget
+        print("\t{:>10} {:>8.3f}s {}".format(name, seconds,
+                                             "ok" if seconds <= budget else "over budget"))
+    return within
+
+def middle(measurements: list, key = None):
+    """ The median of an odd number of measurements, the middle one once
+    sorted, so that a single slow or fast repeat does not move the result.
+
+    Params:
+        - measurements :: The measurements of the repeats.
+        - key :: Function giving the value a measurement is ordered by.
+
+    Returns:
+        - object :: The median measurement.
+    """
+    return sorted(measurements, key = key)[len(measurements)//2]
+
+def runSuite(suite: str = "full", seed: int = 1) -> dict:
+    """ Run the benchmark suite: the event list and server pool on their own,
+    the start up of the command line, then MMCC and M1M2CC runs over the server
+    counts, loads and arrival totals of the suite. Every run is seeded, so that
+    the work measured is identical between versions.
+
+    Params:
+        - suite :: The name of the settings to cover, a key of SUITES.
+        - seed :: The seed of every simulation run.
+
+    Returns:
+        - dict :: The environment of the benchmark and a list of results.
+    """
+    settings = SUITES[suite]
+    repeats = settings["repeats"]
+    results = []
+
+    def record(name: str, params: dict, metrics: dict) -> None:
+        results.append({"name": name, "params": params, "metrics": metrics})
+        print(name, params, {k: round(v, 3) for k, v in metrics.items()})
+
+    for servers in settings["servers"]:
+        seconds = middle([holdEventList(EventHandler(), servers, settings["operations"])
+                          for _ in range(repeats)])
+        record("EventHandler.add/next", {"pending": servers},
+               {"microseconds": seconds*1e6})
+
+        for policy in Servers.policies:
+            seconds = middle([holdServers(Servers(servers, policy), settings["operations"])
+                              for _ in range(repeats)])
+            record("Servers.allocate/deallocate", {"servers": servers, "policy": policy},
+                   {"microseconds": seconds*1e6})
+
+    for name, argv in COLD_STARTS.items():
+        record("Command cold start", {"model": name},
+               {"microseconds": coldStart(argv, repeats)*1e6})
+
+    for servers in settings["servers"]:
+        for load in settings["loads"]:
+            for arrivals in settings["arrivals"]:
+                rate = load*servers*0.01 # Offered load of the servers at mu = 0.01
+                common = dict(total_servers = servers, total_arrival = arrivals,
+                              departure_rate = 0.01, retain = False, seed = seed)
+
+                params = dict(common, arrival_rate = rate)
+                record("MMCC.run", params, middle([measureRun("MMCC", params)
+                       for _ in range(repeats)], key = lambda m: m["seconds"]))
+
+                params = dict(common, threshold = 2, handover_rate = rate/2,
+                              newcall_rate = rate/2)
+                record("M1M2CC.run", params, middle([measureRun("M1M2CC", params)
+                       for _ in range(repeats)], key = lambda m: m["seconds"]))
+
+    return {
+        "environment": {
+            "suite": suite,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+def compareResults(baseline: dict, current: dict, tolerance: float = 0.1) -> list:
+    """ Compare two benchmark result files, reporting every measurement that
+    became slower than the baseline by more than the tolerance.
+
+    Params:
+        - baseline :: The results of the reference version.
+        - current :: The results of the version being checked.
+        - tolerance :: The relative slow down allowed before reporting.
+
+    Returns:
+        - list :: A description of each regression found.
+    """
+    reference = {(r["name"], json.dumps(r["params"], sort_keys=True)): r["metrics"]
+                 for r in baseline["results"]}
+
+    regressions = []
+    for result in current["results"]:
+        metrics = reference.get((result["name"], json.dumps(result["params"], sort_keys=True)))
+        if metrics is None:
+            continue
+
+        # Work out the slow down of the measurement, as a ratio of the costs
+        if "microseconds" in metrics:
+            ratio = result["metrics"]["microseconds"]/metrics["microseconds"]
+        else:
+            ratio = metrics["events_per_second"]/result["metrics"]["events_per_second"]
+
+        if ratio > 1 + tolerance:
+            regressions.append("{} {}: {:.1%} slower".format(result["name"],
+                                                             result["params"], ratio - 1))
+    return regressions
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the simulation core")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="full",
+                        help="the settings covered by the benchmark")
+    parser.add_argument("--output", default="benchmark.json",
+                        help="file the results are written to")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="results file to check the new results against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slow down reported as a regression")
+    parser.add_argument("--event-list", action="store_true",
+                        help="compare the heap event list to the original list")
+    parser.add_argument("--event-memory", type=int, metavar="ARRIVALS",
+                        help="compare slotted to dictionary events over a run")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="check the command line start up against its budget")
+    args = parser.parse_args()
+
+    if args.cold_start:
+        sys.exit(0 if checkColdStart() else 1)
+    if args.event_list:
+        benchmarkEventList()
+    if args.event_memory:
+        benchmarkEventMemory(args.event_memory)
+    if args.event_list or args.event_memory:
+        sys.exit()
+
+    results = runSuite(args.suite)
+    with open(args.output, "w") as handle:
+        json.dump(results, handle, indent=1)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compareResults(json.load(handle), results, args.tolerance)
+        for regression in regressions:
+            print("Regression:", regression)
+        sys.exit(1 if regressions else 0)
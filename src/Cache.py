@@ -0,0 +1,271 @@
+from concurrent.futures import Future
+import hashlib
+import json
+from numbers import Integral
+import os
+import pickle
+import threading
+import time
+
+SOURCE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose source decides the results of a run
+MODULES = ("Event", "EventHandler", "Servers", "Simulation", "Statistics", "Streams",
+           "VectorSimulation", "Warmup", "Distributions", "Network", "Markov")
+
+_version = None
+
+def codeVersion() -> str:
+    """ Digest of the source of the simulation modules, so that changing the
+    code of the simulation invalidates every cached result.
+
+    Returns:
+        - str :: Hexadecimal digest of the simulation source.
+    """
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        for name in MODULES:
+            with open(os.path.join(SOURCE, name + ".py"), "rb") as file:
+                digest.update(file.read())
+        _version = digest.hexdigest()
+    return _version
+
+class Cache:
+    """ Persistent on disk cache of finished simulation runs, addressed by the
+    digest of the model, its run parameters, the seed and the version of the
+    simulation code. Each entry is the pickled machine after its run, so a hit
+    gives back the same statistics, reports and results as running again.
+
+    The cache is bounded in size: entries are touched when read and the least
+    recently used are evicted once the total exceeds the limit. A run that is
+    already in flight is shared rather than repeated, whether it is being run
+    by another thread, through an in process future, or by another process,
+    through a lock file beside the entry.
+
+    Only runs given an integer seed are reproducible and so cached, others are
+    simply run.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = 2**28,
+                 poll: float = 0.05):
+        """ Initialise the cache, creating its directory if needed.
+
+        Params:
+            - directory :: The directory of the entries, taken from the
+                           SIMULATION_CACHE environment variable or
+                           ~/.cache/simulation if None.
+            - max_bytes :: The total size of the entries kept.
+            - poll :: The seconds between checks on runs in other processes.
+        """
+        self.directory = directory or os.environ.get("SIMULATION_CACHE") or \
+                         os.path.join(os.path.expanduser("~"), ".cache", "simulation")
+        self.max_bytes = max_bytes
+        self.poll = poll
+        os.makedirs(self.directory, exist_ok = True)
+
+        self.lock = threading.Lock()
+        self.pending = {}   # Futures of the runs in flight in this process, by key
+
+    def __getstate__(self) -> dict:
+        """ Protected function giving the state sent to worker processes,
+        without the in process locks and futures.
+        """
+        return {"directory": self.directory, "max_bytes": self.max_bytes, "poll": self.poll}
+
+    def __setstate__(self, state: dict) -> None:
+        """ Protected function restoring the cache within a worker process. """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def key(self, model: type, seed: int, params: dict) -> str:
+        """ The address of a run.
+
+        Params:
+            - model :: The class of the simulation machine.
+            - seed :: The integer seed of the run.
+            - params :: The other run parameters.
+
+        Returns:
+            - str :: Hexadecimal digest identifying the run.
+        """
+        content = json.dumps({"model": model.__name__, "seed": seed, "params": params,
+                              "version": codeVersion()},
+                             sort_keys = True, default = lambda value: value.item()
+                             if hasattr(value, "item") else repr(value))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        """ The file of an entry """
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key: str):
+        """ Read an entry, marking it as recently used.
+
+        Params:
+            - key :: The address of the run.
+
+        Returns:
+            - object :: The machine of the run, None on a miss.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                machine = pickle.load(file)
+            os.utime(path)
+            return machine
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key: str, machine) -> None:
+        """ Write an entry atomically, evicting the least recently used entries
+        should the cache have outgrown its limit.
+
+        Params:
+            - key :: The address of the run.
+            - machine :: The machine after its run.
+        """
+        path = self.path(key)
+        temporary = path + "." + str(os.getpid()) + ".tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(machine, file, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """ Remove the least recently used entries until the cache fits. """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes: break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def run(self, model: type, seed = None, **params):
+        """ Give the machine of a run, from the cache when it has been run
+        before, otherwise running it and storing the result. Equal runs in
+        flight elsewhere are waited on rather than repeated. Event simulations
+        should be given retain = False: the whole machine is stored, so every
+        retained event would be pickled into the entry, filling the cache
+        about ten times faster.
+
+        Params:
+            - model :: The class of the simulation machine.
+            - seed :: The seed of the run, only integer seeds are cached.
+            - params :: The other run parameters.
+
+        Returns:
+            - object :: The machine after its run, with a cached attribute
+                        telling whether it came from the cache.
+        """
+        if not isinstance(seed, Integral) or any(params.get(option) for option in
+                                                   ("instrument", "checkpoint", "trace", "source")):
+            machine = model()
+            machine.run(seed = seed, **params)
+            machine.cached = False
+            return machine
+
+        seed = int(seed)
+        key = self.key(model, seed, params)
+        with self.lock:
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.pending[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            machine = self.compute(key, model, seed, params)
+            future.set_result(machine)
+            return machine
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self.lock:
+                del self.pending[key]
+
+    def compute(self, key: str, model: type, seed: int, params: dict):
+        """ Read or run an entry, holding its lock file while running so that
+        other processes wait for the result instead of running it as well.
+        """
+        lock = self.path(key) + ".lock"
+        while True:
+            machine = self.get(key)
+            if machine is not None:
+                machine.cached = True
+                return machine
+
+            try:
+                descriptor = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self.alive(lock):
+                    self.release(lock)
+                time.sleep(self.poll)
+                continue
+
+            try:
+                os.write(descriptor, str(os.getpid()).encode())
+                os.close(descriptor)
+
+                machine = self.get(key) # May have finished before the lock was taken
+                if machine is not None:
+                    machine.cached = True
+                    return machine
+
+                machine = model()
+                machine.run(seed = seed, **params)
+                machine.cached = False
+                self.put(key, machine)
+                return machine
+            finally:
+                self.release(lock)
+
+    def alive(self, lock: str) -> bool:
+        """ Whether the process holding a lock file is still running.
+
+        Params:
+            - lock :: The path of the lock file.
+
+        Returns:
+            - bool :: False if the holder has died, True otherwise.
+        """
+        try:
+            with open(lock) as file:
+                pid = int(file.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return True     # Released, or the holder is yet to write its pid
+        if not pid:
+            return True
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def release(self, lock: str) -> None:
+        """ Remove a lock file, should it still exist """
+        try:
+            os.remove(lock)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """ Remove every entry of the cache """
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
@@ -0,0 +1,113 @@
+import copyreg
+import os
+import pickle
+import random
+
+from EventHandler import EventHandler, M1M2EventHandler
+
+VERSION = 2 # Format of the checkpoint files written
+
+# Collections of resolved events kept by handlers that retain them
+RETAINED = ("departed", "blocked", "hblocked", "nblocked")
+
+def compactHandler(handler: EventHandler) -> tuple:
+    """ Reduce an event handler for pickling without its retained events,
+    which play no part in the rest of the run.
+
+    Params:
+        - handler :: The event handler being pickled.
+
+    Returns:
+        - tuple :: The pickle reduction of the handler.
+    """
+    state = handler.__getstate__()
+    for name in RETAINED:
+        if name in state: state[name] = []
+    return copyreg.__newobj__, (type(handler),), state
+
+def save(machine, path: str) -> None:
+    """ Write a checkpoint of a simulation machine between events. Only the live
+    state of the run is pickled: the clock, the pending event list, the
+    servers, the streaming statistics, the random streams with their buffered
+    variates and the state
+    of the global random module, used by events without streams and by random
+    allocation without a generator. The file is replaced atomically, so a crash
+    while writing leaves the previous checkpoint intact.
+
+    Departed and blocked events retained by the run are left out, so the size
+    of a checkpoint does not grow with the length of the run; a resumed run
+    retains only the events resolved after its checkpoint.
+
+    Runs given an instrument, a trace or a source cannot be checkpointed, see
+    check().
+
+    Params:
+        - machine :: The simulation machine, part way through a run.
+        - path :: The file the checkpoint is written to.
+    """
+    state = {"version": VERSION, "machine": machine, "random": random.getstate()}
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        pickler = pickle.Pickler(file, protocol = pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = dict(copyreg.dispatch_table)
+        pickler.dispatch_table.update({EventHandler: compactHandler,
+                                       M1M2EventHandler: compactHandler})
+        pickler.dump(state)
+    os.replace(temporary, path)
+
+def check(checkpoint: str, instrument = None, trace = None, source = None) -> None:
+    """ Refuse a checkpointed run before it starts if it has components that
+    cannot be pickled: the wrappers of an instrument or trace, and the open
+    reader of a call source.
+
+    Params:
+        - checkpoint :: The file the run is to be checkpointed to, if any.
+        - instrument :: The Instrument of the run, if any.
+        - trace :: The TraceWriter of the run, if any.
+        - source :: The CallSource of the run, if any.
+    """
+    if not checkpoint: return
+    for name, component in (("an instrument", instrument), ("a trace", trace),
+                            ("a source", source)):
+        if component is not None:
+            raise ValueError("Runs given " + name + " cannot be checkpointed")
+
+def load(path: str):
+    """ Read a checkpoint, restoring the global random module to its state at
+    the time the checkpoint was written. The run continues bit for bit as it
+    would have without interruption once resumed.
+
+    Params:
+        - path :: The file of the checkpoint.
+
+    Returns:
+        - MMCC or M1M2CC :: The simulation machine, ready to be resumed.
+    """
+    with open(path, "rb") as file:
+        state = pickle.load(file)
+
+    if state.get("version") != VERSION:
+        raise ValueError("Unsupported checkpoint version: " + str(state.get("version")))
+
+    random.setstate(state["random"])
+    return state["machine"]
+
+def fork(machine, seed = None):
+    """ Copy a simulation machine part way through a run, so that what if runs
+    can be continued from a shared warmed up state. Without a seed the copy
+    draws the same random numbers as the original. The rates of the copy may
+    be changed before it is resumed.
+
+    Params:
+        - machine :: The simulation machine to be copied.
+        - seed :: An integer or SeedSequence for fresh random streams of the
+                  copy, the streams of the original are continued if None.
+
+    Returns:
+        - MMCC or M1M2CC :: The independent copy of the machine.
+    """
+    copy = pickle.loads(pickle.dumps(machine, protocol = pickle.HIGHEST_PROTOCOL))
+    if seed is not None:
+        copy.rates.reseed(seed)
+        copy.servers.use(copy.rates.streams.servers.generator)
+    return copy
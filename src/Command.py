@@ -0,0 +1,138 @@
+import argparse
+import csv
+from importlib import import_module
+import json
+import sys
+import time
+
+# Simulation machines that can be run, by name: the module of each machine,
+# imported only when the machine is run, its default run parameters and the
+# run parameters it takes from the command line
+MODELS = {
+    "MMCC": ("Simulation", "MMCC", {"retain": False},
+             ("total_servers", "total_arrival", "arrival_rate", "departure_rate", "policy")),
+    "M1M2CC": ("Simulation", "M1M2CC", {"retain": False},
+               ("total_servers", "total_arrival", "threshold", "handover_rate",
+                "newcall_rate", "departure_rate", "policy")),
+    "VectorMMCC": ("VectorSimulation", "VectorMMCC", {},
+                   ("total_servers", "total_arrival", "arrival_rate", "departure_rate")),
+    "MarkovCC": ("Markov", "MarkovCC", {},
+                 ("total_servers", "total_arrival", "threshold", "handover_rate",
+                  "newcall_rate", "departure_rate", "arrival_rate"))
+}
+
+# Command line options for the run parameters, by the name of the parameter
+OPTIONS = {
+    "total_servers": ("--servers", int, "number of servers"),
+    "total_arrival": ("--arrivals", int, "number of arrivals simulated"),
+    "threshold": ("--threshold", int, "servers reserved for hand overs (M1M2CC)"),
+    "arrival_rate": ("--arrival-rate", float, "arrival rate (MMCC)"),
+    "handover_rate": ("--handover-rate", float, "hand over arrival rate (M1M2CC)"),
+    "newcall_rate": ("--newcall-rate", float, "new call arrival rate (M1M2CC)"),
+    "departure_rate": ("--departure-rate", float, "departure rate of a call")
+}
+
+def machine(model: str):
+    """ Import and create a simulation machine.
+
+    Params:
+        - model :: The name of the simulation machine, a key of MODELS.
+
+    Returns:
+        - object :: A new simulation machine.
+    """
+    module, name = MODELS[model][:2]
+    return getattr(import_module(module), name)()
+
+def simulate(model: str, params: dict, runs: int = 1, seed: int = None) -> list:
+    """ Run a simulation a number of times, each run seeded independently from
+    a single root seed as in Sweep.sweep.
+
+    Params:
+        - model :: The name of the simulation machine, a key of MODELS.
+        - params :: The run parameters given, joined with the model's defaults.
+        - runs :: The number of runs.
+        - seed :: The root seed of the runs, a random root if None.
+
+    Returns:
+        - list :: A row of parameters and results per run.
+    """
+    from numpy.random import SeedSequence   # Loaded along with the machines
+
+    rows = []
+    for child in SeedSequence(seed).spawn(runs):
+        child = int(child.generate_state(1)[0])
+        system = machine(model)
+
+        start = time.perf_counter()
+        system.run(seed = child, **dict(MODELS[model][2], **params))
+        runtime = time.perf_counter() - start
+
+        rows.append(dict(params, model = model, seed = child, runtime = runtime,
+                         blocking = float(system.blockingProbability()),
+                         utilisation = float(system.serverUtilisation())))
+    return rows
+
+def write(rows: list, format: str, stream) -> None:
+    """ Write result rows as JSON lines or as CSV with a header.
+
+    Params:
+        - rows :: The rows of the runs, see simulate().
+        - format :: Either "json" or "csv".
+        - stream :: The file the rows are written to.
+    """
+    if format == "json":
+        for row in rows:
+            stream.write(json.dumps(row) + "\n")
+    else:
+        writer = csv.DictWriter(stream, fieldnames = list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv: list = None) -> int:
+    """ Run simulations from the command line, writing their results.
+
+    Params:
+        - argv :: The command line arguments, those of the process if None.
+
+    Returns:
+        - int :: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Run the MMCC and M1M2CC simulations")
+    parser.add_argument("model", choices=list(MODELS), help="the simulation machine run")
+    for name, (flag, kind, description) in OPTIONS.items():
+        parser.add_argument(flag, dest=name, type=kind, help=description,
+                            metavar="N" if kind is int else "RATE")
+    parser.add_argument("--policy", choices=("fifo", "lowest", "random"),
+                        help="order in which free servers are allocated (MMCC, M1M2CC)")
+    parser.add_argument("--seed", type=int, help="root seed of the runs")
+    parser.add_argument("--runs", type=int, default=1, help="number of independent runs")
+    parser.add_argument("--format", choices=("json", "csv"), default="json",
+                        help="format of the results, one row per run")
+    parser.add_argument("--output", help="file the results are written to, stdout if absent")
+    args = parser.parse_args(argv)
+
+    params = {name: getattr(args, name) for name in OPTIONS
+              if getattr(args, name) is not None}
+    if args.policy: params["policy"] = args.policy
+    for required in ("total_servers", "total_arrival"):
+        if required not in params:
+            parser.error(OPTIONS[required][0] + " is required")
+    if args.model == "M1M2CC" and "threshold" not in params:
+        parser.error("--threshold is required for M1M2CC")
+    for name in params:
+        if name not in MODELS[args.model][3]:
+            flag = OPTIONS[name][0] if name in OPTIONS else "--" + name
+            parser.error(flag + " is not taken by " + args.model)
+
+    rows = simulate(args.model, params, args.runs, args.seed)
+
+    if args.output:
+        with open(args.output, "w", newline="") as stream:
+            write(rows, args.format, stream)
+    else:
+        write(rows, args.format, sys.stdout)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+from abc import ABC, abstractmethod
+import hashlib
+from math import log, sqrt
+
+import numpy
+
+class Distribution(ABC):
+    """ The shape of a distribution of inter-arrival or service times. Every
+    distribution is scaled to a mean of one, the rates of a run then set the
+    scale, so that changing the distribution of a run changes only the shape of
+    its times and never their mean. Variates are sampled a block at a time from
+    the generator of a run's stream, without any per call Python work.
+    """
+
+    @abstractmethod
+    def sample(self, generator: numpy.random.Generator, size: int) -> numpy.ndarray:
+        """ Draw a block of variates with mean one.
+
+        Params:
+            - generator :: The generator of the stream being refilled.
+            - size :: The number of variates drawn.
+
+        Returns:
+            - ndarray :: The variates.
+        """
+
+    @abstractmethod
+    def scv(self) -> float:
+        """ The squared coefficient of variation, the variance of the unit mean
+        distribution.
+
+        Returns:
+            - float :: The squared coefficient of variation.
+        """
+
+    def __repr__(self) -> str:
+        return type(self).__name__ + "()"
+
+class Exponential(Distribution):
+    """ Exponential times, giving Poisson arrivals and Markovian services """
+
+    def sample(self, generator, size):
+        return generator.standard_exponential(size)
+
+    def scv(self) -> float:
+        return 1.0
+
+class Erlang(Distribution):
+    """ Erlang times, the sum of k exponential phases, less variable than
+    exponential times for k above one.
+    """
+
+    def __init__(self, k: int):
+        """ Initialise the distribution.
+
+        Params:
+            - k :: The number of phases.
+        """
+        if k < 1:
+            raise ValueError("An Erlang distribution needs at least one phase")
+        self.k = int(k)
+
+    def sample(self, generator, size):
+        return generator.standard_gamma(self.k, size)/self.k
+
+    def scv(self) -> float:
+        return 1/self.k
+
+    def __repr__(self) -> str:
+        return "Erlang(" + str(self.k) + ")"
+
+class Hyperexponential(Distribution):
+    """ A probabilistic mixture of exponential phases, more variable than
+    exponential times. The phase means are rescaled so the mixture has mean one.
+    """
+
+    def __init__(self, probabilities: list, means: list):
+        """ Initialise the distribution.
+
+        Params:
+            - probabilities :: The probability of each phase.
+            - means :: The relative mean of each phase.
+        """
+        self.probabilities = numpy.asarray(probabilities, dtype=float)
+        self.probabilities = self.probabilities/self.probabilities.sum()
+        means = numpy.asarray(means, dtype=float)
+        self.means = means/(self.probabilities @ means)
+
+    @classmethod
+    def balanced(cls, scv: float) -> "Hyperexponential":
+        """ The two phase hyperexponential with balanced means of a given
+        squared coefficient of variation.
+
+        Params:
+            - scv :: The squared coefficient of variation, at least one.
+
+        Returns:
+            - Hyperexponential :: The distribution.
+        """
+        if scv < 1:
+            raise ValueError("A hyperexponential has a coefficient of variation of at least one")
+        p = (1 + sqrt((scv - 1)/(scv + 1)))/2
+        return cls([p, 1 - p], [1/(2*p), 1/(2*(1 - p))])
+
+    def sample(self, generator, size):
+        phases = generator.choice(len(self.means), size, p = self.probabilities)
+        return generator.standard_exponential(size)*self.means[phases]
+
+    def scv(self) -> float:
+        return 2*float(self.probabilities @ self.means**2) - 1
+
+    def __repr__(self) -> str:
+        return "Hyperexponential(" + str(self.probabilities.tolist()) + ", " + \
+               str(self.means.tolist()) + ")"
+
+class Lognormal(Distribution):
+    """ Lognormal times, heavy tailed for large coefficients of variation """
+
+    def __init__(self, cv: float):
+        """ Initialise the distribution.
+
+        Params:
+            - cv :: The coefficient of variation, the standard deviation over
+                    the mean.
+        """
+        self.cv = float(cv)
+        self.sigma = sqrt(log(1 + self.cv**2))
+
+    def sample(self, generator, size):
+        return generator.lognormal(-self.sigma**2/2, self.sigma, size)
+
+    def scv(self) -> float:
+        return self.cv**2
+
+    def __repr__(self) -> str:
+        return "Lognormal(" + repr(self.cv) + ")"
+
+class Deterministic(Distribution):
+    """ Constant times, every variate equal to the mean """
+
+    def sample(self, generator, size):
+        return numpy.ones(size)
+
+    def scv(self) -> float:
+        return 0.0
+
+class Empirical(Distribution):
+    """ Times resampled from observed values, such as the holding times of a
+    call log. The values are rescaled to mean one, so the observed times are
+    reproduced by a rate of one over their mean.
+    """
+
+    def __init__(self, values):
+        """ Initialise the distribution.
+
+        Params:
+            - values :: The observed times.
+        """
+        values = numpy.asarray(values, dtype=float)
+        if not len(values) or (values < 0).any():
+            raise ValueError("An empirical distribution needs non negative values")
+        self.mean = float(values.mean())
+        self.values = values/self.mean
+
+    def sample(self, generator, size):
+        return self.values[generator.integers(0, len(self.values), size)]
+
+    def scv(self) -> float:
+        return float(self.values.var())
+
+    def __repr__(self) -> str:
+        digest = hashlib.sha256(self.values.tobytes()).hexdigest()[:16]
+        return "Empirical(" + str(len(self.values)) + ", " + digest + ")"
+
+EXPONENTIAL = Exponential()  # Distribution of streams not given one
@@ -1,40 +1,65 @@
-from numpy import log
-import random
+from Streams import RandomStream, Streams
+
+# Event types, stored on events as small integers for fast comparison
+ARRIVAL, DEPARTURE = 0, 1
+TYPES = ("arrival", "departure")
+
+# Arrival paths of the M1M2 system, indexing the names used for the rates
+HANDOVER, NEWCALL = 0, 1
+PATHS = ("handover", "newcall")
 
 class Event:
     """ Class object to represent an event that occurs during the simulation """
 
+    # Fixed attribute layout, avoiding a dictionary for every event created
+    __slots__ = ("type", "arrival_time", "departure_time", "serverID")
+
     arrivalRate = 0.1     # Static arrival rate of all events
     departureRate = 0.01  # Static departure rate of all events
 
-    def expon(mean_rate: float) -> float:
-        """ Calculate a random value from a exponential distribution around a
-        specified mean.
-
-        Params:
-            - mean_rate :: the mean of the exponential distribution.
+    # Streams of events created without a run's streams, drawn from random
+    arrivalStream = serviceStream = RandomStream()
 
-        Returns:
-            - float :: the randomly generated value for time.
-        """
-        return - (log(random.random())/mean_rate)
-
-    def __init__(self, type: str, time: float):
+    def __init__(self, type: int, time: float, rates = None):
         """ Initialise the event. Calculate the arrival time and departure time 
         of the event, from a given time instance.
 
         Params:
-            - type :: Identification of state of event.(start/arrival/departure)
+            - type :: Identification of state of event (ARRIVAL/DEPARTURE)
             - time :: A time setting, expected to be the simulation time at the 
                       point of creation.
+            - rates :: The Rates of the run, the static rates are used if None.
         """
+        rates = rates or Event
 
         # Record type
         self.type = type
-        # Calculate the arrival time using an exponential distribution
-        self.arrival_time = time + Event.expon(Event.arrivalRate)
-        # Calculate the departure time using an exponential distribution 
-        self.departure_time = self.arrival_time + Event.expon(Event.departureRate)
+        # Draw the arrival time from the arrival stream of the run
+        self.arrival_time = time + rates.arrivalStream.draw(rates.arrivalRate)
+        # Draw the departure time from the service stream of the run
+        self.departure_time = self.arrival_time + \
+                              rates.serviceStream.draw(rates.departureRate)
+
+    @classmethod
+    def fromCall(cls, arrival_time: float, service_time: float, path: int = None) -> "Event":
+        """ Construct the arrival event of a known call, such as one read from a
+        call log, rather than drawing its times.
+
+        Params:
+            - arrival_time :: The time the call arrives.
+            - service_time :: The time the call holds a server once admitted.
+            - path :: The arrival path of the call, for M1M2 events.
+
+        Returns:
+            - Event :: The arrival event of the call.
+        """
+        event = cls.__new__(cls)
+        event.type = ARRIVAL
+        event.arrival_time = arrival_time
+        event.departure_time = arrival_time + service_time
+        if path is not None:
+            event.path = path
+        return event
 
     def __str__(self) -> str:
         """ Protected function to allow str() to display an object 
@@ -42,7 +67,7 @@ class Event:
         Returns:
             - str :: A string representation of the event.
         """
-        return self.type + " event at time: " + str(self.time())
+        return TYPES[self.type] + " event at time: " + str(self.time())
 
     def time(self) -> float:
         """ Returns the time of the event depending on its type.
@@ -50,7 +75,7 @@ class Event:
         Returns:
             - float :: The time of the event depending on the type.
         """
-        if self.type == "arrival":
+        if self.type == ARRIVAL:
             return self.arrival_time
         return self.departure_time
 
@@ -78,7 +103,7 @@ class Event:
         """
 
         if serverID:
-            self.type = "Departure"   # Change event type
+            self.type = DEPARTURE     # Change event type
             self.serverID = serverID  # Record server ID
             return
 
@@ -89,13 +114,77 @@ class M1M2Event(Event):
     type of event. The path on which the event affects the mean of the times
     exponential distribution.
     """
+    __slots__ = ("path",)
+
     # Static arrival rates for the hand over and new call paths
     priorities = {"handover":0.1, "newcall": 0.1}  
     departureRate = 0.01   # Static departure rates for events
 
-    def __init__(self,path, type, time):
-        """ Initialise the values for the event """
+    # Arrival and service streams of each path, for events created without a
+    # run's streams
+    pathStreams = (Event.arrivalStream, Event.arrivalStream)
+    pathServiceStreams = (Event.serviceStream, Event.serviceStream)
+
+    def __init__(self, path: int, type: int, time: float, rates = None):
+        """ Initialise the values for the event
+
+        Params:
+            - path :: The arrival path of the event (HANDOVER/NEWCALL)
+            - type :: Identification of state of event (ARRIVAL/DEPARTURE)
+            - time :: The simulation time at the point of creation.
+            - rates :: The Rates of the run, the static rates are used if None.
+        """
+        rates = rates or M1M2Event
+
         self.path = path
         self.type = type
-        self.arrival_time = time + Event.expon(M1M2Event.priorities[path])
-        self.departure_time = self.arrival_time + Event.expon(M1M2Event.departureRate)
+        self.arrival_time = time + \
+                            rates.pathStreams[path].draw(rates.priorities[PATHS[path]])
+        self.departure_time = self.arrival_time + \
+                              rates.pathServiceStreams[path].draw(rates.departureRate)
+
+class Rates:
+    """ The arrival and departure rates of a single simulation run, along with
+    the random streams the times are drawn from. Events given a Rates object
+    read from it instead of from the static class attributes, so that runs can
+    be configured independently of one another.
+    """
+
+    def __init__(self, arrivalRate: float = None, departureRate: float = None,
+                 priorities: dict = None, streams: Streams = None):
+        """ Initialise the rates of the run.
+
+        Params:
+            - arrivalRate :: The arrival rate of MMCC events.
+            - departureRate :: The departure rate of all events.
+            - priorities :: The arrival rates of the M1M2 paths by path name.
+            - streams :: The random streams of the run, freshly seeded if None.
+        """
+        self.arrivalRate = arrivalRate
+        self.departureRate = departureRate
+        self.priorities = priorities
+
+        self.use(streams or Streams())
+
+    def use(self, streams: Streams) -> None:
+        """ Draw the times of later events from a set of streams.
+
+        Params:
+            - streams :: The random streams to be used.
+        """
+        self.streams = streams
+        self.arrivalStream = streams.arrival
+        self.serviceStream = streams.service
+        self.pathStreams = streams.paths
+        self.pathServiceStreams = streams.services
+
+    def reseed(self, seed) -> None:
+        """ Replace the random streams with freshly seeded ones, generating the
+        same number of variates at a time, from the same distributions, as the
+        current streams.
+
+        Params:
+            - seed :: An integer or SeedSequence the new streams are drawn from.
+        """
+        self.use(Streams(seed, self.streams.arrival.block, self.streams.arrival.distribution,
+                         self.streams.service.distribution))
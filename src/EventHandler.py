@@ -1,16 +1,63 @@
-from Event import Event, M1M2Event
+from heapq import heappush, heappop
+from itertools import count
+
+from Event import Event, M1M2Event, Rates, ARRIVAL, HANDOVER, NEWCALL
+from Statistics import Statistics
 
 class EventHandler:
     """ Event handler is tasked with managing a collection of events. The events
     that are to be enacted in the future are stored in order of execution
     separately from the blocked or departed events.
+
+    The future event list is a binary heap of (time, sequence, event) entries,
+    giving O(log n) insertion and removal. The sequence number is taken from an
+    increasing counter so that events sharing a timestamp leave the handler in
+    the order they were added.
+
+    Resolved events are summarised by a streaming Statistics accumulator. The
+    event objects themselves are only kept when retention is requested, which
+    is useful for debugging but costs memory in proportion to the run length.
     """
 
-    def __init__(self):
-        """ Initialise the object variables """
-        self.container = []  # Event list of future events
+    def __init__(self, retain: bool = True, batch_size: int = None, warmup = 0):
+        """ Initialise the object variables
+
+        Params:
+            - retain :: Keep every departed and blocked event object.
+            - batch_size :: The number of arrivals of each statistics batch.
+            - warmup :: The number of arrivals of the statistics warm up, or
+                        "mser" to detect it.
+        """
+        self.container = []  # Event list of future events (binary heap)
         self.departed = []   # Events that have been resolved
         self.blocked = []    # Arrivals that have been blocked from entry
+        self.sequence = count() # Tie breaker for events with equal times
+        self.retain = retain    # Whether resolved events are kept
+        self.stats = Statistics(batch_size, warmup) # Running totals of the events
+
+    def __len__(self) -> int:
+        """ Protected function allowing len() to determine the number of future
+        events.
+
+        Returns:
+            - int :: Number of events in the event list.
+        """
+        return len(self.container)
+
+    def __getstate__(self) -> dict:
+        """ Protected function giving the state to be pickled. The sequence
+        counter is stored as the next number it would give, since counters
+        cannot be pickled in every Python version.
+        """
+        state = dict(self.__dict__)
+        state["sequence"] = next(self.sequence)
+        self.sequence = count(state["sequence"]) # Give back the number drawn
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """ Protected function restoring a pickled state. """
+        self.__dict__.update(state)
+        self.sequence = count(state["sequence"])
 
     def add(self, event: Event) -> None:
         """ Add a new event into the handler correctly into the sorted event
@@ -19,23 +66,19 @@ class EventHandler:
         Params:
             - event :: Event to be stored in the list
         """
-
-        # Look for index of correct insertation of event
-        for i, e in enumerate(self.container):
-            if e.time() > event.time():
-                self.container.insert(i, event)
-                return
-        
-        # No events in the list or event correctly placed at end of event list.
-        self.container.append(event)
+        heappush(self.container, (event.time(), next(self.sequence), event))
     
     def depart(self, event: Event) -> None:
-        """ Store the departed event """
-        self.departed.append(event)
+        """ Record the departed event """
+        self.stats.depart(event.serviceTime())
+        if self.retain:
+            self.departed.append(event)
 
     def block(self, event: Event) -> None:
-        """ Store the blocked event """
-        self.blocked.append(event)
+        """ Record the blocked event """
+        self.stats.block()
+        if self.retain:
+            self.blocked.append(event)
 
     def next(self) -> Event:
         """ Remove the next event from the event list and return the event.
@@ -43,9 +86,7 @@ class EventHandler:
         Returns:
             - Event :: The next event to be enacted in the simulation
         """
-        e = self.container[0]
-        self.container = self.container[1:]
-        return e
+        return heappop(self.container)[2]
 
 class M1M2EventHandler(EventHandler):
     """ Adaptation of the event handler object to have separate collections for
@@ -53,20 +94,29 @@ class M1M2EventHandler(EventHandler):
     to ensure non bias creation of the initial arrival events is introduced
     """
 
-    def __init__(self):
-        """ Initialising the data structures for the object """
-        self.container = [] # Event list of future events
-        self.departed = []  # Events that have departed from the simulation
+    def __init__(self, retain: bool = True, batch_size: int = None, warmup = 0):
+        """ Initialising the data structures for the object
+
+        Params:
+            - retain :: Keep every departed and blocked event object.
+            - batch_size :: The number of arrivals of each statistics batch.
+            - warmup :: The number of arrivals of the statistics warm up, or
+                        "mser" to detect it.
+        """
+        super().__init__(retain, batch_size, warmup)
         self.hblocked = []  # Hand over events that were blocked
         self.nblocked = []  # New call events that were blocked
 
-    def start(self) -> None:
+    def start(self, rates: Rates = None) -> None:
         """ Generate both event types and introduce them into the event list,
         ensuring the no warm up period is included to prevent statistical skew.
+
+        Params:
+            - rates :: The Rates of the run, the static rates are used if None.
         """
 
         # Create both event types objects
-        arrivals = [M1M2Event("handover", "arrival", 0), M1M2Event("newcall", "arrival", 0)]
+        arrivals = [M1M2Event(HANDOVER, ARRIVAL, 0, rates), M1M2Event(NEWCALL, ARRIVAL, 0, rates)]
 
         # Identify which of the two occur first
         startTime = min([arrivals[0].time(), arrivals[1].time()])
@@ -74,7 +124,7 @@ class M1M2EventHandler(EventHandler):
         for e in arrivals:
             # Remove the warm up time from event times
             e.arrival_time = e.arrival_time - startTime
-            e.depature_time = e.departure_time - startTime
+            e.departure_time = e.departure_time - startTime
 
             # Store the events
             self.add(e)
@@ -86,7 +136,11 @@ class M1M2EventHandler(EventHandler):
         Params:
             - event: Event to be blocked
         """
-        if event.path == "handover":
+        self.stats.block(event.path)
+        if not self.retain:
+            return
+
+        if event.path == HANDOVER:
             self.hblocked.append(event)
         else:
             self.nblocked.append(event)
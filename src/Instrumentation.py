@@ -0,0 +1,175 @@
+from collections import Counter
+import cProfile
+import pstats
+import signal
+import time
+
+from Event import TYPES
+
+class TimedStream:
+    """ Stand in for a random stream that times every variate drawn from it """
+
+    def __init__(self, stream, instrument: "Instrument"):
+        """ Wrap a stream, recording its time against an instrument """
+        self.stream = stream
+        self.instrument = instrument
+
+    def draw(self, rate: float) -> float:
+        """ Draw a variate from the wrapped stream """
+        start = time.perf_counter()
+        value = self.stream.draw(rate)
+        self.instrument.phases["variates"] += time.perf_counter() - start
+        return value
+
+class Instrument:
+    """ Optional instrumentation of a simulation run. When given to a run the
+    instrument wraps the methods of the run's event handler, servers, random
+    streams and statistics, counting events by type, following the length of
+    the event list and the server occupancy over time, and timing each phase
+    of the run loop. Runs without an instrument are left untouched, so the
+    instrumentation costs nothing when disabled.
+
+    The times include the overhead of the wrappers themselves, so they are a
+    guide to the split of the run time rather than an exact account of it.
+    """
+
+    def __init__(self):
+        """ Initialise the counters """
+        self.counts = Counter()   # Number of events handled of each type
+        self.phases = Counter()   # Time spent in each phase of the run loop
+        self.max_events = 0       # Longest the event list has been
+        self.event_area = 0.0     # Time integral of the event list length
+        self.busy_area = 0.0      # Time integral of the number of busy servers
+        self.occupancy = Counter() # Time spent at each number of busy servers
+        self.clock = 0.0          # Simulation time of the latest event
+
+    def attach(self, machine) -> None:
+        """ Wrap the components of a run that has been set up. Called by the
+        run methods once their event handler and servers exist.
+
+        Params:
+            - machine :: The simulation machine being run.
+        """
+        events, servers, stats, rates = machine.events, machine.servers, \
+                                        machine.events.stats, machine.rates
+        total = len(servers)
+
+        def timed(function, phase: str):
+            def wrapper(*args):
+                start = time.perf_counter()
+                result = function(*args)
+                self.phases[phase] += time.perf_counter() - start
+                return result
+            return wrapper
+
+        add = timed(events.add, "event list")
+        pop = timed(events.next, "event list")
+
+        def following():
+            event = pop()
+
+            # Weight the state held since the previous event by its duration
+            now = event.time()
+            elapsed, self.clock = now - self.clock, now
+            busy = total - len(servers)
+            self.event_area += elapsed*(len(events) + 1)
+            self.busy_area += elapsed*busy
+            self.occupancy[busy] += elapsed
+            self.max_events = max(self.max_events, len(events) + 1)
+
+            self.counts[TYPES[event.type]] += 1
+            return event
+
+        def block(event):
+            self.counts["blocked"] += 1
+            blocked(event)
+
+        events.add, events.next = add, following
+        blocked = timed(events.block, "statistics")
+        events.block = block
+        events.depart = timed(events.depart, "statistics")
+        stats.arrive = timed(stats.arrive, "statistics")
+        stats.allocate = timed(stats.allocate, "statistics")
+        stats.release = timed(stats.release, "statistics")
+        servers.allocate = timed(servers.allocate, "servers")
+        servers.deallocate = timed(servers.deallocate, "servers")
+
+        rates.arrivalStream = TimedStream(rates.arrivalStream, self)
+        rates.serviceStream = TimedStream(rates.serviceStream, self)
+        rates.pathStreams = tuple(TimedStream(s, self) for s in rates.pathStreams)
+        rates.pathServiceStreams = tuple(TimedStream(s, self) for s in rates.pathServiceStreams)
+
+    def meanEvents(self) -> float:
+        """ Time averaged length of the event list.
+
+        Returns:
+            - float :: Mean number of future events held.
+        """
+        return self.event_area/self.clock if self.clock else 0.0
+
+    def meanBusy(self) -> float:
+        """ Time averaged number of busy servers.
+
+        Returns:
+            - float :: Mean number of busy servers.
+        """
+        return self.busy_area/self.clock if self.clock else 0.0
+
+    def report(self) -> None:
+        """ Display the instrumentation in a readible fashion. """
+
+        print("\tEvents by type ::")
+        for name, count in sorted(self.counts.items()):
+            print("\t\t" + name.capitalize() + ":", count)
+
+        print("\tEvent list length (max, mean):", self.max_events, self.meanEvents())
+        print("\tBusy servers (mean):", self.meanBusy())
+
+        print("\tPhase times ::")
+        for phase, seconds in self.phases.most_common():
+            print("\t\t" + phase.capitalize() + ":", seconds)
+
+def profile(machine, **params) -> pstats.Stats:
+    """ Run a simulation under cProfile.
+
+    Params:
+        - machine :: The simulation machine to run.
+        - params :: The run parameters of the simulation.
+
+    Returns:
+        - pstats.Stats :: The profile of the run.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(machine.run, **params)
+    return pstats.Stats(profiler)
+
+def sample(machine, interval: float = 0.001, **params) -> Counter:
+    """ Run a simulation under a sampling profiler, recording the function
+    executing at regular intervals of processor time. The overhead is far lower
+    than that of cProfile, at the cost of only seeing where time is spent
+    rather than how often functions are called. Only available where the
+    profiling interval timer is supported.
+
+    Params:
+        - machine :: The simulation machine to run.
+        - interval :: The processor time between samples, in seconds.
+        - params :: The run parameters of the simulation.
+
+    Returns:
+        - Counter :: The number of samples taken in each function, keyed by
+                     file name, line of definition and function name.
+    """
+    samples = Counter()
+
+    def record(signum, frame):
+        code = frame.f_code
+        samples[(code.co_filename, code.co_firstlineno, code.co_name)] += 1
+
+    previous = signal.signal(signal.SIGPROF, record)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        machine.run(**params)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+    return samples
@@ -1,18 +1,21 @@
+import numpy
+
 from Simulation import M1M2CC
-from Event import M1M2Event as Event
-from pylab import *
-from math import factorial
+from Sweep import sweep, parameterGrid
+from Analytics import aggregatedBlocking
+from Planner import maximumNewcallRate, minimumThreshold
+from Cache import Cache
+from Results import ResultStore
 
-def blockingProbability(num_clients: int, threshold: int, ho_rate: float, \
+def blockingProbability(num_servers: int, threshold: int, ho_rate: float, \
                         c_rate: float, d_rate: float) -> float:
     """ Blocking probability function for a m1/m2/m/c/c type simulation, it 
     gives consideration to both paths of arrival and the priority aspects of
-    each path. This function unfortunately did not provide reasonable results 
-    for the validity checking but I have left is in as a work in progress.
+    each path. The aggregated blocking probability is returned, weighted as in
+    the simulation.
 
     Params:
-        - num_clients: The number of arrivals the system is to experience from 
-                       both paths.
+        - num_servers: The number of servers in the system.
         - threshold: The number of reserved servers in the system for the hand 
                      over path.
         - ho_rate: The hand over arrival rate.
@@ -22,70 +25,54 @@ def blockingProbability(num_clients: int, threshold: int, ho_rate: float, \
     Returns:
         - float: Blocking probability of the simulation set up.
     """
-
-    diff = num_clients - threshold
-
-    a = sum([(factorial(k)**-1)*(((ho_rate+c_rate)/d_rate)**k) for k in range(diff)])
-    b = 0
-    for k in range(diff + 1, num_clients):
-        x = (((num_clients-factorial(threshold))*factorial(k-(diff)))**-1)
-        y = (((ho_rate+c_rate)/d_rate)**(diff))
-        z = ((ho_rate/d_rate)**(k-num_clients+threshold))
-        b += x*y*z
-
-    p0 = a + b
-
-    a = ((num_clients-factorial(threshold))*factorial(threshold))**-1
-    b = ((ho_rate + c_rate)/d_rate)**(diff)
-    c = (ho_rate/d_rate)**num_clients
-
-    return a*b*c*(p0**-1)
+    return aggregatedBlocking(num_servers, threshold, ho_rate, c_rate, d_rate)
 
 if __name__ == "__main__":
 
-    matplotlib.pyplot.show() # Prepare python for plotting
-    machine = M1M2CC()       # Construct a simulation object
+    import matplotlib.pyplot as plt # Plotting is only imported to plot
+    plt.show()               # Prepare python for plotting
+    cache = Cache()          # Runs already made are read rather than repeated
+    store = ResultStore("M1M2CC.results") # Rows of every run, for later analysis
+    store.clear()                         # Replacing those of the last investigation
+    seed = 2018              # Root seed, fixed so that runs are cached
     
     # Initialise investigation parameters
-    handover_range = logspace(-6, -1, 50) # Range of hand over arrival rate
-    Event.priorities["newcall"] = 0.1             # Set new call arrival rate
-    Event.departure_rate = 0.01
-
-    prob_blocking = []
+    handover_range = numpy.logspace(-6, -1, 50) # Range of hand over arrival rate
 
-    for p in handover_range:
-        Event.priorities["handover"] = p
-        machine.run(16,10000,2)
-        prob_blocking.append(machine.blockingProbability())
+    results = sweep("M1M2CC", parameterGrid(handover_rate = handover_range), seed = seed,
+                    cache = cache, store = store, total_servers = 16,
+                    total_arrival = 10000, threshold = 2, newcall_rate = 0.1,
+                    departure_rate = 0.01, retain = False)
+    prob_blocking = [r["blocking"] for r in results]
 
-    figure()
-    plot(handover_range, prob_blocking, "b*", label="ABP blocking percentage")
-    plot([handover_range[0], handover_range[-1]], [0.02]*2, \
+    plt.figure()
+    plt.plot(handover_range, prob_blocking, "b*", label="ABP blocking percentage")
+    plt.plot([handover_range[0], handover_range[-1]], [0.02]*2, \
         'r--', label="Target probability of 0.02")
-    ylabel("ABP blocking probability")
-    xlabel("Handover arrival rate")
-    legend()
-    xlim(handover_range[0], handover_range[-1])
-    xscale("log")
-    show(block=True)
+    plt.ylabel("ABP blocking probability")
+    plt.xlabel("Handover arrival rate")
+    plt.legend()
+    plt.xlim(handover_range[0], handover_range[-1])
+    plt.xscale("log")
+    plt.show(block=True)
 
-    call_range = linspace(0.01, 0.08, 50)
-    Event.priorities["handover"] = 0.03
-    Event.departure_rate = 0.01
+    call_range = numpy.linspace(0.01, 0.08, 50)
 
-    prob_blocking = []
-    index, best_prob = 0 , 0
+    results = sweep("M1M2CC", parameterGrid(newcall_rate = call_range), seed = seed,
+                    cache = cache, store = store, total_servers = 16,
+                    total_arrival = 10000, threshold = 2, handover_rate = 0.03,
+                    departure_rate = 0.01, retain = False)
+    prob_blocking = [r["blocking"] for r in results]
 
-    for i, c in enumerate(call_range):
-        Event.priorities["newcall"] = c
-        machine.run(16,10000,2)
-        prob = machine.blockingProbability()
+    index, best_prob = 0 , 0
+    for i, prob in enumerate(prob_blocking):
         if prob < 0.02: index, best_prob = i, prob
-        prob_blocking.append(prob)
 
     print("Report from rerun on best proposed call arrival rate:")
-    Event.priorities["newcall"] = call_range[index]
-    machine.run(16,10000,2)
+    machine = cache.run(M1M2CC, results[index]["seed"], total_servers = 16,
+                        total_arrival = 10000, threshold = 2, handover_rate = 0.03,
+                        newcall_rate = call_range[index], departure_rate = 0.01,
+                        retain = False)
     machine.report()
     print("")
     
@@ -93,14 +80,26 @@ if __name__ == "__main__":
     print("\tCall arrival value:", call_range[index])
     print("\tBlocking value:", best_prob)
 
-    figure()
-    plot(call_range, prob_blocking, "b*", label="ABP blocking percentage")
-    plot([0.01, call_range[index]], [prob_blocking[index]]*2, "r--", \
+    # Solve for the admissible new call rate directly rather than from the grid
+    plan = maximumNewcallRate(16, 2, 0.03, 0.02, 0.01, 10000)
+    print("\tPlanned call arrival value:", plan["rate"], "from", plan["runs"], "runs")
+    print("\tConfirmed bracket:", plan["bracket"])
+
+    # The fewest guard channels keeping hand over blocking below 0.001
+    plan = minimumThreshold(16, 0.03, call_range[index], 0.001, 0.01, 10000)
+    print("\tPlanned threshold:", plan["threshold"], "from", plan["runs"], "runs")
+    print("\tThreshold below confirmed to miss the target:", plan["resolved"])
+
+    plt.figure()
+    plt.plot(call_range, prob_blocking, "b*", label="ABP blocking percentage")
+    plt.plot(call_range, blockingProbability(16, 2, 0.03, call_range, 0.01), "g--", \
+        label="Analytic ABP blocking percentage")
+    plt.plot([0.01, call_range[index]], [prob_blocking[index]]*2, "r--", \
         label="Setup with probability under 0.02")
-    plot([call_range[index]]*2, [-0.0005, prob_blocking[index]], "r--")
-    ylabel("ABP blocking probability")
-    xlabel("New call arrival rate")
-    xlim(0.01,0.08)
-    ylim(-0.005, 0.2)
-    legend()
-    show(block=True)
\ No newline at end of file
+    plt.plot([call_range[index]]*2, [-0.0005, prob_blocking[index]], "r--")
+    plt.ylabel("ABP blocking probability")
+    plt.xlabel("New call arrival rate")
+    plt.xlim(0.01,0.08)
+    plt.ylim(-0.005, 0.2)
+    plt.legend()
+    plt.show(block=True)
\ No newline at end of file
@@ -1,7 +1,12 @@
+import numpy
+
 from Simulation import MMCC
-from Event import Event
-from pylab import *
-from math import factorial
+from Sweep import sweep, parameterGrid
+from Replication import replicate
+from Planner import maximumArrivalRate
+from Analytics import erlangB
+from Cache import Cache
+from Results import ResultStore
 
 def blockingProbability(num_servers: int, arrival_rate: float, departure_rate: float) -> float:
     """ Static function to be able to analytical determine the expected blocking
@@ -15,9 +20,7 @@ def blockingProbability(num_servers: int, arrival_rate: float, departure_rate: f
     Return:
         - float: Blocking probability of the system
     """
-    numerator = double(((arrival_rate/departure_rate)**num_servers)/double(factorial(num_servers)))
-    demoninator = sum( [((arrival_rate/departure_rate)**k)/factorial(k) for k in range(1,num_servers)])
-    return numerator/demoninator
+    return erlangB(arrival_rate/departure_rate, num_servers)
 
 def serverUtilisation(arrival_rate: float, departure_rate: float) -> float:
     """ Calculate the expected server Utilisation of the system with the given
@@ -36,48 +39,42 @@ def serverUtilisation(arrival_rate: float, departure_rate: float) -> float:
 
 if __name__ == "__main__":
 
-    matplotlib.pyplot.show() # Allow plotting package to display figures
-    machine = MMCC()         # Generate simulation machine
+    import matplotlib.pyplot as plt # Plotting is only imported to plot
+    plt.show()               # Prepare python for plotting
+    cache = Cache()          # Runs already made are read rather than repeated
+    store = ResultStore("MMCC.results") # Rows of every run, for later analysis
+    store.clear()                       # Replacing those of the last investigation
 
     # Initialise investigation parameters
     servers = 16                        # Number of servers in the simulation
-    arrival_range = logspace(-2,-1,50)  # Range or arrival values to test
+    arrival_range = numpy.logspace(-2,-1,50)  # Range or arrival values to test
     departure_rate = 0.01               # Departure rate of simulation events
     clients = 10000                     # Number of client arrivals
+    seed = 2018                         # Root seed, fixed so that runs are cached
 
-    # Data structures to hold obversations
-    prob_blocking = [] # Probability of blocking evaluated from the simulation
-    pred_blocking = [] # Predicted probability of blocking from an analytical model
-
-    utilisation = []      # Recorded utilisation value from the simulation
-    pred_utilisation = [] # Predicted utilisation value from an analytical model
+    # Begin investigation, running the simulations over a pool of processes
+    results = sweep("MMCC", parameterGrid(arrival_rate = arrival_range), seed = seed,
+                    cache = cache, store = store, total_servers = servers,
+                    total_arrival = clients, departure_rate = departure_rate, retain = False)
 
-    
-    # Begin investigation
-    index = 0 
-    for i, arrival_rate in enumerate(arrival_range):
-        Event.arrivalRate = arrival_rate # Set the arrival rate value
+    # Data structures to hold obversations
+    prob_blocking = [r["blocking"] for r in results]   # Simulation blocking
+    utilisation = [r["utilisation"] for r in results]  # Simulation utilisation
 
-        # run the simulation 
-        machine.run( total_servers = servers, total_arrival = clients )        
+    # Predicted values from the analytical models
+    pred_blocking = [blockingProbability(servers, a, departure_rate) for a in arrival_range]
+    pred_utilisation = [serverUtilisation(a, departure_rate) for a in arrival_range]
 
-        # Collect the statistical information from the simulation
-        probability = machine.blockingProbability()
-        
-        # Record simulation that yielded a blocking probability less than 0.01
+    # Record simulation that yielded a blocking probability less than 0.01
+    index = 0
+    for i, probability in enumerate(prob_blocking):
         if probability < 0.01: index = i
 
-        # Add information into data structures
-        prob_blocking.append(probability)
-        pred_blocking.append(blockingProbability(servers, arrival_rate, departure_rate))
-
-        utilisation.append(machine.serverUtilisation())
-        pred_utilisation.append(serverUtilisation(arrival_rate, departure_rate))
-
     # Display best simulation values
     print("Values for re-run on best arrival rate:")
-    Event.arrivalRate = arrival_range[index]
-    machine.run(total_servers = servers, total_arrival = clients)
+    machine = cache.run(MMCC, results[index]["seed"], total_servers = servers,
+                        total_arrival = clients, arrival_rate = arrival_range[index],
+                        departure_rate = departure_rate, retain = False)
     machine.report()
     print()
 
@@ -88,25 +85,41 @@ if __name__ == "__main__":
     print("\tSimulation blocking probability:", prob_blocking[index])
     print("\tSimulations variance from predictions:", sum(difference)/len(difference) )
 
+    # Replicate the best arrival rate until its blocking is known to within 10%
+    estimates = replicate("MMCC", dict(total_servers = servers, total_arrival = clients,
+                                       arrival_rate = arrival_range[index],
+                                       departure_rate = departure_rate, retain = False),
+                          precision = 0.1)
+    print("\tReplicated blocking probability:", estimates["blocking"])
+    print("\tReplicated server utilisation:", estimates["utilisation"])
+    store.append(dict(estimates, model = "MMCC", arrival_rate = arrival_range[index],
+                      replicated = True))
+    store.flush()
+
+    # Solve for the admissible arrival rate directly rather than from the grid
+    plan = maximumArrivalRate(servers, 0.01, departure_rate, clients)
+    print("\tPlanned arrival rate:", plan["rate"], "from", plan["runs"], "runs")
+    print("\tConfirmed bracket:", plan["bracket"])
+
     # Plot the findings of the investigation for blocking probability
-    figure()
-    plot(arrival_range, prob_blocking, "b*", label="Simulation blocking percentage")
-    plot(arrival_range, pred_blocking, "r--", label="Analytic blocking percentage")
-    plot([0.01, arrival_range[index]], [prob_blocking[index]]*2, "y--", label="Setup with probability under 0.01")
-    plot([arrival_range[index]]*2, [-0.0005, prob_blocking[index]], "y--")
-    legend()
-    ylabel("Blocking Probability")
-    xlabel("Arrival rate")
-    xlim(0.01, 0.1)
-    ylim(-0.0005,0.025)
-    show(block=True)
+    plt.figure()
+    plt.plot(arrival_range, prob_blocking, "b*", label="Simulation blocking percentage")
+    plt.plot(arrival_range, pred_blocking, "r--", label="Analytic blocking percentage")
+    plt.plot([0.01, arrival_range[index]], [prob_blocking[index]]*2, "y--", label="Setup with probability under 0.01")
+    plt.plot([arrival_range[index]]*2, [-0.0005, prob_blocking[index]], "y--")
+    plt.legend()
+    plt.ylabel("Blocking Probability")
+    plt.xlabel("Arrival rate")
+    plt.xlim(0.01, 0.1)
+    plt.ylim(-0.0005,0.025)
+    plt.show(block=True)
 
     # Plot the findings of the investigation for server utility
-    figure()
-    plot(arrival_range, utilisation, "b*", label="Utilisation of servers")
-    plot(arrival_range, pred_utilisation, "r--", label="Predicted utilisation of servers")
-    ylabel("Server Utility")
-    xlabel("Arrival rate")
-    legend()
-    xlim(0.01, 0.1)
-    show(block=True)
\ No newline at end of file
+    plt.figure()
+    plt.plot(arrival_range, utilisation, "b*", label="Utilisation of servers")
+    plt.plot(arrival_range, pred_utilisation, "r--", label="Predicted utilisation of servers")
+    plt.ylabel("Server Utility")
+    plt.xlabel("Arrival rate")
+    plt.legend()
+    plt.xlim(0.01, 0.1)
+    plt.show(block=True)
\ No newline at end of file
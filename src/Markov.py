@@ -0,0 +1,186 @@
+import numpy
+
+from Event import Event, M1M2Event, HANDOVER, NEWCALL
+from Streams import Streams
+
+class MarkovCC:
+    """ Simulation object conducting the MMCC or M1M2 systems as continuous time
+    Markov chains of their number of busy servers. With exponential times the
+    busy count is all the state there is, so no event list, server ids or event
+    objects are needed.
+
+    The chain is uniformised: steps occur at the constant rate
+        L = handover rate + new call rate + servers * departure rate
+    and a uniform variate per step picks a hand over, a new call, a departure
+    or no change, with probabilities that depend only on the busy count.
+    Whether a step is an arrival does not depend on the busy count, so the step
+    of the final arrival is known before the chain is walked. The steps are cut
+    into blocks, the map from start to end state of every block is found for
+    every start state at once, the blocks are chained together and the walk of
+    each block is then replayed from its actual start; every NumPy operation
+    spans all the blocks, leaving only per step work within a block to Python.
+
+    The end states are found for all servers + 1 start states, so each step
+    costs O(servers) array work, where an event engine costs O(log servers)
+    per event. The engine is at its best for small systems: some 16 times
+    faster than MMCC with 16 servers, but less than twice as fast with 1024,
+    beyond which the event engines may be the better choice.
+
+    As in M1M2CC the first arrival occurs at time zero and the run ends at its
+    total_arrival-th arrival. The steps are equally spaced in expectation, so
+    the utilisation is the mean busy count over the steps; the run's length is
+    a Gamma variate of the number of steps.
+    """
+
+    def run(self, total_servers: int, total_arrival: int, threshold: int = None,
+            handover_rate: float = None, newcall_rate: float = None,
+            departure_rate: float = None, arrival_rate: float = None,
+            seed = None, block: int = 512, chunk: int = 2**18) -> None:
+        """ Begin the simulation of a MMCC system, or of a M1M2 system when a
+        threshold is given. Rates that are not given are taken from the static
+        rates of Event and M1M2Event.
+
+        Params:
+            - total_servers :: The number of servers that can handle clients at
+                               any one instance.
+            - total_arrival :: The total number of clients that can be handled
+                               within the simulation.
+            - threshold :: The number of servers that must remain open for hand
+                           overs, None for the MMCC system.
+            - handover_rate :: The hand over arrival rate of the M1M2 system.
+            - newcall_rate :: The new call arrival rate of the M1M2 system.
+            - departure_rate :: The departure rate of clients for this run.
+            - arrival_rate :: The arrival rate of the MMCC system.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+            - block :: The number of steps of a block.
+            - chunk :: The number of steps generated at a time, bounding memory.
+        """
+        if threshold is None:
+            handover_rate = 0.0
+            newcall_rate = Event.arrivalRate if arrival_rate is None else arrival_rate
+            departure_rate = Event.departureRate if departure_rate is None else departure_rate
+            limit = total_servers
+        else:
+            if handover_rate is None: handover_rate = M1M2Event.priorities["handover"]
+            if newcall_rate is None: newcall_rate = M1M2Event.priorities["newcall"]
+            if departure_rate is None: departure_rate = M1M2Event.departureRate
+            limit = total_servers - threshold      # Busy count blocking new calls
+
+        arrival_total = handover_rate + newcall_rate
+        uniform_rate = arrival_total + total_servers*departure_rate
+
+        streams = seed if isinstance(seed, Streams) else Streams(seed)
+        generator = streams.arrival.generator
+
+        chunk = max(block, chunk//block*block)   # Whole blocks per chunk
+        state = 0          # Busy count at the start of the chunk
+        arrived = [0, 0]   # Arrivals of each path
+        blocked = [0, 0]   # Blocked arrivals of each path
+        area = 0           # Summed busy count over the steps of the run
+        steps = 0          # Number of steps between the first and last arrival
+        started = False    # Whether the first arrival has occurred
+
+        while arrived[HANDOVER] + arrived[NEWCALL] < total_arrival:
+            scaled = generator.random(chunk)*uniform_rate
+            handover = scaled < handover_rate
+            arrival = scaled < arrival_total
+
+            # Begin at the first arrival, end at the final arrival
+            first = 0 if started else int(arrival.argmax()) if arrival.any() else chunk
+            count = numpy.cumsum(arrival)
+            needed = total_arrival - arrived[HANDOVER] - arrived[NEWCALL]
+            end = int(numpy.searchsorted(count, needed)) + 1 if count[-1] >= needed else chunk
+            valid = numpy.zeros(chunk, dtype=bool)
+            valid[first:end] = True
+            started = started or first < chunk
+
+            # A step raises a busy count below up and lowers one above down.
+            # Steps outside the run change nothing.
+            up = numpy.where(handover, total_servers, numpy.where(arrival, limit, -1))
+            down = numpy.where(arrival, total_servers,
+                               numpy.floor((scaled - arrival_total)/departure_rate))
+            up[~valid], down[~valid] = -1, total_servers
+            up = up.astype(numpy.int32).reshape(-1, block).T.copy()   # Step by block
+            down = down.astype(numpy.int32).reshape(-1, block).T.copy()
+            blocks = up.shape[1]
+
+            # The end state of every block from every start state
+            ends = numpy.tile(numpy.arange(total_servers + 1, dtype=numpy.int32), (blocks, 1))
+            for j in range(block):
+                ends += ends < up[j, :, None]
+                ends -= ends > down[j, :, None]
+
+            # Chain the blocks from the state carried into the chunk
+            starts = []
+            for row in ends.tolist():
+                starts.append(state)
+                state = row[state]
+
+            # Replay the walk of each block, recording the busy count before
+            # every step
+            current = numpy.array(starts, dtype=numpy.int32)
+            before = numpy.empty((blocks, block), dtype=numpy.int32)
+            for j in range(block):
+                before[:, j] = current
+                current += current < up[j]
+                current -= current > down[j]
+
+            before = before.ravel()
+            handover &= valid
+            newcall = arrival & ~handover & valid
+            arrived[HANDOVER] += int(handover.sum())
+            arrived[NEWCALL] += int(newcall.sum())
+            blocked[HANDOVER] += int((before[handover] >= total_servers).sum())
+            blocked[NEWCALL] += int((before[newcall] >= limit).sum())
+
+            # The busy count after each step holds until the next step, so the
+            # counts before the steps from the first arrival, at which none are
+            # busy, to the final arrival cover every interval of the run
+            area += int(before[first:end].sum(dtype=numpy.int64))
+            steps += max(end - first, 0)
+
+        steps = max(steps - 1, 0)   # Intervals between the first and last arrival
+
+        self.threshold = threshold
+        self.arrived = {HANDOVER: arrived[HANDOVER], NEWCALL: arrived[NEWCALL]}
+        self.blocked = {HANDOVER: blocked[HANDOVER], NEWCALL: blocked[NEWCALL]}
+        self.num_arrival = sum(arrived)
+        self.num_blocked = sum(blocked)
+        self.num_busy = state
+        self.sim_time = generator.gamma(steps)/uniform_rate if steps else 0.0
+        self.mean_busy = area/steps if steps else 0.0
+
+    def blockingProbability(self) -> float:
+        """ Calculate the blocking probability of the previous run, aggregated
+        as in M1M2CC when a threshold was given.
+
+        Returns:
+            - float :: Probability of blocking
+        """
+        if self.threshold is None:
+            return self.num_blocked/self.num_arrival
+
+        HFP = self.blocked[HANDOVER]/self.arrived[HANDOVER] if self.arrived[HANDOVER] else 0
+        CBP = self.blocked[NEWCALL]/self.arrived[NEWCALL] if self.arrived[NEWCALL] else 0
+        return CBP + (10 * HFP)
+
+    def serverUtilisation(self) -> float:
+        """ Calculate the server utilisation of the previous run, the time
+        averaged number of busy servers up to the final arrival.
+
+        Returns:
+            - float :: Server utilisation value
+        """
+        return self.mean_busy
+
+    def report(self) -> None:
+        """ Display the results of the simulation is a readible fashion. """
+
+        print("\tEvents Handled ::")
+        print("\t\tArrival:", self.num_arrival)
+        print("\t\tIncomplete events:", self.num_busy)
+        print("\t\tBlocked:", self.num_blocked)
+
+        print("\tBlocking rate:", self.blockingProbability())
+        print("\tServer Utilisation:", self.serverUtilisation())
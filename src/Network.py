@@ -0,0 +1,314 @@
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+from itertools import accumulate, count
+import os
+
+import numpy
+
+from Distributions import Distribution
+from Servers import Servers
+from Streams import Streams
+
+# Kinds of network event, a new call arriving or a call leaving its cell
+ARRIVAL, RESIDENCE = 0, 1
+
+def ring(cells: int) -> list:
+    """ The neighbours of each cell of a ring of cells.
+
+    Params:
+        - cells :: The number of cells.
+
+    Returns:
+        - list :: A list of the neighbouring cell ids of every cell.
+    """
+    return [sorted({(i - 1) % cells, (i + 1) % cells} - {i}) for i in range(cells)]
+
+def torus(rows: int, cols: int) -> list:
+    """ The neighbours of each cell of a grid of cells wrapped at its edges,
+    so that every cell has the same surroundings. Cells are numbered row by row.
+
+    Params:
+        - rows :: The number of rows of cells.
+        - cols :: The number of columns of cells.
+
+    Returns:
+        - list :: A list of the neighbouring cell ids of every cell.
+    """
+    def cell(r, c): return (r % rows)*cols + c % cols
+    return [sorted({cell(r - 1, c), cell(r + 1, c), cell(r, c - 1), cell(r, c + 1)} - {cell(r, c)})
+            for r in range(rows) for c in range(cols)]
+
+class Uniforms:
+    """ Uniform variates on [0, 1) drawn a block at a time from a generator,
+    used to pick cells and neighbours without a NumPy call per choice.
+    """
+
+    def __init__(self, generator: numpy.random.Generator, block: int = 4096):
+        self.generator = generator
+        self.block = block
+        self.buffer = []
+
+    def draw(self) -> float:
+        """ Draw a uniform variate """
+        try:
+            return self.buffer.pop()
+        except IndexError:
+            self.buffer = self.generator.random(self.block).tolist()
+            return self.buffer.pop()
+
+def perCell(value, cells: int) -> list:
+    """ Expand a parameter given for all cells, or for each cell, to a list """
+    if numpy.ndim(value) == 0:
+        return [value]*cells
+    if len(value) != cells:
+        raise ValueError("Expected a value for each of the " + str(cells) + " cells")
+    return list(value)
+
+class Network:
+    """ Simulation object conducting a network of guard channel cells. Each cell
+    has its own Servers pool and threshold, and new calls arrive at every cell
+    as a Poisson stream. A call holds a server of its cell until it ends or its
+    user moves, after an exponential dwell time, to a neighbouring cell, where
+    it arrives as a hand over with the rest of its holding time. Hand overs are
+    therefore produced by the calls of the neighbouring cells rather than by an
+    independent stream as in M1M2CC.
+
+    Every cell shares one event list, a binary heap of plain tuples. New calls
+    of all cells are merged into a single Poisson stream whose arrivals are
+    assigned to cells in proportion to their rates, so the list holds one
+    arrival and one event per call in progress however many cells there are.
+    """
+
+    def run(self, neighbours: list, total_arrival: int, total_servers = 16,
+            threshold = 2, newcall_rate = 0.1, departure_rate: float = 0.01,
+            mobility_rate: float = 0.01, seed = None,
+            service: Distribution = None, policy: str = "fifo") -> None:
+        """ Begin the simulation of the network.
+
+        Params:
+            - neighbours :: The neighbouring cell ids of every cell, see torus()
+                            and ring().
+            - total_arrival :: The total number of new calls of the network.
+            - total_servers :: The number of servers of every cell, or of each.
+            - threshold :: The number of servers reserved for hand overs in
+                           every cell, or in each.
+            - newcall_rate :: The new call arrival rate of every cell, or of
+                              each.
+            - departure_rate :: The rate at which calls end.
+            - mobility_rate :: The rate at which users leave their cell.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+            - service :: The Distribution of the holding times, exponential if
+                         None.
+            - policy :: The order in which the free servers of a cell are
+                        allocated, see Servers.policies.
+        """
+        cells = len(neighbours)
+        thresholds = perCell(threshold, cells)
+        rates = perCell(newcall_rate, cells)
+
+        streams = seed if isinstance(seed, Streams) else Streams(seed, service = service)
+        servers = [Servers(c, policy, streams.servers.generator)
+                   for c in perCell(total_servers, cells)]
+        gaps, holdings, dwells = streams.arrival, streams.service, streams.paths[0]
+        uniforms = Uniforms(streams.paths[1].generator)
+
+        total_rate = sum(rates)
+        cumulative = [r/total_rate for r in accumulate(rates)]
+        uniform = len(set(rates)) == 1   # Equal rates pick cells directly
+        mobile = [mobility_rate > 0 and bool(n) for n in neighbours]
+
+        arrived = [0]*cells     # New calls arriving at each cell
+        blocked = [0]*cells     # New calls blocked at each cell
+        handed = [0]*cells      # Hand overs arriving at each cell
+        dropped = [0]*cells     # Hand overs dropped at each cell
+        completed = 0           # Calls that ended normally
+        busy = 0                # Number of busy servers of the network
+        area = 0.0              # Time integral of the number of busy servers
+        clock = 0.0             # Time of the latest event
+
+        queue, sequence = [], count()
+
+        def admit(cell: int, time: float, holding: float) -> None:
+            nonlocal busy
+            server = servers[cell].allocate()
+            busy += 1
+            dwell = dwells.draw(mobility_rate) if mobile[cell] else holding
+            if dwell < holding:
+                heappush(queue, (time + dwell, next(sequence), RESIDENCE, cell, server,
+                                 holding - dwell))
+            else:
+                heappush(queue, (time + holding, next(sequence), RESIDENCE, cell, server, 0.0))
+
+        def pick() -> int:
+            u = uniforms.draw()
+            return int(u*cells) if uniform else min(bisect(cumulative, u), cells - 1)
+
+        heappush(queue, (0.0, next(sequence), ARRIVAL, pick(), 0, 0.0))
+
+        num_arrival = 0
+        while num_arrival < total_arrival:
+            time, _, kind, cell, server, remaining = heappop(queue)
+            area += busy*(time - clock)
+            clock = time
+
+            if kind == ARRIVAL:
+                num_arrival += 1
+                heappush(queue, (time + gaps.draw(total_rate), next(sequence), ARRIVAL,
+                                 pick(), 0, 0.0))
+
+                arrived[cell] += 1
+                if len(servers[cell]) > thresholds[cell]:
+                    admit(cell, time, holdings.draw(departure_rate))
+                else:
+                    blocked[cell] += 1
+                continue
+
+            # The call leaves its cell, ending or handing over
+            servers[cell].deallocate(server)
+            busy -= 1
+            if not remaining:
+                completed += 1
+                continue
+
+            targets = neighbours[cell]
+            target = targets[int(uniforms.draw()*len(targets))]
+            handed[target] += 1
+            if servers[target].isFree():
+                admit(target, time, remaining)
+            else:
+                dropped[target] += 1
+
+        self.cells = cells
+        self.num_arrival = num_arrival
+        self.arrived, self.blocked = arrived, blocked
+        self.handed, self.dropped = handed, dropped
+        self.completed = completed
+        self.num_busy = busy
+        self.sim_time = clock
+        self.mean_busy = area/clock if clock else 0.0
+
+    def newcallBlocking(self) -> numpy.ndarray:
+        """ The new call blocking probability of each cell.
+
+        Returns:
+            - ndarray :: Blocked over arrived new calls, zero where none arrived.
+        """
+        arrived = numpy.asarray(self.arrived, dtype=float)
+        return numpy.divide(self.blocked, arrived, out = numpy.zeros(self.cells),
+                            where = arrived > 0)
+
+    def handoverBlocking(self) -> numpy.ndarray:
+        """ The hand over failure probability of each cell.
+
+        Returns:
+            - ndarray :: Dropped over arrived hand overs, zero where none arrived.
+        """
+        handed = numpy.asarray(self.handed, dtype=float)
+        return numpy.divide(self.dropped, handed, out = numpy.zeros(self.cells),
+                            where = handed > 0)
+
+    def blockingProbability(self) -> float:
+        """ Calculate the aggregated blocking probability of the network, the
+        new call blocking plus ten times the hand over failure, as in M1M2CC.
+
+        Returns:
+            - float :: Probability of blocking
+        """
+        arrived, handed = sum(self.arrived), sum(self.handed)
+        CBP = sum(self.blocked)/arrived if arrived else 0
+        HFP = sum(self.dropped)/handed if handed else 0
+        return CBP + (10 * HFP)
+
+    def serverUtilisation(self) -> float:
+        """ Calculate the server utilisation of the network, the time averaged
+        number of busy servers of a cell.
+
+        Returns:
+            - float :: Server utilisation value
+        """
+        return self.mean_busy/self.cells
+
+    @classmethod
+    def merge(cls, parts: list) -> "Network":
+        """ Join the results of networks simulated separately, such as the
+        partitions of torusNetwork(), the cells being numbered in order.
+
+        Params:
+            - parts :: The simulated networks.
+
+        Returns:
+            - Network :: The results of the whole network.
+        """
+        whole = cls()
+        whole.cells = sum(p.cells for p in parts)
+        for name in ("arrived", "blocked", "handed", "dropped"):
+            setattr(whole, name, [n for p in parts for n in getattr(p, name)])
+        for name in ("num_arrival", "completed", "num_busy", "mean_busy"):
+            setattr(whole, name, sum(getattr(p, name) for p in parts))
+        whole.sim_time = min(p.sim_time for p in parts)
+        return whole
+
+    def report(self) -> None:
+        """ Display the results of the simulation is a readible fashion. """
+
+        print("\tEvents Handled ::")
+        print("\t\tCells:", self.cells)
+        print("\t\tNew call:", sum(self.arrived))
+        print("\t\tNew call blocked:", sum(self.blocked))
+        print("\t\tHandover:", sum(self.handed))
+        print("\t\tHandover dropped:", sum(self.dropped))
+        print("\t\tCompleted:", self.completed)
+        print("\t\tIncomplete events:", self.num_busy)
+
+        print("\tBlocking rate:", self.blockingProbability())
+        print("\tServer Utilisation:", self.serverUtilisation())
+
+def runPartition(task: tuple) -> Network:
+    """ Simulate one partition of a torus network, within a worker process """
+    rows, cols, total_arrival, seed, params = task
+    network = Network()
+    network.run(torus(rows, cols), total_arrival, seed = seed, **params)
+    return network
+
+def torusNetwork(rows: int, cols: int, total_arrival: int, processes: int = None,
+                 seed: int = None, **params) -> Network:
+    """ Simulate a homogeneous torus of cells, optionally partitioned into
+    strips of rows spread over worker processes. Each strip is simulated as a
+    torus of its own, its calls moving across its upper and lower edges wrapping
+    around within the strip. Strips are at least three rows high, so that every
+    cell keeps four distinct neighbours and the flows of hand overs stay
+    balanced; the per cell behaviour of the whole torus is then kept while the
+    strips run independently, only correlations reaching across a whole strip
+    are lost.
+
+    Params:
+        - rows :: The number of rows of cells.
+        - cols :: The number of columns of cells.
+        - total_arrival :: The total number of new calls of the network, shared
+                           between the strips by their number of cells.
+        - processes :: The number of strips and worker processes, at most a
+                       third of the rows. The whole torus is simulated in this
+                       process if None or one.
+        - seed :: The root seed, from which each strip's seed is spawned.
+        - params :: The other run parameters of Network.run, given for all
+                    cells.
+
+    Returns:
+        - Network :: The results of the network.
+    """
+    processes = max(1, min(processes or 1, rows//3))   # Strips of three rows or more
+    if processes == 1:
+        network = Network()
+        network.run(torus(rows, cols), total_arrival, seed = seed, **params)
+        return network
+
+    strips = [len(s) for s in numpy.array_split(numpy.arange(rows), processes)]
+    children = numpy.random.SeedSequence(seed).spawn(processes)
+    tasks = [(height, cols, round(total_arrival*height/rows),
+              int(child.generate_state(1)[0]), params)
+             for height, child in zip(strips, children)]
+
+    with ProcessPoolExecutor(min(processes, os.cpu_count() or 1)) as pool:
+        return Network.merge(list(pool.map(runPartition, tasks)))
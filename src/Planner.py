@@ -0,0 +1,353 @@
+import numpy
+
+from Analytics import erlangB, aggregatedBlocking, guardChannel
+from Replication import Estimate
+from Sweep import models, runPoint
+
+def analyticRoot(function, target: float, lower: float, upper: float,
+                 tolerance: float = 1e-10) -> float:
+    """ Bisect for the point at which an increasing function meets a target.
+
+    Params:
+        - function :: The increasing function to be solved.
+        - target :: The value the function is to meet.
+        - lower :: A point at which the function is below the target.
+        - upper :: A point at which the function is above the target.
+        - tolerance :: The relative width of the bracket at which to stop.
+
+    Returns:
+        - float :: The largest point found with the function below the target.
+    """
+    while upper - lower > tolerance*upper:
+        middle = (lower + upper)/2
+        if function(middle) <= target:
+            lower = middle
+        else:
+            upper = middle
+    return lower
+
+def replicationSeed(seed, replication: int) -> int:
+    """ The seed of a replication. The i-th replication of every configuration
+    is run on the same seed, so that configurations are compared on common
+    random numbers and repeated points are served from the cache.
+
+    Params:
+        - seed :: The root seed of the replications.
+        - replication :: The index of the replication.
+
+    Returns:
+        - int :: The seed of the replication's run.
+    """
+    child = numpy.random.SeedSequence(seed, spawn_key = (replication,))
+    return int(child.generate_state(1)[0])
+
+def compare(model: str, params: dict, target: float, seed: int,
+            confidence: float = 0.95, min_replications: int = 3,
+            max_replications: int = 30, metric: str = "blocking") -> tuple:
+    """ Decide whether the blocking of a configuration is above or below a
+    target, replicating only until the confidence interval excludes the
+    target. Replications are seeded from the same root for every
+    configuration, so that successive comparisons share common random numbers.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - params :: The run parameters of the configuration.
+        - target :: The blocking probability compared against.
+        - seed :: The root seed of the replications.
+        - confidence :: The confidence level of the decision.
+        - min_replications :: The number of replications always run.
+        - max_replications :: The number of replications never exceeded.
+        - metric :: The result of the runs compared, a column of Sweep.result.
+
+    Returns:
+        - tuple :: The side of the target the blocking lies on, -1 below, 1
+                   above or 0 if undecided, and the number of runs used.
+    """
+    observations = []
+
+    while len(observations) < max_replications:
+        row = runPoint((model, params, replicationSeed(seed, len(observations))))
+        observations.append(row[metric])
+        if len(observations) < max(2, min_replications):
+            continue
+
+        lower, upper = Estimate(observations, confidence).interval()
+        if upper < target: return -1, len(observations)
+        if lower > target: return 1, len(observations)
+
+    return 0, len(observations)
+
+def analyticScale(analytic, target: float, scale: float, start: float) -> float:
+    """ The rate at which a multiple of the analytical blocking meets a target.
+
+    Params:
+        - analytic :: Function of the rate giving the analytical blocking.
+        - target :: The blocking probability that must be met.
+        - scale :: The multiple of the analytical blocking.
+        - start :: A rate at which the scaled blocking is below the target.
+
+    Returns:
+        - float :: The rate, infinite if the target is never exceeded.
+    """
+    if scale <= 0:
+        return float("inf")
+    function = lambda rate: analytic(rate)*scale
+    upper = start
+    while function(upper) <= target:
+        upper *= 2
+        if upper > start*2**64: return float("inf")
+    return analyticRoot(function, target, 0.0, upper)
+
+def maximumRate(model: str, rate: str, target: float, analytic, params: dict,
+                tolerance: float = 0.05, seed: int = None, budget: int = 48,
+                step: int = 8, confidence: float = 0.95) -> dict:
+    """ Find the largest arrival rate at which the simulated blocking meets a
+    target, in fewer runs than a grid of the same resolution. The analytical
+    model gives the shape of the blocking about the root, and the simulation
+    the factor by which the simulated blocking departs from it, such as the
+    bias of the empty start of finite runs. That factor changes little across
+    a narrow bracket, so every replication made so far contributes to its
+    estimate wherever it was run, rather than each point being decided from
+    its own replications alone.
+
+    Each step runs a fixed number of replications at the current estimate of
+    the rate, each on a replication seed of its own, the i-th replication of
+    every plan sharing its seed with the others; the confidence interval
+    of the factor then gives the bracket of rates, the lower end being
+    confirmed to meet the target at the chosen confidence. Steps continue
+    until the bracket is within tolerance or the run budget is spent.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - rate :: The name of the run parameter being planned.
+        - target :: The blocking probability that must be met.
+        - analytic :: Function of the rate giving the analytical blocking.
+        - params :: The other run parameters of the system.
+        - tolerance :: The relative bracket width at which to stop, about the
+                       spacing of the grid of MMCC.py.
+        - seed :: The root seed of the simulation replications.
+        - budget :: The number of simulation runs never exceeded, below the
+                    fifty of the grids of MMCC.py and M1+M2MCC.py.
+        - step :: The number of replications run at each estimate.
+        - confidence :: The confidence level of the bracket.
+
+    Returns:
+        - dict :: The planned rate, the largest confirmed to meet the target,
+                  the analytical rate, the estimated rate, the bracket, whether
+                  it was narrowed to the tolerance and the number of simulation
+                  runs used.
+    """
+    if model not in models:
+        raise ValueError("Unknown simulation model: " + str(model))
+
+    # Bracket the analytical root by doubling until the target is exceeded
+    upper = 1.0
+    while analytic(upper) <= target: upper *= 2
+    estimate = analyticRoot(analytic, target, 0.0, upper)
+
+    seed = numpy.random.SeedSequence(seed).entropy
+    factors = []        # Simulated over analytical blocking of each replication
+    point = estimate    # Rate the next replications are run at
+    bracket = (0.0, float("inf"))
+
+    while len(factors) < budget:
+        for _ in range(min(step, budget - len(factors))):
+            row = runPoint((model, dict(params, **{rate: point}),
+                            replicationSeed(seed, len(factors))))
+            factors.append(row["blocking"]/analytic(point))
+        if len(factors) < 2:
+            continue
+
+        factor = Estimate(factors, confidence)
+        least, most = factor.interval()
+        bracket = (analyticScale(analytic, target, most, estimate/2),
+                   analyticScale(analytic, target, least, estimate/2))
+        middle = analyticScale(analytic, target, factor.mean, estimate/2)
+        if middle < float("inf"): point = middle   # Blocking seen, else stay put
+        if bracket[1] - bracket[0] <= tolerance*point: break
+
+    return {"rate": bracket[0], "analytic": estimate, "estimate": point, "bracket": bracket,
+            "resolved": bracket[1] - bracket[0] <= tolerance*point, "runs": len(factors)}
+
+def maximumArrivalRate(servers: int, target: float = 0.01, departure_rate: float = 0.01,
+                       total_arrival: int = 10000, **options) -> dict:
+    """ The largest MMCC arrival rate with blocking below a target.
+
+    Params:
+        - servers :: The number of servers of the system.
+        - target :: The blocking probability that must be met.
+        - departure_rate :: The departure rate of the clients.
+        - total_arrival :: The arrivals of each simulation run.
+        - options :: Options passed on to maximumRate().
+
+    Returns:
+        - dict :: The plan, see maximumRate().
+    """
+    return maximumRate("MMCC", "arrival_rate", target,
+                       lambda rate: erlangB(rate/departure_rate, servers),
+                       dict(total_servers = servers, total_arrival = total_arrival,
+                            departure_rate = departure_rate, retain = False),
+                       **options)
+
+def maximumNewcallRate(servers: int, threshold: int, handover_rate: float,
+                       target: float = 0.02, departure_rate: float = 0.01,
+                       total_arrival: int = 10000, **options) -> dict:
+    """ The largest M1M2CC new call arrival rate with aggregated blocking below
+    a target.
+
+    Params:
+        - servers :: The number of servers of the system.
+        - threshold :: The number of servers reserved for hand overs.
+        - handover_rate :: The hand over arrival rate.
+        - target :: The aggregated blocking probability that must be met.
+        - departure_rate :: The departure rate of the clients.
+        - total_arrival :: The arrivals of each simulation run.
+        - options :: Options passed on to maximumRate().
+
+    Returns:
+        - dict :: The plan, see maximumRate().
+    """
+    return maximumRate("M1M2CC", "newcall_rate", target,
+                       lambda rate: aggregatedBlocking(servers, threshold, handover_rate,
+                                                       rate, departure_rate),
+                       dict(total_servers = servers, threshold = threshold,
+                            handover_rate = handover_rate, total_arrival = total_arrival,
+                            departure_rate = departure_rate, retain = False),
+                       **options)
+
+def fewest(side, count: int, smallest: int = 1, largest: int = None) -> tuple:
+    """ The smallest count meeting a target, for outputs that fall as the count
+    grows. The count is raised from its starting value until simulation
+    confirms the target is met, then lowered while the count below is also
+    confirmed. A count whose comparison is undecided is never taken as meeting
+    the target.
+
+    Params:
+        - side :: Function of a count giving the side of the target its output
+                  lies on, see compare().
+        - count :: The count to start from, usually the analytical solution.
+        - smallest :: The smallest count allowed.
+        - largest :: The largest count allowed, unlimited if None.
+
+    Returns:
+        - tuple :: The smallest count confirmed to meet the target, and whether
+                   the count below it was confirmed not to.
+    """
+    while side(count) >= 0:
+        count += 1
+        if largest is not None and count > largest:
+            raise ValueError("No count up to " + str(largest) + " meets the target")
+
+    while count > smallest:
+        decision = side(count - 1)
+        if decision >= 0:
+            return count, decision > 0
+        count -= 1
+    return count, True
+
+def minimumServers(arrival_rate: float, target: float = 0.01, departure_rate: float = 0.01,
+                   total_arrival: int = 10000, seed: int = None, **replication) -> dict:
+    """ The fewest MMCC servers with blocking below a target. The Erlang B
+    solution is taken as the starting count, which the simulation then moves
+    up or down one server at a time, see fewest().
+
+    Params:
+        - arrival_rate :: The arrival rate of the clients.
+        - target :: The blocking probability that must be met.
+        - departure_rate :: The departure rate of the clients.
+        - total_arrival :: The arrivals of each simulation run.
+        - seed :: The root seed of the simulation replications.
+        - replication :: Options passed on to compare().
+
+    Returns:
+        - dict :: The planned and analytical server counts, whether the count
+                  below the plan was confirmed to miss the target rather than
+                  left undecided, and the number of simulation runs used.
+    """
+    load = arrival_rate/departure_rate
+
+    # Erlang B falls with every added server, so the first count below target
+    servers = 1
+    while erlangB(load, servers) > target: servers += 1
+
+    params = dict(total_arrival = total_arrival, arrival_rate = arrival_rate,
+                  departure_rate = departure_rate, retain = False)
+    return planCount("MMCC", "total_servers", target, servers, params, seed,
+                     replication, smallest = 1)
+
+def minimumThreshold(servers: int, handover_rate: float, newcall_rate: float,
+                     target: float = 0.01, departure_rate: float = 0.01,
+                     total_arrival: int = 10000, seed: int = None, **replication) -> dict:
+    """ The fewest M1M2CC servers reserved for hand overs, the guard channels,
+    with hand over blocking below a target. Every reserved server lowers the
+    hand over blocking at the cost of new calls, so the fewest reserved meeting
+    the target blocks the fewest new calls. The guard channel solution is taken
+    as the starting threshold, which the simulation then moves up or down one
+    server at a time, see fewest().
+
+    Params:
+        - servers :: The number of servers of the system.
+        - handover_rate :: The hand over arrival rate.
+        - newcall_rate :: The new call arrival rate.
+        - target :: The hand over blocking probability that must be met.
+        - departure_rate :: The departure rate of the clients.
+        - total_arrival :: The arrivals of each simulation run.
+        - seed :: The root seed of the simulation replications.
+        - replication :: Options passed on to compare().
+
+    Returns:
+        - dict :: The planned and analytical thresholds, whether the threshold
+                  below the plan was confirmed to miss the target rather than
+                  left undecided, and the number of simulation runs used.
+    """
+    handover = lambda threshold: guardChannel(servers, threshold, handover_rate,
+                                              newcall_rate, departure_rate)[0]
+
+    threshold = 0
+    while handover(threshold) > target:
+        threshold += 1
+        if threshold > servers:
+            raise ValueError("No threshold meets the target, even reserving every server")
+
+    params = dict(total_servers = servers, total_arrival = total_arrival,
+                  handover_rate = handover_rate, newcall_rate = newcall_rate,
+                  departure_rate = departure_rate, retain = False)
+    return planCount("M1M2CC", "threshold", target, threshold, params, seed,
+                     dict(replication, metric = "handover_blocking"),
+                     smallest = 0, largest = servers)
+
+def planCount(model: str, count: str, target: float, estimate: int, params: dict,
+              seed: int, replication: dict, smallest: int, largest: int = None) -> dict:
+    """ Plan the smallest value of an integer run parameter meeting a target,
+    see fewest(). Each count is compared at most once, the replications of a
+    count being kept for any later comparison of it.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - count :: The name of the run parameter being planned.
+        - target :: The blocking probability that must be met.
+        - estimate :: The analytical solution, the count started from.
+        - params :: The other run parameters of the system.
+        - seed :: The root seed of the simulation replications.
+        - replication :: Options passed on to compare().
+        - smallest :: The smallest count allowed.
+        - largest :: The largest count allowed, unlimited if None.
+
+    Returns:
+        - dict :: The plan, see minimumServers().
+    """
+    seed = numpy.random.SeedSequence(seed).entropy
+    decisions = {}   # Side of the target of each count compared
+    runs = 0
+
+    def side(value: int) -> int:
+        nonlocal runs
+        if value not in decisions:
+            decisions[value], used = compare(model, dict(params, **{count: value}), target,
+                                             seed, **replication)
+            runs += used
+        return decisions[value]
+
+    planned, resolved = fewest(side, estimate, smallest, largest)
+    name = "servers" if count == "total_servers" else count
+    return {name: planned, "analytic": estimate, "resolved": resolved, "runs": runs}
@@ -0,0 +1,194 @@
+from math import sqrt, tan, pi
+from statistics import NormalDist, mean, stdev, variance
+
+import numpy
+
+from Sweep import models, runPoint
+
+def tQuantile(p: float, df: int) -> float:
+    """ Quantile of the Student t distribution. Exact for one and two degrees
+    of freedom, otherwise the Cornish-Fisher expansion about the normal
+    quantile is used (Abramowitz and Stegun 26.7.5).
+
+    Params:
+        - p :: The cumulative probability of the quantile.
+        - df :: The degrees of freedom of the distribution.
+
+    Returns:
+        - float :: The value below which a proportion p of the distribution lies.
+    """
+    if df == 1:
+        return tan(pi*(p - 0.5))
+    if df == 2:
+        return (2*p - 1)/sqrt(2*p*(1 - p))
+
+    z = NormalDist().inv_cdf(p)
+    g1 = (z**3 + z)/4
+    g2 = (5*z**5 + 16*z**3 + 3*z)/96
+    g3 = (3*z**7 + 19*z**5 + 17*z**3 - 15*z)/384
+    g4 = (79*z**9 + 776*z**7 + 1482*z**5 - 1920*z**3 - 945*z)/92160
+    return z + g1/df + g2/df**2 + g3/df**3 + g4/df**4
+
+class Estimate:
+    """ A point estimate of a simulation output with its confidence interval,
+    formed from independent observations such as replications or batch means.
+    """
+
+    def __init__(self, values: list, confidence: float = 0.95):
+        """ Form the estimate from a set of independent observations.
+
+        Params:
+            - values :: The observations, at least two are required.
+            - confidence :: The confidence level of the interval.
+        """
+        self.samples = len(values)
+        self.confidence = confidence
+        self.mean = mean(values)
+        self.half_width = tQuantile(0.5 + confidence/2, self.samples - 1) * \
+                          stdev(values)/sqrt(self.samples)
+
+    def __str__(self) -> str:
+        """ Protected function to allow str() to display an object
+
+        Returns:
+            - str :: The estimate and its interval
+        """
+        return "{} +/- {} ({:.0%} confidence, {} samples)".format(
+            self.mean, self.half_width, self.confidence, self.samples)
+
+    def interval(self) -> tuple:
+        """ The lower and upper limits of the confidence interval.
+
+        Returns:
+            - tuple :: The lower and upper limit of the interval.
+        """
+        return self.mean - self.half_width, self.mean + self.half_width
+
+    def relativeHalfWidth(self) -> float:
+        """ The half width of the interval relative to the estimate.
+
+        Returns:
+            - float :: The relative half width, zero for a constant output.
+        """
+        if self.mean:
+            return self.half_width/abs(self.mean)
+        return 0.0 if not self.half_width else float("inf")
+
+def replicate(model: str, params: dict, precision: float = 0.05,
+              confidence: float = 0.95, min_replications: int = 5,
+              max_replications: int = 1000, seed: int = None,
+              metrics: tuple = ("blocking", "utilisation")) -> dict:
+    """ Run independent replications of a simulation until every metric is
+    estimated to within a relative precision, or the replication limit is met.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - params :: The run parameters of every replication.
+        - precision :: The relative half width at which replication stops.
+        - confidence :: The confidence level of the intervals.
+        - min_replications :: The number of replications always run.
+        - max_replications :: The number of replications never exceeded.
+        - seed :: The root seed from which the replications are seeded.
+        - metrics :: The run results to be estimated.
+
+    Returns:
+        - dict :: An Estimate for each metric.
+    """
+    if model not in models:
+        raise ValueError("Unknown simulation model: " + str(model))
+
+    seeds = numpy.random.SeedSequence(seed)
+    observations = {metric: [] for metric in metrics}
+
+    while True:
+        row = runPoint((model, params, int(seeds.spawn(1)[0].generate_state(1)[0])))
+        for metric in metrics:
+            observations[metric].append(row[metric])
+
+        replications = len(observations[metrics[0]])
+        if replications < max(2, min_replications):
+            continue
+
+        estimates = {m: Estimate(v, confidence) for m, v in observations.items()}
+        if replications >= max_replications or \
+           all(e.relativeHalfWidth() <= precision for e in estimates.values()):
+            return estimates
+
+def batchMeans(model: str, params: dict, batches: int = 20, discard: int = 1,
+               confidence: float = 0.95, seed: int = None) -> dict:
+    """ Estimate the blocking probability and utilisation from a single long
+    run, divided into batches of equal numbers of arrivals. The first batches
+    may be discarded to remove the transient of the empty starting system.
+
+    Params:
+        - model :: The name of an event simulation machine, MMCC or M1M2CC.
+        - params :: The run parameters, total_arrival is split into batches.
+        - batches :: The number of batches the run is divided into.
+        - discard :: The number of leading batches that are discarded.
+        - confidence :: The confidence level of the intervals.
+        - seed :: The seed of the run.
+
+    Returns:
+        - dict :: An Estimate for the blocking and utilisation metrics.
+    """
+    if batches - discard < 2:
+        raise ValueError("At least two batches must remain after discarding")
+
+    params = dict(params, batch_size = params["total_arrival"]//batches)
+    machine = models[model]()
+    machine.run(seed = seed, **params)
+
+    kept = machine.events.stats.batches()[discard:]
+    return {
+        "blocking": Estimate([machine.blockingProbability(b) for b in kept], confidence),
+        "utilisation": Estimate([machine.serverUtilisation(b) for b in kept], confidence)
+    }
+
+def pairedComparison(model: str, configurations: list, replications: int = 10,
+                     metric: str = "blocking", confidence: float = 0.95,
+                     seed: int = None, **fixed) -> list:
+    """ Compare simulation configurations with common random numbers. Every
+    replication runs each configuration in lock-step on the same seed, so the
+    configurations see the same underlying variates, and the differences to the
+    first configuration are estimated from the paired observations.
+
+    Params:
+        - model :: The name of the simulation machine, a key of Sweep.models.
+        - configurations :: The run parameters of each configuration, such as
+                            its total_servers and threshold. The first is the
+                            baseline of the comparison.
+        - replications :: The number of replications of each configuration.
+        - metric :: The run result that is compared.
+        - confidence :: The confidence level of the intervals.
+        - seed :: The root seed from which the replications are seeded.
+        - fixed :: Run parameters shared by every configuration.
+
+    Returns:
+        - list :: For each configuration, a dictionary of its parameters, the
+                  Estimate of the metric, the Estimate of the paired difference
+                  to the baseline and the sample variance of that difference.
+    """
+    if model not in models:
+        raise ValueError("Unknown simulation model: " + str(model))
+    if replications < 2:
+        raise ValueError("At least two replications are required")
+
+    seeds = numpy.random.SeedSequence(seed).spawn(replications)
+    observations = [[] for _ in configurations]
+
+    for child in seeds:
+        shared = int(child.generate_state(1)[0])
+        for values, config in zip(observations, configurations):
+            row = runPoint((model, dict(fixed, **config), shared))
+            values.append(row[metric])
+
+    comparison = []
+    for values, config in zip(observations, configurations):
+        differences = [v - b for v, b in zip(values, observations[0])]
+        comparison.append({
+            "configuration": config,
+            "estimate": Estimate(values, confidence),
+            "difference": Estimate(differences, confidence),
+            "variance": variance(differences)
+        })
+    return comparison
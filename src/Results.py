@@ -0,0 +1,253 @@
+import errno
+from numbers import Integral, Real
+import os
+import shutil
+import tempfile
+
+import numpy
+
+def flatten(row: dict) -> dict:
+    """ Flatten a result row into plain column values. Estimates, such as those
+    of Replication.replicate, give their mean under their own name along with
+    their half width and number of samples; NumPy scalars become Python values.
+
+    Params:
+        - row :: The parameters and results of a run.
+
+    Returns:
+        - dict :: The value of each column.
+    """
+    flat = {}
+    for name, value in row.items():
+        if hasattr(value, "half_width"):
+            flat[name] = value.mean
+            flat[name + "_half_width"] = value.half_width
+            flat[name + "_samples"] = value.samples
+        else:
+            flat[name] = value.item() if hasattr(value, "item") else value
+    return flat
+
+def columnArray(values: list) -> numpy.ndarray:
+    """ Convert the values of a column into an array of a fixed width type:
+    booleans, integers, floats with None as NaN, or strings for anything else.
+
+    Params:
+        - values :: The values of the column.
+
+    Returns:
+        - ndarray :: The column.
+    """
+    present = [v for v in values if v is not None]
+    if present and len(present) == len(values) and all(isinstance(v, bool) for v in present):
+        return numpy.array(values, dtype=bool)
+    if present and len(present) == len(values) and \
+       all(isinstance(v, Integral) and not isinstance(v, bool) for v in present):
+        return numpy.array(values, dtype=numpy.int64)
+    if all(isinstance(v, Real) for v in present):
+        return numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+    return numpy.array(["" if v is None else v if isinstance(v, str) else repr(v)
+                        for v in values], dtype=str)
+
+class ResultStore:
+    """ Append only columnar store of the results of many runs, such as the rows
+    of a sweep. Rows are gathered in memory and written a chunk at a time, each
+    chunk a directory holding one .npy file per column, so that any column of
+    any chunk can be mapped into memory without reading the rest of the store.
+    Chunks are written under a temporary name and renamed into place, so
+    readers never see a partial chunk and several processes may append to the
+    same store.
+
+    Queries scan the chunks in order, mapping only the columns they need, and
+    copy out the matching rows, so stores far larger than memory can be
+    filtered and aggregated. Columns missing from some chunks, such as the
+    parameters of another model, read as NaN, or as empty strings for columns
+    of strings.
+    """
+
+    def __init__(self, directory: str, chunk: int = 2**16):
+        """ Open a store, creating its directory if needed.
+
+        Params:
+            - directory :: The directory of the store.
+            - chunk :: The number of rows gathered before a chunk is written.
+        """
+        self.directory = directory
+        self.chunk = chunk
+        self.rows = []   # Rows yet to be written
+        os.makedirs(directory, exist_ok = True)
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.flush()
+
+    def append(self, row: dict) -> None:
+        """ Add the row of a run, writing a chunk once enough are gathered.
+
+        Params:
+            - row :: The parameters and results of the run, see flatten().
+        """
+        self.rows.append(flatten(row))
+        if len(self.rows) >= self.chunk: self.flush()
+
+    def extend(self, rows) -> None:
+        """ Add the rows of many runs """
+        for row in rows:
+            self.append(row)
+
+    def flush(self) -> None:
+        """ Write the gathered rows as a new chunk """
+        if not self.rows:
+            return
+
+        names = list(dict.fromkeys(name for row in self.rows for name in row))
+        staging = tempfile.mkdtemp(prefix = ".chunk", dir = self.directory)
+        for name in names:
+            numpy.save(os.path.join(staging, name + ".npy"),
+                       columnArray([row.get(name) for row in self.rows]))
+
+        # Take the next free chunk number, another writer may take it first
+        number = len(self.chunks())
+        while True:
+            try:
+                os.rename(staging, os.path.join(self.directory, "{:08d}".format(number)))
+                break
+            except OSError as error:
+                # Taken by another writer, renaming onto a full directory
+                # fails with ENOTEMPTY or EEXIST; anything else is an error
+                if error.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    shutil.rmtree(staging, ignore_errors = True)
+                    raise
+                number += 1
+        self.rows = []
+
+    def chunks(self) -> list:
+        """ The directories of the written chunks, in order of writing """
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.isdigit())
+
+    def load(self, chunk: str, columns: list = None) -> dict:
+        """ Map the columns of a chunk into memory.
+
+        Params:
+            - chunk :: The directory of the chunk, see chunks().
+            - columns :: The names of the columns mapped, all if None.
+
+        Returns:
+            - dict :: A read only array for each column found in the chunk.
+        """
+        names = columns if columns is not None else \
+                [name[:-4] for name in sorted(os.listdir(chunk)) if name.endswith(".npy")]
+        found = {}
+        for name in names:
+            path = os.path.join(chunk, name + ".npy")
+            if os.path.exists(path):
+                found[name] = numpy.load(path, mmap_mode = "r")
+        return found
+
+    def columns(self) -> list:
+        """ The names of every column of the store """
+        names = {}
+        for chunk in self.chunks():
+            names.update(dict.fromkeys(self.load(chunk)))
+        return list(names)
+
+    def __len__(self) -> int:
+        """ Protected function giving the number of written rows """
+        return sum(ChunkColumns(self, chunk).size for chunk in self.chunks())
+
+    def scan(self, columns: list, where = None, **equals):
+        """ The matching rows of the store, a chunk at a time, for aggregates
+        that need not hold every match at once.
+
+        Params:
+            - columns :: The names of the columns given.
+            - where :: A function of a chunk's columns giving a boolean mask of
+                       the rows kept, such as lambda c: c["blocking"] < 0.01.
+                       Only the columns it reads are mapped.
+            - equals :: Values that named columns must be equal to.
+
+        Returns:
+            - generator :: A dictionary of the matching rows of each column for
+                           every chunk with a match.
+        """
+        kinds = {}   # Kinds of the columns missing from a chunk
+        for chunk in self.chunks():
+            arrays = ChunkColumns(self, chunk, kinds)
+            if not arrays.size:
+                continue
+
+            mask = numpy.ones(arrays.size, dtype=bool)
+            for name, value in equals.items():
+                mask &= arrays[name] == value
+            if where is not None:
+                mask &= where(arrays)
+
+            if mask.any():
+                yield {name: numpy.asarray(arrays[name][mask]) for name in columns}
+
+    def kind(self, name: str) -> str:
+        """ The array kind of a column, from the first chunk holding it, None if
+        no chunk holds it.
+        """
+        for chunk in self.chunks():
+            found = self.load(chunk, [name])
+            if found: return found[name].dtype.kind
+        return None
+
+    def query(self, columns: list = None, where = None, **equals) -> dict:
+        """ Gather the matching rows of the store.
+
+        Params:
+            - columns :: The names of the columns given, every column if None.
+            - where :: A function of a chunk's columns giving a boolean mask of
+                       the rows kept, see scan().
+            - equals :: Values that named columns must be equal to.
+
+        Returns:
+            - dict :: An array of the matching rows of each column.
+        """
+        columns = self.columns() if columns is None else list(columns)
+        parts = list(self.scan(columns, where, **equals))
+        return {name: numpy.concatenate([part[name] for part in parts]) if parts
+                else numpy.empty(0) for name in columns}
+
+    def clear(self) -> None:
+        """ Remove every row of the store, written or gathered """
+        self.rows = []
+        for chunk in self.chunks():
+            shutil.rmtree(chunk, ignore_errors = True)
+
+class ChunkColumns(dict):
+    """ The columns of a chunk of a store, each mapped into memory when first
+    read. Columns the chunk lacks read as NaN, or as empty strings for columns
+    of strings.
+    """
+
+    def __init__(self, store: ResultStore, chunk: str, kinds: dict = None):
+        """ Initialise the columns, nothing is mapped until read.
+
+        Params:
+            - store :: The store of the chunk.
+            - chunk :: The directory of the chunk.
+            - kinds :: The array kinds of missing columns found so far, shared
+                       between the chunks of a scan.
+        """
+        super().__init__()
+        self.store = store
+        self.chunk = chunk
+        self.kinds = {} if kinds is None else kinds
+        names = sorted(n for n in os.listdir(chunk) if n.endswith(".npy"))
+        self.size = len(numpy.load(os.path.join(chunk, names[0]), mmap_mode = "r")) \
+                    if names else 0
+
+    def __missing__(self, name: str) -> numpy.ndarray:
+        found = self.store.load(self.chunk, [name])
+        if found:
+            self[name] = found[name]
+        else:
+            if name not in self.kinds: self.kinds[name] = self.store.kind(name)
+            missing = "" if self.kinds[name] == "U" else numpy.nan
+            self[name] = numpy.full(self.size, missing)
+        return self[name]
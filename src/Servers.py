@@ -1,36 +1,134 @@
+from collections import deque
+from heapq import heapify, heappush, heappop
+import random
+
+class FIFOPool:
+    """ Free server pool that hands out servers in the order they became free.
+    The least recently freed server is always allocated next.
+    """
+
+    def __init__(self, servers: list, generator = None):
+        """ Initialise the pool with the given free server ids.
+
+        Params:
+            - servers :: The server ids that begin free.
+            - generator :: The NumPy generator of pools choosing at random.
+        """
+        self.servers = deque(servers)
+
+    def use(self, generator) -> None:
+        """ Draw later choices from a generator, for pools choosing at random """
+
+    def __len__(self) -> int:
+        """ Number of free servers held within the pool """
+        return len(self.servers)
+
+    def take(self) -> int:
+        """ Remove a server from the pool in O(1) """
+        return self.servers.popleft()
+
+    def put(self, server: int) -> None:
+        """ Return a server to the pool in O(1) """
+        self.servers.append(server)
+
+class LowestPool(FIFOPool):
+    """ Free server pool that always hands out the lowest free server id. The
+    ids are kept in a binary heap, so allocation and freeing are O(log c).
+    """
+
+    def __init__(self, servers: list, generator = None):
+        self.servers = list(servers)
+        heapify(self.servers)
+
+    def take(self) -> int:
+        return heappop(self.servers)
+
+    def put(self, server: int) -> None:
+        heappush(self.servers, server)
+
+class RandomPool(FIFOPool):
+    """ Free server pool that hands out a free server chosen uniformly at random.
+    The chosen server is swapped with the last id before removal so that both
+    allocation and freeing are O(1). Choices are drawn from the generator of
+    the run's server stream, a block of uniforms at a time, or from the global
+    random module for pools made without one.
+    """
+
+    def __init__(self, servers: list, generator = None, block: int = 4096):
+        self.servers = list(servers)
+        self.block = block
+        self.use(generator)
+
+    def use(self, generator) -> None:
+        self.generator = generator
+        self.buffer = []    # Uniforms yet to be used, for a generator
+
+    def take(self) -> int:
+        if self.generator is None:
+            i = random.randrange(len(self.servers))
+        else:
+            if not self.buffer:
+                self.buffer = self.generator.random(self.block).tolist()
+            i = int(self.buffer.pop()*len(self.servers))
+        self.servers[i], self.servers[-1] = self.servers[-1], self.servers[i]
+        return self.servers.pop()
+
+    def put(self, server: int) -> None:
+        self.servers.append(server)
+
 class Servers:
-    """ A collect of server ID, provides a collection of convient functions to 
-    interact with a server item. The servers are represented by an integer, 
-    these server ids move back and forth from a free and busy list to keep
-    track.
+    """ A collect of server ID, provides a collection of convient functions to
+    interact with a server item. The servers are represented by an integer,
+    these server ids move back and forth from a free pool and a busy bitmap to
+    keep track.
     """
 
-    def __init__(self, num_servers: int):
+    # Allocation policies that can be selected for the free server pool
+    policies = {"fifo": FIFOPool, "lowest": LowestPool, "random": RandomPool}
+
+    def __init__(self, num_servers: int, policy: str = "fifo", generator = None):
         """ Initialise the server list. Server Ids fall in range 1 - the number
         of servers.
-        
+
         Params:
             - num_servers :: The total number of servers in for the system.
+            - policy :: The order in which free servers are allocated, one of
+                        "fifo", "lowest" or "random".
+            - generator :: The NumPy generator random allocation draws from,
+                           such as that of Streams.servers. The global random
+                           module is used if None.
         """
-        self.free = list(range(1,num_servers+1))
-        self.busy = []
+        if policy not in Servers.policies:
+            raise ValueError("Unknown allocation policy: " + str(policy))
+
+        self.free = Servers.policies[policy](range(1,num_servers+1), generator)
+        self.busy = bytearray(num_servers+1) # Busy flag indexed by server id
 
     def __len__(self) -> int:
         """ Protected function allowing len() to determine the number of free
         servers.
 
         Returns:
-            - int :: Number of free servers.abs
+            - int :: Number of free servers.
         """
         return len(self.free)
 
+    def use(self, generator) -> None:
+        """ Draw later random allocations from a generator, such as that of
+        freshly seeded streams.
+
+        Params:
+            - generator :: The NumPy generator drawn from.
+        """
+        self.free.use(generator)
+
     def isFree(self) -> bool:
         """ Query if any servers are free.
 
         Returns:
             - bool :: True if server free, False if server not free.
         """
-        return len(self) > 0
+        return len(self.free) > 0
 
     def allocate(self) -> int:
         """ Remove next freely available server for allocation, record server is
@@ -39,8 +137,8 @@ class Servers:
         Returns:
             - int :: ServerID of the now allocated server.
         """
-        server, self.free = self.free[0], self.free[1:]
-        self.busy.append(server)
+        server = self.free.take()
+        self.busy[server] = 1
         return server
 
     def deallocate(self, server: int) -> None:
@@ -50,6 +148,8 @@ class Servers:
         Params:
             - server :: a serverID of a busy server
         """
-        self.busy.remove(server)
-        self.free.append(server)
+        if not self.busy[server]:
+            raise ValueError("Server " + str(server) + " is not busy")
 
+        self.busy[server] = 0
+        self.free.put(server)
@@ -1,35 +1,185 @@
-from numpy import *
-
 from EventHandler import EventHandler, M1M2EventHandler
 from Servers import Servers
-from Event import Event, M1M2Event
+from Statistics import Statistics
+from Streams import Streams
+from Distributions import Distribution
+from Event import Event, M1M2Event, Rates, ARRIVAL, HANDOVER, NEWCALL
+import Checkpoint
 
 class MMCC:
     """ Simulation object tasked with conducting the MMCC system """
 
-    def run(self, total_servers: int, total_arrival :int) -> None:
+    def run(self, total_servers: int, total_arrival :int, retain: bool = True,
+            arrival_rate: float = None, departure_rate: float = None,
+            batch_size: int = None, seed = None, instrument = None,
+            warmup = 0, checkpoint: str = None, checkpoint_every: int = None,
+            trace = None, source = None, arrival: Distribution = None,
+            service: Distribution = None, policy: str = "fifo") -> None:
         """ Begin the simulation of a MMCC system. Process the information until
-        termination criteria is meet.
+        termination criteria is meet. Rates that are not given are taken from
+        the static rates of Event.
 
         Params:
             - total_servers :: The number of servers that can handle clients at 
                                any one instance.
             - total_arrival :: The total number of clients that can be handled
                                within the simulation.
+            - retain :: Keep every departed and blocked event for debugging. When
+                        False only streaming statistics are kept, using O(1)
+                        memory.
+            - arrival_rate :: The arrival rate of clients for this run.
+            - departure_rate :: The departure rate of clients for this run.
+            - batch_size :: Snapshot the statistics every batch_size arrivals.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+            - instrument :: An Instrument to record the run loop, if any.
+            - warmup :: The number of arrivals treated as the transient, or
+                        "mser" to detect the end of the transient on the fly.
+                        The blocking and utilisation exclude the transient.
+            - checkpoint :: A file to write checkpoints of the run to, if any.
+                            Runs given an instrument, trace or source cannot be
+                            checkpointed, and raise a ValueError.
+            - checkpoint_every :: The number of arrivals between checkpoints,
+                                  only the end of the run is saved if None.
+            - trace :: A TraceWriter recording the run, if any.
+            - source :: A CallSource the calls are read from instead of being
+                        drawn from the rates, see Sources. The run ends at the
+                        last call if total_arrival is None.
+            - arrival :: The Distribution of the inter-arrival times, scaled to
+                         the arrival rates, exponential if None.
+            - service :: The Distribution of the service times, scaled to the
+                         departure rate, exponential if None. Ignored when seed
+                         is a Streams, which carries its own distributions.
+            - policy :: The order in which free servers are allocated, see
+                        Servers.policies. Random allocation draws from the
+                        server stream of the run.
         """
+        Checkpoint.check(checkpoint, instrument, trace, source)
 
         # Initialise the beginning parameters of the simulation
-        self.servers = Servers(total_servers) # Set up server handler
-        self.events = EventHandler()          # Set up the event handler
+        self.rates = rates = Rates(
+            Event.arrivalRate if arrival_rate is None else arrival_rate,
+            Event.departureRate if departure_rate is None else departure_rate,
+            streams = seed if isinstance(seed, Streams) else \
+                      Streams(seed, arrival = arrival, service = service)
+        )
+        self.servers = Servers(total_servers, policy, rates.streams.servers.generator)
+        self.events = EventHandler(retain, batch_size, warmup) # Set up the event handler
+        self.instrument, self.trace = instrument, trace # Wrappers of the components
+        if instrument: instrument.attach(self) # Wrap the components to record
+        if trace: trace.attach(self)
+
+        self.num_arrival = 0
+        self.sim_time = 0
+        if self.open(source):
+            startingEvent = Event(ARRIVAL, 0, rates) # Construct the first event object
+            startingEvent.departure_time -= startingEvent.arrival_time # Reset times
+            startingEvent.arrival_time = 0    # Reset times
+
+            self.events.add(startingEvent)    # Create the first event
 
-        startingEvent = Event("arrival", 0)   # Construct the first event object
-        startingEvent.departure_time -= startingEvent.arrival_time # Reset times
-        startingEvent.arrival_time = 0        # Reset times
+        self.resume(total_arrival, checkpoint, checkpoint_every)
+
+    def open(self, source) -> bool:
+        """ Begin reading the calls of a run from a source, adding the first.
+
+        Params:
+            - source :: The CallSource of the run, None to draw from the rates.
 
-        self.events.add(startingEvent)        # Create the first event
+        Returns:
+            - bool :: True if the run draws its own arrivals.
+        """
+        self.source = None if source is None else iter(source)
+        self.exhausted = False
+        if self.source is None:
+            return True
+
+        if not self.feed():
+            raise ValueError("The arrival source holds no calls")
+        return False
+
+    def feed(self) -> bool:
+        """ Add the arrival of the next call of the source to the event list.
+
+        Returns:
+            - bool :: False once the source has run dry.
+        """
+        try:
+            arrival, holding, path = next(self.source)
+        except StopIteration:
+            self.exhausted = True
+            return False
+
+        self.events.add(self.call(arrival, holding, path))
+        return True
+
+    def call(self, arrival: float, holding: float, path: int) -> Event:
+        """ The arrival event of a call read from a source.
+
+        Params:
+            - arrival :: The arrival time of the call.
+            - holding :: The holding time of the call.
+            - path :: The path of the call, unused by the MMCC system.
+
+        Returns:
+            - Event :: The arrival event.
+        """
+        return Event.fromCall(arrival, holding)
+
+    def resume(self, total_arrival: int, checkpoint: str = None,
+               checkpoint_every: int = None) -> None:
+        """ Continue a run until a total number of arrivals, checkpointing
+        periodically if asked. Checkpoints are only taken between events, so a
+        run resumed from one continues exactly as it would have uninterrupted.
+
+        Params:
+            - total_arrival :: The total number of arrivals the run ends at,
+                               every call of the source if None.
+            - checkpoint :: A file to write checkpoints of the run to, if any.
+            - checkpoint_every :: The number of arrivals between checkpoints,
+                                  only the end of the run is saved if None.
+        """
+        Checkpoint.check(checkpoint, self.instrument, self.trace, self.source)
+        if total_arrival is None: total_arrival = float("inf")
+
+        while self.num_arrival < total_arrival and not self.exhausted:
+            until = total_arrival if not checkpoint_every else \
+                    min(total_arrival, (self.num_arrival//checkpoint_every + 1)*checkpoint_every)
+            self.advance(until)
+            if checkpoint: self.save(checkpoint)
+
+        # Bring the time weighted totals up to the end of the run
+        self.events.stats.settle(self.sim_time)
+
+    def save(self, path: str) -> None:
+        """ Write a checkpoint of the run, see Checkpoint.save.
+
+        Params:
+            - path :: The file the checkpoint is written to.
+        """
+        Checkpoint.save(self, path)
+
+    def fork(self, seed = None) -> "MMCC":
+        """ Copy the run to continue a what if run from its state, see
+        Checkpoint.fork.
+
+        Params:
+            - seed :: Seed of fresh random streams for the copy, if any.
+
+        Returns:
+            - MMCC :: The independent copy of the machine.
+        """
+        return Checkpoint.fork(self, seed)
+
+    def advance(self, total_arrival: int) -> None:
+        """ Process events until a number of arrivals have been handled.
+
+        Params:
+            - total_arrival :: The number of arrivals to stop at.
+        """
+        rates, source = self.rates, self.source
 
         # Begin iteration of events, record arrivals for checking
-        self.num_arrival = 0
         while(self.num_arrival < total_arrival):
 
             # Collect next event from the event handler
@@ -37,12 +187,16 @@ class MMCC:
             # Update simulation time
             self.sim_time = currentEvent.time()
 
-            if currentEvent.type == "arrival":
+            if currentEvent.type == ARRIVAL:
                 # Arrival event received
                 self.num_arrival += 1 # Record number of arrivals
+                self.events.stats.arrive(self.sim_time)
 
-                # Create new arrival event
-                self.events.add(Event("arrival", currentEvent.time()))
+                # Create new arrival event, or read the next call
+                if source is None:
+                    self.events.add(Event(ARRIVAL, currentEvent.time(), rates))
+                elif not self.feed():
+                    total_arrival = self.num_arrival # Source run dry, end here
 
                 # Check if any server is available
                 if not self.servers.isFree():
@@ -50,49 +204,134 @@ class MMCC:
                     continue
                 
                 # Begin serving the client.
-                currentEvent.servedBy(self.servers.allocate())
+                server = self.servers.allocate()
+                currentEvent.servedBy(server)
+                self.events.stats.allocate(self.sim_time, server)
 
                 # All event handler to manage departure
                 self.events.add(currentEvent)
 
             else:
                 # Departure event received
-                self.servers.deallocate(currentEvent.servedBy()) # Free the server
+                server = currentEvent.servedBy()
+                self.servers.deallocate(server)                  # Free the server
+                self.events.stats.release(self.sim_time, server)
                 self.events.depart(currentEvent)                 # Record departure
 
-    def blockingProbability(self) -> float:
+    def blockingProbability(self, stats: Statistics = None) -> float:
         """ Calculate the blocking probability for the previous simulation run.
-        
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
         Returns:
             - float :: Probability of blocking 
         """
-        return len(self.events.blocked)/self.num_arrival
+        stats = stats or self.events.stats.steady()
+        return stats.blocked/stats.arrivals
  
-    def serverUtilisation(self) -> float:
-        """ Calculate the server utilisation for the previous simulation run.
-        
+    def serverUtilisation(self, stats: Statistics = None) -> float:
+        """ Calculate the server utilisation for the previous simulation run, the
+        time averaged number of busy servers. Calls still in service at the end
+        of the run are included.
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
+        Returns:
+            - float :: Server utilisation value
+        """
+        stats = stats or self.events.stats.steady()
+        return stats.utilisation()
+
+    def transientUtilisation(self) -> float:
+        """ The server utilisation over the warm up of the previous run.
+
+        Returns:
+            - float :: Server utilisation value, zero without a warm up and of
+                       the whole run if the warm up never ended.
+        """
+        return self.serverUtilisation(self.events.stats.warm or self.events.stats)
+
+    def steadyUtilisation(self) -> float:
+        """ The server utilisation of the previous run after its warm up.
+
         Returns:
             - float :: Server utilisation value
         """
-        return sum([e.serviceTime() for e in self.events.departed])/self.sim_time
+        return self.serverUtilisation(self.events.stats.steady())
+
+    def occupancyDistribution(self, stats: Statistics = None) -> list:
+        """ The proportion of time the previous run spent with each number of
+        busy servers, comparable with the Erlang distribution of
+        Analytics.erlangDistribution.
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
+        Returns:
+            - list :: Proportion of time, indexed by the number of busy servers.
+        """
+        stats = stats or self.events.stats.steady()
+        return stats.distribution()
+
+    def perServerUtilisation(self, stats: Statistics = None) -> dict:
+        """ The proportion of time each server of the previous run was busy.
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
+        Returns:
+            - dict :: Utilisation of every server that has served, by server id.
+        """
+        stats = stats or self.events.stats.steady()
+        return stats.serverUtilisation()
 
     def report(self) -> None:
         """ Display the results of the simulation is a readible fashion. """
-        
+
+        stats = self.events.stats
         print("\tEvents Handled ::") 
         print("\t\tArrival:", self.num_arrival)
-        incomplete = self.num_arrival - (len(self.events.departed) + len(self.events.blocked))
+        incomplete = self.num_arrival - (stats.departed + stats.blocked)
         print("\t\tIncomplete events:", incomplete)
-        print("\t\tDeparture:", len(self.events.departed))
-        print("\t\tBlocked:", len(self.events.blocked))
+        print("\t\tDeparture:", stats.departed)
+        print("\t\tBlocked:", stats.blocked)
+        print("\tService time mean:", stats.mean)
+        print("\tService time variance:", stats.variance())
 
         print("\tBlocking rate:", self.blockingProbability())
-        print("\tServer Utilisation:", self.serverUtilisation())            
+        print("\tServer Utilisation:", self.serverUtilisation())
+        self.reportOccupancy()
+
+    def reportOccupancy(self) -> None:
+        """ Display the time weighted occupancy of the previous run. """
+
+        stats = self.events.stats
+        if stats.warmup:
+            print("\tWarm up arrivals:", stats.warmup)
+            print("\tTransient Utilisation:", self.transientUtilisation())
+            print("\tSteady Utilisation:", self.steadyUtilisation())
+
+        print("\tOccupancy distribution ::")
+        for busy, proportion in enumerate(self.occupancyDistribution()):
+            print("\t\t" + str(busy) + ":", proportion)
 
 class M1M2CC(MMCC):
 
-    def run(self, total_servers: int, total_arrival :int, threshold: int) -> None:
+    def run(self, total_servers: int, total_arrival :int, threshold: int,
+            retain: bool = True, handover_rate: float = None,
+            newcall_rate: float = None, departure_rate: float = None,
+            batch_size: int = None, seed = None, instrument = None,
+            warmup = 0, checkpoint: str = None, checkpoint_every: int = None,
+            trace = None, source = None, arrival: Distribution = None,
+            service: Distribution = None, policy: str = "fifo") -> None:
         """ Begin the simulation and record the system variables during execution.
+        Rates that are not given are taken from the static rates of M1M2Event.
 
         Params:
             - total_servers :: The number of servers that can handle clients at 
@@ -101,38 +340,100 @@ class M1M2CC(MMCC):
                                within the simulation.
             - threshold :: The number of servers that must remain open for top 
                            priority callers.
+            - retain :: Keep every departed and blocked event for debugging. When
+                        False only streaming statistics are kept, using O(1)
+                        memory.
+            - handover_rate :: The hand over arrival rate for this run.
+            - newcall_rate :: The new call arrival rate for this run.
+            - departure_rate :: The departure rate of clients for this run.
+            - batch_size :: Snapshot the statistics every batch_size arrivals.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+                      Runs of different configurations given the same integer
+                      or SeedSequence share common random numbers.
+            - instrument :: An Instrument to record the run loop, if any.
+            - warmup :: The number of arrivals treated as the transient, or
+                        "mser" to detect the end of the transient on the fly.
+                        The blocking and utilisation exclude the transient.
+            - checkpoint :: A file to write checkpoints of the run to, if any.
+                            Runs given an instrument, trace or source cannot be
+                            checkpointed, and raise a ValueError.
+            - checkpoint_every :: The number of arrivals between checkpoints,
+                                  only the end of the run is saved if None.
+            - trace :: A TraceWriter recording the run, if any.
+            - source :: A CallSource the calls are read from instead of being
+                        drawn from the rates, see Sources. The run ends at the
+                        last call if total_arrival is None.
+            - arrival :: The Distribution of the inter-arrival times, scaled to
+                         the arrival rates, exponential if None.
+            - service :: The Distribution of the service times, scaled to the
+                         departure rate, exponential if None. Ignored when seed
+                         is a Streams, which carries its own distributions.
+            - policy :: The order in which free servers are allocated, see
+                        Servers.policies. Random allocation draws from the
+                        server stream of the run.
         """
+        Checkpoint.check(checkpoint, instrument, trace, source)
 
         # Initialise the beginning parameters of the simulation
-        self.servers = Servers(total_servers) # Set up server handler
-        self.events = M1M2EventHandler()      # Set up the event handler
-        self.events.start()                   # Create the first event
+        priorities = dict(M1M2Event.priorities)
+        if handover_rate is not None: priorities["handover"] = handover_rate
+        if newcall_rate is not None: priorities["newcall"] = newcall_rate
+        self.rates = rates = Rates(
+            departureRate = M1M2Event.departureRate if departure_rate is None else departure_rate,
+            priorities = priorities,
+            streams = seed if isinstance(seed, Streams) else \
+                      Streams(seed, arrival = arrival, service = service)
+        )
+        self.servers = Servers(total_servers, policy, rates.streams.servers.generator)
+        self.events = M1M2EventHandler(retain, batch_size, warmup) # Set up the event handler
+        self.instrument, self.trace = instrument, trace # Wrappers of the components
+        if instrument: instrument.attach(self) # Wrap the components to record
+        if trace: trace.attach(self)
+        self.threshold = threshold
+        self.num_arrival = 0
+        self.sim_time = 0
+        if self.open(source):
+            self.events.start(rates)           # Create the first event
+
+        self.resume(total_arrival, checkpoint, checkpoint_every)
+
+    def advance(self, total_arrival: int) -> None:
+        """ Process events until a number of arrivals have been handled.
+
+        Params:
+            - total_arrival :: The number of arrivals to stop at.
+        """
+        rates, threshold, source = self.rates, self.threshold, self.source
 
         # Begin iteration of events, record arrivals for checking
-        self.num_arrival = 0
-        self.arrival = {"handover": 0, "newcall": 0}
-        while(sum(self.num_arrival) < total_arrival):
+        while(self.num_arrival < total_arrival):
 
             # Collect next event from the event handler
             currentEvent = self.events.next()
             # Update simulation time
             self.sim_time = currentEvent.time()
 
-            if currentEvent.type == "arrival":
+            if currentEvent.type == ARRIVAL:
                 # Arrival event received
                 priority = currentEvent.path
                 self.num_arrival += 1
-                self.arrival[priority] += 1
+                self.events.stats.arrive(self.sim_time, priority)
 
-                # Create new arrival event
-                self.events.add(M1M2Event(priority, "arrival", currentEvent.time()))
+                # Create new arrival event, or read the next call
+                if source is None:
+                    self.events.add(M1M2Event(priority, ARRIVAL, currentEvent.time(), rates))
+                elif not self.feed():
+                    total_arrival = self.num_arrival # Source run dry, end here
 
                 # Check server availablity
                 if (len(self.servers) > threshold) or \
-                   (priority == "handover" and self.servers.isFree()) :
+                   (priority == HANDOVER and self.servers.isFree()) :
                     
                     # Begin serving the client.
-                    currentEvent.servedBy(self.servers.allocate())
+                    server = self.servers.allocate()
+                    currentEvent.servedBy(server)
+                    self.events.stats.allocate(self.sim_time, server)
 
                     # All event handler to manage departure
                     self.events.add(currentEvent)
@@ -143,38 +444,76 @@ class M1M2CC(MMCC):
 
             else:
                 # Departure event received
-                self.servers.deallocate(currentEvent.servedBy()) # Free the server
+                server = currentEvent.servedBy()
+                self.servers.deallocate(server)                  # Free the server
+                self.events.stats.release(self.sim_time, server)
                 self.events.depart(currentEvent)                 # Event recorded as departed.
 
-    def blockingProbability(self):
+    def call(self, arrival: float, holding: float, path: int) -> M1M2Event:
+        """ The arrival event of a call read from a source.
+
+        Params:
+            - arrival :: The arrival time of the call.
+            - holding :: The holding time of the call.
+            - path :: The arrival path of the call.
+
+        Returns:
+            - M1M2Event :: The arrival event.
+        """
+        return M1M2Event.fromCall(arrival, holding, path)
+
+    def blockingProbability(self, stats: Statistics = None) -> float:
         """ Calculate the blocking probability for the previous simulation run.
-        
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
         Returns:
             - float :: Probability of blocking 
         """
+        stats = stats or self.events.stats.steady()
 
-        HFP = len(self.events.hblocked)/self.arrival["handover"] \
-              if self.arrival["handover"] else 0
-        CBP = len(self.events.nblocked)/self.arrival["newcall"] \
-              if self.arrival["newcall"] else 0
+        arrived, blocked = stats.arrived, stats.paths
+        HFP = blocked.get(HANDOVER, 0)/arrived[HANDOVER] \
+              if arrived.get(HANDOVER) else 0
+        CBP = blocked.get(NEWCALL, 0)/arrived[NEWCALL] \
+              if arrived.get(NEWCALL) else 0
         return CBP + (10 * HFP)
 
+    def handoverBlocking(self, stats: Statistics = None) -> float:
+        """ Calculate the hand over blocking probability for the previous
+        simulation run, the share of hand overs that found every server busy.
+
+        Params:
+            - stats :: The statistics to evaluate, the run after its warm up if
+                       None.
+
+        Returns:
+            - float :: Probability of a hand over being blocked
+        """
+        stats = stats or self.events.stats.steady()
+
+        arrived, blocked = stats.arrived, stats.paths
+        return blocked.get(HANDOVER, 0)/arrived[HANDOVER] if arrived.get(HANDOVER) else 0
+
     def report(self) -> None:
         """ Display the results of the simulation is a readible fashion. """
-        
+
+        stats = self.events.stats
         print("\tEvents Handled ::") 
         print("\t\tArrival:", self.num_arrival)
-        print("\t\tHandover:", self.arrival["handover"])
-        print("\t\tNew call:", self.arrival["newcall"])
-        incomplete = self.num_arrival - \
-            (len(self.events.departed) + len(self.events.hblocked) + len(self.events.nblocked))
+        print("\t\tHandover:", stats.arrived.get(HANDOVER, 0))
+        print("\t\tNew call:", stats.arrived.get(NEWCALL, 0))
+        incomplete = self.num_arrival - (stats.departed + stats.blocked)
         print("\t\tIncomplete events:", incomplete)
-        print("\t\tDeparture:", len(self.events.departed))
-        print("\t\tBlocked:", len(self.events.hblocked) + len(self.events.nblocked))
-        print("\t\tHandover blocked:", len(self.events.hblocked))
-        print("\t\tNew call blocked:", len(self.events.nblocked))
+        print("\t\tDeparture:", stats.departed)
+        print("\t\tBlocked:", stats.blocked)
+        print("\t\tHandover blocked:", stats.paths.get(HANDOVER, 0))
+        print("\t\tNew call blocked:", stats.paths.get(NEWCALL, 0))
 
         print("\tBlocking rate:", self.blockingProbability())
-        print("\tServer Utilisation:", self.serverUtilisation())  
+        print("\tServer Utilisation:", self.serverUtilisation())
+        self.reportOccupancy()
 
 
@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+from itertools import islice
+
+import numpy
+
+from Event import HANDOVER, NEWCALL, PATHS
+import Trace
+
+class CallSource(ABC):
+    """ A source of the calls offered to a run, in place of arrivals drawn from
+    exponential rates. Sources read their calls lazily a chunk at a time, so
+    that call logs far larger than memory can be fed to a run.
+
+    Subclasses give chunks of arrival time, holding time and path arrays.
+    Iterating a source gives the calls one at a time as (arrival time, holding
+    time, path) tuples, with arrival times taken relative to the first call so
+    that runs begin at time zero.
+    """
+
+    @abstractmethod
+    def chunks(self):
+        """ The calls of the source, a chunk at a time.
+
+        Returns:
+            - generator :: Tuples of arrival time, holding time and path arrays.
+        """
+
+    def __iter__(self):
+        """ Protected function giving the calls one at a time, checking they
+        arrive in order.
+        """
+        origin = previous = None
+        for arrivals, holdings, paths in self.chunks():
+            if not len(arrivals): continue
+            if origin is None: origin = previous = arrivals[0]
+
+            if arrivals[0] < previous or (numpy.diff(arrivals) < 0).any():
+                raise ValueError("Calls must be given in order of arrival")
+            previous = arrivals[-1]
+
+            yield from zip((arrivals - origin).tolist(), holdings.tolist(), paths.tolist())
+
+def checkPaths(values: numpy.ndarray, valid: numpy.ndarray, first: int, unit: str) -> None:
+    """ Refuse a chunk of calls holding a path that is neither a hand over nor
+    a new call, rather than taking it as the other path.
+
+    Params:
+        - values :: The path column of the chunk, as read.
+        - valid :: Whether each value is a known path.
+        - first :: The row or call number of the first value of the chunk.
+        - unit :: What the numbers count, such as "row" or "call".
+    """
+    invalid = numpy.flatnonzero(~valid)
+    if len(invalid):
+        raise ValueError("Unknown path {!r} at {} {}".format(
+            values[invalid[0]].item(), unit, first + invalid[0]))
+
+def pathCodes(values: numpy.ndarray, first: int = 1) -> numpy.ndarray:
+    """ Convert a column of path names or integer codes into path codes.
+
+    Params:
+        - values :: The path column as strings, "handover", "newcall" or codes.
+        - first :: The row of the first value, reported for unknown paths.
+
+    Returns:
+        - ndarray :: The path code of each value.
+    """
+    codes = numpy.full(len(values), -1, dtype = numpy.int64)
+    for code, name in enumerate(PATHS):
+        codes[(values == name) | (values == str(code))] = code
+    checkPaths(values, codes >= 0, first, "row")
+    return codes
+
+class CSVSource(CallSource):
+    """ Calls read from a delimited text log, such as call detail records. The
+    columns of the arrival time, holding time and optionally path are chosen by
+    header name or by index; logs without a path column are taken as new calls.
+    Each chunk of lines is parsed by NumPy, so only a chunk is held at a time.
+    """
+
+    def __init__(self, path: str, chunk: int = 2**16, arrival = "arrival",
+                 holding = "holding", route = "path", delimiter: str = ",",
+                 header: bool = True):
+        """ Initialise the source, nothing is read until it is iterated.
+
+        Params:
+            - path :: The file of the log.
+            - chunk :: The number of lines parsed at a time.
+            - arrival :: The name or index of the arrival time column.
+            - holding :: The name or index of the holding time column.
+            - route :: The name or index of the path column, None if absent.
+            - delimiter :: The column delimiter.
+            - header :: Whether the first line of the log names its columns.
+        """
+        self.path = path
+        self.chunk = chunk
+        self.columns = (arrival, holding, route)
+        self.delimiter = delimiter
+        self.header = header
+
+    def chunks(self):
+        with open(self.path) as file:
+            names = next(file).strip().split(self.delimiter) if self.header else []
+            names = [name.strip() for name in names]
+
+            def index(column):
+                if column is None or isinstance(column, int): return column
+                if column not in names:
+                    raise ValueError("No column named " + str(column) + " in " + self.path)
+                return names.index(column)
+
+            arrival, holding, route = [index(c) for c in self.columns]
+            row = 2 if self.header else 1   # Line number of the next line read
+
+            while True:
+                lines = list(islice(file, self.chunk))
+                if not lines: return
+
+                times = numpy.loadtxt(lines, delimiter = self.delimiter,
+                                      usecols = (arrival, holding), ndmin = 2)
+                if route is None:
+                    paths = numpy.full(len(times), NEWCALL)
+                else:
+                    paths = pathCodes(numpy.char.strip(numpy.loadtxt(
+                        lines, delimiter = self.delimiter, usecols = route,
+                        dtype = str, ndmin = 1)), row)
+                row += len(lines)
+                yield times[:, 0], times[:, 1], paths
+
+class BinarySource(CallSource):
+    """ Calls read from a binary trace file, see Trace, mapped into memory so
+    that only the pages of the current chunk are resident. Calls of MMCC traces,
+    which have no path, are taken as new calls. Logs may be converted to this
+    format once with convert(), after which they are read at memory speed.
+    """
+
+    def __init__(self, path: str, chunk: int = 2**16):
+        """ Initialise the source, nothing is read until it is iterated.
+
+        Params:
+            - path :: The trace file.
+            - chunk :: The number of records examined at a time.
+        """
+        self.path = path
+        self.chunk = chunk
+
+    def chunks(self):
+        call = 1   # Number of the first call of the chunk
+        for arrivals, holdings, paths in Trace.calls(Trace.read(self.path), self.chunk):
+            paths = numpy.where(paths == Trace.NOPATH, NEWCALL, paths)
+            checkPaths(paths, (paths == HANDOVER) | (paths == NEWCALL), call, "call")
+            call += len(paths)
+            yield arrivals, holdings, paths
+
+def convert(source: CallSource, path: str) -> None:
+    """ Write the calls of a source to a binary trace file of arrival records,
+    which can be read back by BinarySource or replayed with Trace.Replay.
+
+    Params:
+        - source :: The calls to be written.
+        - path :: The trace file written.
+    """
+    with Trace.TraceWriter(path) as writer:
+        for arrivals, holdings, paths in source.chunks():
+            records = numpy.zeros(len(arrivals), dtype = Trace.RECORD)
+            records["time"] = records["arrival"] = arrivals
+            records["service"] = holdings
+            records["server"] = Trace.NOSERVER
+            records["kind"] = Trace.ARRIVE
+            records["path"] = paths
+            writer.file.write(records.tobytes())
@@ -0,0 +1,245 @@
+from Warmup import MSERDetector
+
+class Statistics:
+    """ Streaming accumulator for the results of a simulation. Only running
+    counts and sums are kept, so the memory used does not grow with the number
+    of events processed. The mean and variance of the service times are
+    maintained with Welford's online algorithm.
+
+    The number of busy servers is followed through time as well: the time
+    spent at each occupancy and the busy time of every server id are updated
+    in O(1) whenever a server is allocated or released, which gives the time
+    weighted occupancy distribution and the per server utilisation without any
+    event history.
+
+    Optionally the totals are snapshot every batch_size arrivals, so that a
+    single long run can be divided into batches for the method of batch means,
+    and once warmup arrivals have been seen, so that the transient and steady
+    state parts of a run can be reported separately. Given a warmup of "mser"
+    the end of the transient is instead found on the fly by MSER-5.
+    """
+
+    def __init__(self, batch_size: int = None, warmup = 0):
+        """ Initialise the running totals
+
+        Params:
+            - batch_size :: The number of arrivals in each batch, None to keep
+                            no batches.
+            - warmup :: The number of arrivals treated as the transient, or
+                        "mser" to detect the end of the transient.
+        """
+        self.arrivals = 0    # Number of arrivals
+        self.arrived = {}    # Number of arrivals for each path
+        self.departed = 0    # Number of events that have departed
+        self.blocked = 0     # Number of arrivals that have been blocked
+        self.paths = {}      # Number of blocked arrivals for each path
+        self.busy_time = 0.0 # Summed service time of the departed events
+        self.time = 0.0      # Time of the latest arrival
+        self.mean = 0.0      # Running mean of the service times
+        self.m2 = 0.0        # Running sum of squared differences from the mean
+
+        self.busy = 0        # Number of busy servers
+        self.changed = 0.0   # Time the accumulated occupancy runs up to
+        self.area = 0.0      # Time integral of the number of busy servers
+        self.occupancy = {}  # Time spent at each number of busy servers
+        self.server_time = {} # Busy time of each server id
+        self.started = {}    # Time each busy server last began accumulating
+
+        self.batch_size = batch_size
+        self.snapshots = [self.totals()] if batch_size else []
+        self.detector = MSERDetector(self.totals()) if warmup == "mser" else None
+        self.warmup = 0 if self.detector else warmup
+        self.warm = None if warmup else self.totals() # Totals at end of warm up
+
+    def totals(self) -> "Statistics":
+        """ Copy the running counts and sums, without the batch snapshots.
+
+        Returns:
+            - Statistics :: Accumulator holding the current totals.
+        """
+        copy = Statistics.__new__(Statistics)
+        copy.__dict__.update(self.__dict__)
+        copy.arrived, copy.paths = dict(self.arrived), dict(self.paths)
+        copy.occupancy, copy.server_time = dict(self.occupancy), dict(self.server_time)
+        copy.started = dict(self.started)
+        copy.batch_size, copy.snapshots, copy.warm, copy.detector = None, [], None, None
+        return copy
+
+    def __sub__(self, other: "Statistics") -> "Statistics":
+        """ Protected function allowing the totals accumulated between two
+        snapshots to be found by subtraction. Only counts and sums are carried,
+        the service time mean and variance of the result are zero.
+
+        Returns:
+            - Statistics :: Accumulator of the difference in totals.
+        """
+        delta = Statistics()
+        delta.arrivals = self.arrivals - other.arrivals
+        delta.departed = self.departed - other.departed
+        delta.blocked = self.blocked - other.blocked
+        delta.busy_time = self.busy_time - other.busy_time
+        delta.time = self.time - other.time
+        delta.arrived = {p: n - other.arrived.get(p, 0) for p, n in self.arrived.items()}
+        delta.paths = {p: n - other.paths.get(p, 0) for p, n in self.paths.items()}
+
+        # Both totals are settled, so the areas are complete up to their times
+        delta.changed = delta.time
+        delta.area = self.area - other.area
+        delta.occupancy = {n: t - other.occupancy.get(n, 0) for n, t in self.occupancy.items()}
+        delta.server_time = {s: t - other.server_time.get(s, 0)
+                             for s, t in self.server_time.items()}
+        return delta
+
+    def advance(self, time: float) -> None:
+        """ Accumulate the time spent at the current occupancy up to a time.
+
+        Params:
+            - time :: The time to accumulate up to.
+        """
+        elapsed = time - self.changed
+        self.area += elapsed*self.busy
+        self.occupancy[self.busy] = self.occupancy.get(self.busy, 0) + elapsed
+        self.changed = time
+
+    def settle(self, time: float) -> None:
+        """ Bring every time weighted total up to a time, including the busy
+        time of the servers still serving.
+
+        Params:
+            - time :: The time to settle the totals at.
+        """
+        self.advance(time)
+        for server, start in self.started.items():
+            self.server_time[server] = self.server_time.get(server, 0) + time - start
+            self.started[server] = time
+
+    def allocate(self, time: float, server: int) -> None:
+        """ Record a server beginning to serve.
+
+        Params:
+            - time :: The time of the allocation.
+            - server :: The id of the allocated server.
+        """
+        self.advance(time)
+        self.busy += 1
+        self.started[server] = time
+
+    def release(self, time: float, server: int) -> None:
+        """ Record a server finishing serving.
+
+        Params:
+            - time :: The time of the release.
+            - server :: The id of the released server.
+        """
+        self.advance(time)
+        self.busy -= 1
+        self.server_time[server] = self.server_time.get(server, 0) + \
+                                   time - self.started.pop(server)
+
+    def arrive(self, time: float, path: int = None) -> None:
+        """ Record an arrival, closing a batch when enough have arrived.
+
+        Params:
+            - time :: The time of the arrival.
+            - path :: The arrival path of the event, if it has one.
+        """
+        self.arrivals += 1
+        self.time = time
+        if path is not None:
+            self.arrived[path] = self.arrived.get(path, 0) + 1
+
+        if self.batch_size and not self.arrivals % self.batch_size:
+            self.settle(time)
+            self.snapshots.append(self.totals())
+
+        if self.arrivals == self.warmup:
+            self.settle(time)
+            self.warm = self.totals()
+
+        if self.detector and not self.arrivals % self.detector.interval:
+            self.advance(time)
+            warm = self.detector.observe(self)
+            if warm:
+                self.warm, self.warmup, self.detector = warm, warm.arrivals, None
+
+    def depart(self, service_time: float) -> None:
+        """ Record the departure of an event.
+
+        Params:
+            - service_time :: The time the departed event spent being served.
+        """
+        self.departed += 1
+        self.busy_time += service_time
+
+        delta = service_time - self.mean
+        self.mean += delta/self.departed
+        self.m2 += delta*(service_time - self.mean)
+
+    def block(self, path: int = None) -> None:
+        """ Record an arrival being blocked.
+
+        Params:
+            - path :: The arrival path of the blocked event, if it has one.
+        """
+        self.blocked += 1
+        if path is not None:
+            self.paths[path] = self.paths.get(path, 0) + 1
+
+    def variance(self) -> float:
+        """ Sample variance of the service times of the departed events.
+
+        Returns:
+            - float :: The variance, zero when fewer than two events departed.
+        """
+        return self.m2/(self.departed - 1) if self.departed > 1 else 0.0
+
+    def steady(self) -> "Statistics":
+        """ The totals accumulated after the warm up. Should the end of the warm
+        up not have been reached, no steady state was seen and the whole run is
+        given.
+
+        Returns:
+            - Statistics :: Accumulator of the steady state totals.
+        """
+        if self.warm is None or not self.warm.arrivals:
+            return self
+        return self.totals() - self.warm
+
+    def utilisation(self) -> float:
+        """ Time averaged number of busy servers up to the latest arrival.
+
+        Returns:
+            - float :: Mean number of busy servers, zero before any time passed.
+        """
+        area = self.area + (self.time - self.changed)*self.busy
+        return area/self.time if self.time else 0.0
+
+    def distribution(self) -> list:
+        """ Time weighted distribution of the number of busy servers, up to the
+        time the totals were last brought to.
+
+        Returns:
+            - list :: The proportion of time spent with each number of busy
+                      servers, indexed by that number.
+        """
+        total = sum(self.occupancy.values())
+        size = max(self.occupancy, default = -1) + 1
+        return [self.occupancy.get(n, 0)/total if total else 0.0 for n in range(size)]
+
+    def serverUtilisation(self) -> dict:
+        """ The proportion of time each server id has spent busy, up to the
+        time the totals were last settled.
+
+        Returns:
+            - dict :: Utilisation of every server that has served, by id.
+        """
+        return {s: t/self.time for s, t in sorted(self.server_time.items())} \
+               if self.time else {}
+
+    def batches(self) -> list:
+        """ The totals accumulated within each completed batch.
+
+        Returns:
+            - list :: A Statistics accumulator for every batch, in order.
+        """
+        return [b - a for a, b in zip(self.snapshots, self.snapshots[1:])]
@@ -0,0 +1,100 @@
+from math import log
+import random
+
+import numpy
+
+from Distributions import EXPONENTIAL
+
+class RandomStream:
+    """ Exponential variates drawn one at a time from the global random module.
+    This is the stream used by events created without the streams of a run,
+    and so is neither reproducible nor independent between runs.
+    """
+
+    def draw(self, rate: float) -> float:
+        """ Draw an exponential variate.
+
+        Params:
+            - rate :: The rate of the exponential distribution.
+
+        Returns:
+            - float :: The randomly generated value.
+        """
+        return -(log(1.0 - random.random())/rate)
+
+class Stream:
+    """ Variates drawn from a seeded NumPy generator. Unit mean variates of the
+    stream's distribution, exponential unless another is given, are generated
+    a block at a time and handed out one by one, so the cost of calling into
+    NumPy is shared across the block.
+    """
+
+    def __init__(self, seed: numpy.random.SeedSequence, block: int = 4096,
+                 distribution: "Distribution" = None):
+        """ Initialise the stream.
+
+        Params:
+            - seed :: The seed sequence from which the generator is built.
+            - block :: The number of variates generated at a time.
+            - distribution :: The Distribution of the variates, exponential if
+                              None.
+        """
+        self.generator = numpy.random.Generator(numpy.random.PCG64(seed))
+        self.block = block
+        self.distribution = distribution or EXPONENTIAL
+        self.buffer = []    # Variates yet to be handed out, in reverse order
+
+    def draw(self, rate: float) -> float:
+        """ Draw a variate of the stream's distribution with mean 1/rate.
+
+        Params:
+            - rate :: The rate of the times drawn, one over their mean.
+
+        Returns:
+            - float :: The randomly generated value.
+        """
+        try:
+            return self.buffer.pop()/rate
+        except IndexError:
+            self.buffer = self.distribution.sample(self.generator, self.block)[::-1].tolist()
+            return self.buffer.pop()/rate
+
+class Streams:
+    """ The independent random streams of a single simulation run. Separate
+    streams are spawned for arrivals, services, the arrivals and services of
+    each M1M2 path and the choice of free servers, so that changing how one is
+    consumed leaves the others unchanged.
+
+    Runs given equal seeds therefore share common random numbers: the k-th
+    call of a path has the same standard variates in every configuration, and
+    only the rates scaling them differ. Comparing configurations on equal seeds
+    removes most of the noise between them.
+    """
+
+    def __init__(self, seed = None, block: int = 4096, arrival: "Distribution" = None,
+                 service: "Distribution" = None):
+        """ Spawn the streams of a run from a seed.
+
+        Params:
+            - seed :: An integer or SeedSequence, fresh entropy is used if None.
+            - block :: The number of variates each stream generates at a time.
+            - arrival :: The Distribution of the inter-arrival times of every
+                         path, exponential if None.
+            - service :: The Distribution of the service times of every path,
+                         exponential if None.
+        """
+        if not isinstance(seed, numpy.random.SeedSequence):
+            seed = numpy.random.SeedSequence(seed)
+
+        # Children are derived from the spawn key rather than seed.spawn, so that
+        # a seed sequence reused across runs always yields the same streams
+        children = [numpy.random.SeedSequence(seed.entropy, spawn_key = seed.spawn_key + (i,),
+                                              pool_size = seed.pool_size) for i in range(7)]
+
+        self.seed = seed
+        shapes = (arrival, service, arrival, arrival, service, service)
+        self.arrival, self.service, handover, newcall, hservice, nservice = \
+            [Stream(child, block, shape) for child, shape in zip(children, shapes)]
+        self.paths = (handover, newcall)     # Arrival streams indexed by path
+        self.services = (hservice, nservice) # Service streams indexed by path
+        self.servers = Stream(children[6], block)  # Choice of free servers
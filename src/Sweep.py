@@ -0,0 +1,129 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import os
+import time
+
+import numpy
+
+from Simulation import MMCC, M1M2CC
+from VectorSimulation import VectorMMCC
+from Network import Network
+from Markov import MarkovCC
+
+# Simulation machines that can be swept, by name
+models = {"MMCC": MMCC, "M1M2CC": M1M2CC, "VectorMMCC": VectorMMCC, "Network": Network,
+          "MarkovCC": MarkovCC}
+
+def parameterGrid(**axes) -> list:
+    """ Expand a set of parameter axes into the full grid of parameter points.
+    The last axis varies fastest.
+
+    Params:
+        - axes :: Sequences of values for each run parameter.
+
+    Returns:
+        - list :: A dictionary of run parameters for every point of the grid.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in product(*axes.values())]
+
+def runPoint(task: tuple) -> dict:
+    """ Run a single simulation of a sweep. Executed within the worker
+    processes, so every piece of configuration arrives with the task.
+
+    Params:
+        - task :: The model name, the run parameters and the seed of the run,
+                  optionally followed by a Cache the run is looked up in.
+
+    Returns:
+        - dict :: The run parameters joined with the results of the run.
+    """
+    model, params, seed = task[:3]
+    cache = task[3] if len(task) > 3 else None
+
+    # Each run owns its streams, seeded independently of every other run
+    start = time.perf_counter()
+    if cache:
+        machine = cache.run(models[model], seed, **params)
+    else:
+        machine = models[model]()
+        machine.run(seed = seed, **params)
+    runtime = time.perf_counter() - start
+
+    return result(machine, params, seed, runtime)
+
+def result(machine, params: dict, seed: int, runtime: float) -> dict:
+    """ The row of a sweep for a finished run.
+
+    Params:
+        - machine :: The simulation machine after its run.
+        - params :: The run parameters.
+        - seed :: The seed of the run.
+        - runtime :: The seconds taken to give the run.
+
+    Returns:
+        - dict :: The run parameters joined with the results of the run.
+    """
+    row = dict(params, seed = seed, runtime = runtime)
+    row["blocking"] = machine.blockingProbability()
+    row["utilisation"] = machine.serverUtilisation()
+    if hasattr(machine, "handoverBlocking"):
+        row["handover_blocking"] = machine.handoverBlocking()
+    row["cached"] = getattr(machine, "cached", False)
+    return row
+
+def sweep(model: str, points: list, seed: int = None, processes: int = None,
+          cache: "Cache" = None, store: "ResultStore" = None, **fixed) -> list:
+    """ Run a simulation for every point of a parameter grid over a pool of
+    processes. The seed of each run is spawned from a single root seed, so the
+    runs are independent of one another and a sweep is reproducible regardless
+    of how the runs are scheduled over the workers.
+
+    Params:
+        - model :: The name of the simulation machine, a key of models.
+        - points :: The run parameters of each point, see parameterGrid().
+        - seed :: The root seed of the sweep, a random root if None.
+        - processes :: The number of worker processes, one per core if None.
+        - cache :: A Cache of runs, hits are read without starting a worker and
+                   only the misses are run. Only useful with a fixed seed.
+        - store :: A ResultStore the rows are appended to as the runs finish,
+                   along with the model name.
+        - fixed :: Run parameters shared by every point.
+
+    Returns:
+        - list :: A row of parameters and results per point, in grid order.
+    """
+    if model not in models:
+        raise ValueError("Unknown simulation model: " + str(model))
+
+    children = numpy.random.SeedSequence(seed).spawn(len(points))
+    tasks = [(model, dict(fixed, **point), int(child.generate_state(1)[0]))
+             for point, child in zip(points, children)]
+
+    rows = [None]*len(tasks)
+    if cache:
+        for i, (model, params, child) in enumerate(tasks):
+            start = time.perf_counter()
+            machine = cache.get(cache.key(models[model], child, params))
+            if machine is not None:
+                machine.cached = True
+                rows[i] = result(machine, params, child, time.perf_counter() - start)
+                if store is not None: store.append(dict(rows[i], model = model))
+        tasks = [task + (cache,) for task in tasks]
+
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if not missing:
+        if store is not None: store.flush()
+        return rows
+
+    # Hand out the runs in chunks, a few per worker, to limit messaging overhead
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, len(missing)//(4*processes))
+
+    with ProcessPoolExecutor(processes) as pool:
+        for i, row in zip(missing, pool.map(runPoint, [tasks[i] for i in missing],
+                                            chunksize = chunksize)):
+            rows[i] = row
+            if store is not None: store.append(dict(row, model = model))
+    if store is not None: store.flush()
+    return rows
@@ -0,0 +1,227 @@
+from heapq import heappush, heappop
+
+import numpy
+
+from Event import ARRIVAL, HANDOVER, NEWCALL
+
+# Kinds of trace record
+ARRIVE, BLOCK, ALLOCATE, DEPART = 0, 1, 2, 3
+KINDS = ("arrive", "block", "allocate", "depart")
+
+NOPATH = 255    # Path of the records of MMCC calls, which have no path
+NOSERVER = -1   # Server of the records of calls not being served
+
+# Fixed width little endian record, 32 bytes once aligned
+RECORD = numpy.dtype([("time", "<f8"), ("arrival", "<f8"), ("service", "<f8"),
+                      ("server", "<i4"), ("kind", "u1"), ("path", "u1")], align = True)
+
+MAGIC = b"MMCCTRC1"
+HEADER = len(MAGIC) + 8   # Magic followed by the record size
+
+class TraceWriter:
+    """ Optional recording of every arrival, block, allocation and departure of
+    a run as fixed width binary records. Like an Instrument, the writer wraps
+    the methods of the run's event handler and servers when given to a run, so
+    untraced runs are left untouched. Records are gathered in memory and
+    written a buffer at a time; the file can be read while mapped into memory
+    with read().
+
+    Each record holds the time of the record, the arrival time and service time
+    of the call concerned, its server, the kind of record and the call's path.
+    Arrival records carry the service the call would have received, blocked or
+    not, so a trace holds all the input needed to replay the run.
+    """
+
+    def __init__(self, path: str, buffer: int = 2**16):
+        """ Open a trace file, replacing any existing file.
+
+        Params:
+            - path :: The file the trace is written to.
+            - buffer :: The number of records gathered between writes.
+        """
+        self.path = path
+        self.buffer = buffer
+        self.records = []   # Records yet to be written
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + RECORD.itemsize.to_bytes(8, "little"))
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def attach(self, machine) -> None:
+        """ Wrap the components of a run that has been set up. Called by the
+        run methods once their event handler and servers exist.
+
+        Params:
+            - machine :: The simulation machine being run.
+        """
+        events, servers, records = machine.events, machine.servers, self.records
+        pop, blocked, allocate = events.next, events.block, servers.allocate
+        current = None      # The event being handled
+
+        def following():
+            nonlocal current
+            current = event = pop()
+            path = getattr(event, "path", NOPATH)
+            if event.type == ARRIVAL:
+                records.append((event.arrival_time, event.arrival_time, event.serviceTime(),
+                                NOSERVER, ARRIVE, path))
+            else:
+                records.append((event.departure_time, event.arrival_time, event.serviceTime(),
+                                event.serverID, DEPART, path))
+            if len(records) >= self.buffer: self.flush()
+            return event
+
+        def block(event):
+            records.append((event.arrival_time, event.arrival_time, event.serviceTime(),
+                            NOSERVER, BLOCK, getattr(event, "path", NOPATH)))
+            blocked(event)
+
+        def allocation():
+            server = allocate()
+            records.append((current.arrival_time, current.arrival_time, current.serviceTime(),
+                            server, ALLOCATE, getattr(current, "path", NOPATH)))
+            return server
+
+        events.next, events.block, servers.allocate = following, block, allocation
+
+    def flush(self) -> None:
+        """ Write the gathered records to the file """
+        if self.records:
+            self.file.write(numpy.array(self.records, dtype = RECORD).tobytes())
+            self.records.clear()
+
+    def close(self) -> None:
+        """ Write the remaining records and close the file """
+        self.flush()
+        self.file.close()
+
+def read(path: str) -> numpy.ndarray:
+    """ Map a trace file into memory. Nothing is copied: the records, and the
+    columns taken from them such as records["time"], are views of the file.
+
+    Params:
+        - path :: The file of the trace.
+
+    Returns:
+        - ndarray :: The records of the trace, with the fields of RECORD.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER)
+    if header[:len(MAGIC)] != MAGIC or \
+       int.from_bytes(header[len(MAGIC):], "little") != RECORD.itemsize:
+        raise ValueError("Not a trace file: " + str(path))
+
+    try:
+        return numpy.memmap(path, dtype = RECORD, mode = "r", offset = HEADER)
+    except ValueError:
+        return numpy.empty(0, dtype = RECORD)   # A trace without records
+
+def calls(records: numpy.ndarray, chunk: int = 2**16):
+    """ The calls offered to a traced run, in order of arrival, a chunk of
+    records at a time so that traces larger than memory can be replayed.
+
+    Params:
+        - records :: The records of a trace, see read().
+        - chunk :: The number of records examined at a time.
+
+    Returns:
+        - generator :: Tuples of the arrival time, service time and path arrays
+                       of the calls of each chunk.
+    """
+    for start in range(0, len(records), chunk):
+        part = records[start:start + chunk]
+        arrivals = part[part["kind"] == ARRIVE]
+        if len(arrivals):
+            yield arrivals["time"], arrivals["service"], arrivals["path"]
+
+class Replay:
+    """ Simulation object rerunning the admission policy of the MMCC or M1M2
+    systems over a fixed sequence of calls, such as those of a recorded trace.
+    As in VectorMMCC no event objects are created, only a heap of the departure
+    times of the busy servers is kept, so policies can be compared on identical
+    input at full speed.
+    """
+
+    def run(self, total_servers: int, calls, threshold: int = None) -> None:
+        """ Offer every call to the servers in turn.
+
+        Params:
+            - total_servers :: The number of servers that can handle clients at
+                               any one instance.
+            - calls :: Chunks of arrival time, service time and path arrays in
+                       order of arrival, see calls().
+            - threshold :: The number of servers that must remain open for
+                           hand overs, None for the MMCC policy.
+        """
+        limit = threshold or 0
+        busy = []         # Departure times of the busy servers (binary heap)
+        arrived = {}      # Number of arrivals for each path
+        blocked = {}      # Number of blocked arrivals for each path
+        busy_time = 0.0   # Summed service time of the admitted arrivals
+        clock = 0.0       # Time of the latest arrival
+
+        for arrivals, services, paths in calls:
+            for arrival, service, path in zip(arrivals.tolist(), services.tolist(),
+                                              paths.tolist()):
+                # Release the servers of the calls that departed
+                while busy and busy[0] <= arrival:
+                    heappop(busy)
+
+                arrived[path] = arrived.get(path, 0) + 1
+                free = total_servers - len(busy)
+                if free > limit or (path == HANDOVER and free):
+                    heappush(busy, arrival + service)
+                    busy_time += service
+                else:
+                    blocked[path] = blocked.get(path, 0) + 1
+                clock = arrival
+
+        self.threshold = threshold
+        self.arrived, self.blocked = arrived, blocked
+        self.num_arrival = sum(arrived.values())
+        self.num_blocked = sum(blocked.values())
+        self.num_busy = len(busy)
+        self.sim_time = clock
+        # Remove the service still to be given beyond the end of the run
+        self.busy_time = busy_time - sum(d - clock for d in busy)
+
+    def blockingProbability(self) -> float:
+        """ Calculate the blocking probability of the replay, aggregated as in
+        M1M2CC when a threshold was given.
+
+        Returns:
+            - float :: Probability of blocking
+        """
+        if self.threshold is None:
+            return self.num_blocked/self.num_arrival
+
+        HFP = self.blocked.get(HANDOVER, 0)/self.arrived[HANDOVER] \
+              if self.arrived.get(HANDOVER) else 0
+        CBP = self.blocked.get(NEWCALL, 0)/self.arrived[NEWCALL] \
+              if self.arrived.get(NEWCALL) else 0
+        return CBP + (10 * HFP)
+
+    def serverUtilisation(self) -> float:
+        """ Calculate the server utilisation of the replay, as the busy time of
+        the servers up to the final arrival over that time.
+
+        Returns:
+            - float :: Server utilisation value
+        """
+        return self.busy_time/self.sim_time
+
+    def report(self) -> None:
+        """ Display the results of the replay is a readible fashion. """
+
+        print("\tEvents Handled ::")
+        print("\t\tArrival:", self.num_arrival)
+        print("\t\tIncomplete events:", self.num_busy)
+        print("\t\tDeparture:", self.num_arrival - self.num_blocked - self.num_busy)
+        print("\t\tBlocked:", self.num_blocked)
+
+        print("\tBlocking rate:", self.blockingProbability())
+        print("\tServer Utilisation:", self.serverUtilisation())
@@ -0,0 +1,117 @@
+from heapq import heappush, heappop
+
+import numpy
+
+from Event import Event
+from Streams import Streams
+from Distributions import Distribution
+
+class VectorMMCC:
+    """ Simulation object conducting the MMCC system over pre-generated blocks
+    of inter-arrival and service times. No event objects are created: the only
+    state kept is a heap of the departure times of the busy servers, from which
+    every departure that precedes an arrival is removed before the arrival is
+    admitted or blocked.
+    """
+
+    def run(self, total_servers: int, total_arrival: int, block: int = 2**16,
+            seed: int = None, arrival_rate: float = None,
+            departure_rate: float = None, arrival: Distribution = None,
+            service: Distribution = None) -> None:
+        """ Begin the simulation of a MMCC system. Rates that are not given are
+        taken from Event.arrivalRate and Event.departureRate.
+
+        Params:
+            - total_servers :: The number of servers that can handle clients at
+                               any one instance.
+            - total_arrival :: The total number of clients that can be handled
+                               within the simulation.
+            - block :: The number of variates generated by NumPy at a time.
+            - seed :: An integer, SeedSequence or Streams the random streams of
+                      the run are drawn from. Fresh entropy is used if None.
+            - arrival_rate :: The arrival rate of clients for this run.
+            - departure_rate :: The departure rate of clients for this run.
+            - arrival :: The Distribution of the inter-arrival times, scaled to
+                         the arrival rate. If None, that of the arrival stream
+                         of a Streams seed, otherwise exponential.
+            - service :: The Distribution of the service times, scaled to the
+                         departure rate. If None, that of the service stream
+                         of a Streams seed, otherwise exponential.
+        """
+
+        if arrival_rate is None: arrival_rate = Event.arrivalRate
+        if departure_rate is None: departure_rate = Event.departureRate
+
+        streams = seed if isinstance(seed, Streams) else Streams(seed)
+        arrival_stream = streams.arrival.generator
+        service_stream = streams.service.generator
+        arrival_shape = arrival or streams.arrival.distribution
+        service_shape = service or streams.service.distribution
+        arrival_mean = 1/arrival_rate     # Mean inter-arrival time
+        service_mean = 1/departure_rate   # Mean service time
+
+        busy = []         # Departure times of the busy servers (binary heap)
+        blocked = 0       # Number of blocked arrivals
+        busy_time = 0.0   # Summed service time of the admitted arrivals
+        clock = 0.0       # Time of the latest arrival
+
+        remaining = total_arrival
+        while remaining:
+            size = min(block, remaining)
+
+            # Generate the arrival times of the block, the first arrival of the
+            # simulation occurs at time zero
+            gaps = arrival_shape.sample(arrival_stream, size)*arrival_mean
+            if remaining == total_arrival: gaps[0] = 0
+            arrivals = (clock + numpy.cumsum(gaps)).tolist()
+            services = (service_shape.sample(service_stream, size)*service_mean).tolist()
+
+            for arrival, service in zip(arrivals, services):
+                # Release the servers of the calls that departed
+                while busy and busy[0] <= arrival:
+                    heappop(busy)
+
+                if len(busy) < total_servers:
+                    heappush(busy, arrival + service)
+                    busy_time += service
+                else:
+                    blocked += 1
+
+            clock = arrivals[-1]
+            remaining -= size
+
+        self.num_arrival = total_arrival
+        self.num_blocked = blocked
+        self.num_busy = len(busy)
+        self.sim_time = clock
+        # Remove the service still to be given beyond the end of the run
+        self.busy_time = busy_time - sum(d - clock for d in busy)
+
+    def blockingProbability(self) -> float:
+        """ Calculate the blocking probability for the previous simulation run.
+
+        Returns:
+            - float :: Probability of blocking
+        """
+        return self.num_blocked/self.num_arrival
+
+    def serverUtilisation(self) -> float:
+        """ Calculate the server utilisation for the previous simulation run, as
+        the busy time of the servers up to the final arrival over that time.
+
+        Returns:
+            - float :: Server utilisation value
+        """
+        return self.busy_time/self.sim_time
+
+    def report(self) -> None:
+        """ Display the results of the simulation is a readible fashion. """
+
+        print("\tEvents Handled ::")
+        print("\t\tArrival:", self.num_arrival)
+        print("\t\tIncomplete events:", self.num_busy)
+        print("\t\tDeparture:", self.num_arrival - self.num_blocked - self.num_busy)
+        print("\t\tBlocked:", self.num_blocked)
+
+        print("\tBlocking rate:", self.blockingProbability())
+        print("\tServer Utilisation:", self.serverUtilisation())
@@ -0,0 +1,111 @@
+import numpy
+
+def mser(series, limit: float = 0.5) -> int:
+    """ The MSER truncation point of a series, the number of leading values
+    whose removal minimises the marginal standard error of the remaining mean
+        MSER(d) = sum_{i > d} (x_i - mean_d)^2 / (n - d)^2
+    evaluated for every d at once from suffix sums. Only truncation points up
+    to a limit of the series are considered, beyond which the statistic is too
+    noisy to be trusted.
+
+    Params:
+        - series :: The values, usually batch means, in order of observation.
+        - limit :: The largest proportion of the series that may be truncated.
+
+    Returns:
+        - int :: The number of leading values to discard.
+    """
+    series = numpy.asarray(series, dtype=float)
+    remaining = len(series) - numpy.arange(len(series))
+    total = numpy.cumsum(series[::-1])[::-1]
+    squares = numpy.cumsum((series*series)[::-1])[::-1]
+    statistic = (squares - total*total/remaining)/(remaining*remaining)
+    return int(numpy.argmin(statistic[:int(limit*len(series)) + 1]))
+
+class MSERDetector:
+    """ On the fly MSER-5 warm up detection for a Statistics accumulator. Every
+    interval arrivals, starting from batches of five, the blocked arrivals,
+    the arrivals, the occupancy area and the elapsed time of the batch are
+    recorded as four scalars, from which the per batch blocking and mean
+    occupancy series are formed. Only the O(1) running totals are read at the
+    end of a batch; the full totals, which take time in the number of busy
+    servers to settle and copy, are snapshot once every check batches only.
+    Whenever enough batches have been seen the MSER truncation point of both
+    series is found, rounded up to the next snapshot, and detection ends once
+    it lies within the first half of the batches, the truncation being
+    accepted as the end of the warm up.
+
+    At most capacity batches are held: when full each pair of adjacent batches
+    is merged into one and the interval doubled, so the memory used is bounded
+    however long the transient lasts.
+    """
+
+    def __init__(self, start: "Statistics", batch: int = 5, minimum: int = 40,
+                 check: int = 16, capacity: int = 1024):
+        """ Initialise the detector
+
+        Params:
+            - start :: The totals at the start of the run.
+            - batch :: The number of arrivals in each batch to begin with.
+            - minimum :: The number of batches needed before detection.
+            - check :: The number of batches between snapshots and detection
+                       attempts.
+            - capacity :: The largest number of batches held, a multiple of
+                          twice check so that merging keeps snapshots aligned.
+        """
+        self.interval = batch      # Number of arrivals between batches
+        self.minimum = minimum
+        self.check = check
+        self.capacity = capacity
+        self.series = []           # Blocked, arrivals, area and time of each batch
+        self.last = (0, 0, 0.0, 0.0) # Running totals at the end of the last batch
+        self.snapshots = [start]   # Settled totals every check batches
+
+    def observe(self, stats) -> "Statistics":
+        """ Record the end of a batch, attempting detection every check batches.
+
+        Params:
+            - stats :: The accumulator being followed, with its occupancy
+                       brought up to the time of the latest arrival.
+
+        Returns:
+            - Statistics :: The totals at the end of the warm up once detected,
+                            otherwise None.
+        """
+        totals = (stats.blocked, stats.arrivals, stats.area, stats.time)
+        self.series.append(tuple(b - a for a, b in zip(self.last, totals)))
+        self.last = totals
+
+        if len(self.series) % self.check:
+            return None
+        stats.settle(stats.time)
+        self.snapshots.append(stats.totals())
+
+        if len(self.series) >= self.capacity:
+            self.series = [tuple(a + b for a, b in zip(first, second))
+                           for first, second in zip(self.series[::2], self.series[1::2])]
+            self.snapshots = self.snapshots[::2]
+            self.interval *= 2
+
+        if len(self.series) < self.minimum:
+            return None
+        return self.detect()
+
+    def detect(self) -> "Statistics":
+        """ Find the MSER truncation point of the batches seen so far.
+
+        Returns:
+            - Statistics :: The totals at the truncation point, rounded up to a
+                            snapshot, if it lies within the first half of the
+                            batches, otherwise None.
+        """
+        blocked, arrivals, area, elapsed = numpy.array(self.series).T
+
+        blocking = blocked/arrivals
+        occupancy = numpy.divide(area, elapsed, out = numpy.zeros(len(elapsed)),
+                                 where = elapsed > 0)
+
+        snapshot = -(-max(mser(blocking), mser(occupancy))//self.check)
+        if 2*snapshot*self.check >= len(self.series):
+            return None
+        return self.snapshots[snapshot]
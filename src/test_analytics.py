@@ -0,0 +1,38 @@
+import numpy
+import pytest
+
+import Analytics
+
+# A guard channel system, its parameters in the order of Analytics.guardChannel
+GUARD = (16, 2, 0.03, 0.1, 0.01)
+
+def birthDeath(servers, threshold, handover_rate, newcall_rate, departure_rate):
+    """ Blocking probabilities of the guard channel system found directly from
+    the product form of its birth-death chain, for comparison with the
+    recursion of Analytics.guardChannel.
+    """
+    weights = [1.0]
+    for n in range(1, servers + 1):
+        arrival = handover_rate + newcall_rate if n - 1 < servers - threshold else handover_rate
+        weights.append(weights[-1]*arrival/(n*departure_rate))
+    pi = numpy.array(weights)/sum(weights)
+    return pi[servers], pi[servers - threshold:].sum()
+
+def test_guard_channel_matches_birth_death():
+    for params in (GUARD, (10, 0, 0.0, 0.1, 0.01), (30, 5, 0.2, 0.3, 0.02)):
+        assert Analytics.guardChannel(*params) == pytest.approx(birthDeath(*params))
+
+def test_erlang_b_is_guard_channel_without_reservation():
+    assert Analytics.erlangB(10, 10) == pytest.approx(birthDeath(10, 0, 0.0, 0.1, 0.01)[0])
+
+def test_erlang_b_does_not_overflow():
+    blocking = Analytics.erlangB(numpy.array([1e4, 2e4]), 10**4)
+    assert numpy.isfinite(blocking).all() and (blocking > 0).all() and (blocking < 1).all()
+
+def test_erlang_distribution_matches_erlang_b():
+    distribution = Analytics.erlangDistribution(10, 10)
+    assert distribution.sum() == pytest.approx(1)
+    assert distribution[-1] == pytest.approx(Analytics.erlangB(10, 10))
+
+def test_erlang_distribution_without_load():
+    assert Analytics.erlangDistribution(0, 3).tolist() == [1, 0, 0, 0]
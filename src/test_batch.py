@@ -0,0 +1,21 @@
+import numpy
+
+import Analytics
+from BatchSimulation import BatchCC
+
+# A guard channel system, its parameters in the order of Analytics.guardChannel
+GUARD = (16, 2, 0.03, 0.1, 0.01)
+
+def test_batch_matches_guard_channel():
+    machine = BatchCC()
+    servers, threshold, handover_rate, newcall_rate, departure_rate = GUARD
+    machine.run(numpy.full(64, servers), 20000, threshold, handover_rate, newcall_rate,
+                departure_rate, seed = 1)
+    blocking = machine.blockingProbability()
+    error = blocking.std(ddof = 1)/numpy.sqrt(len(blocking))
+    assert abs(blocking.mean() - Analytics.aggregatedBlocking(*GUARD)) < 4*error
+
+def test_batch_systems_stop_at_their_arrivals():
+    machine = BatchCC()
+    machine.run(10, numpy.array([100, 1000, 5000]), seed = 1)
+    assert machine.num_arrival.tolist() == [100, 1000, 5000]
@@ -0,0 +1,42 @@
+import os
+
+from Cache import Cache
+from Markov import MarkovCC
+from Simulation import MMCC
+
+PARAMS = {"total_servers": 10, "total_arrival": 2000}
+
+def test_repeated_runs_are_read_from_the_cache(tmp_path):
+    cache = Cache(str(tmp_path))
+    first = cache.run(MMCC, 4, retain = False, **PARAMS)
+    second = cache.run(MMCC, 4, retain = False, **PARAMS)
+    assert not first.cached and second.cached
+    assert second.blockingProbability() == first.blockingProbability()
+    assert len(os.listdir(str(tmp_path))) == 1
+
+def test_keys_follow_the_content_of_a_run(tmp_path):
+    cache = Cache(str(tmp_path))
+    key = cache.key(MMCC, 4, PARAMS)
+    assert key == cache.key(MMCC, 4, dict(reversed(list(PARAMS.items()))))
+    assert key != cache.key(MMCC, 5, PARAMS)
+    assert key != cache.key(MarkovCC, 4, PARAMS)
+    assert key != cache.key(MMCC, 4, dict(PARAMS, total_servers = 11))
+
+def test_unseeded_runs_are_not_cached(tmp_path):
+    cache = Cache(str(tmp_path))
+    assert not cache.run(MarkovCC, **PARAMS).cached
+    assert not cache.run(MarkovCC, **PARAMS).cached
+    assert os.listdir(str(tmp_path)) == []
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = Cache(str(tmp_path))
+    keys = [cache.key(MarkovCC, seed, PARAMS) for seed in (1, 2, 3)]
+    for seed in (1, 2):
+        cache.run(MarkovCC, seed, **PARAMS)
+    os.utime(cache.path(keys[0]), (1, 1))
+    os.utime(cache.path(keys[1]), (2, 2))
+    cache.get(keys[0])      # Touches the older entry
+    cache.max_bytes = 2.5*os.path.getsize(cache.path(keys[0]))
+    cache.run(MarkovCC, 3, **PARAMS)
+    assert sorted(os.listdir(str(tmp_path))) == sorted(key + ".pkl" for key in
+                                                       (keys[0], keys[2]))
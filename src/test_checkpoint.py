@@ -0,0 +1,52 @@
+import pytest
+
+import Checkpoint
+import Trace
+from Instrumentation import Instrument
+from Simulation import MMCC, M1M2CC
+
+@pytest.mark.parametrize("model, extra", [(MMCC, ()), (M1M2CC, (2,))])
+def test_resume_is_bit_identical(tmp_path, model, extra):
+    path = str(tmp_path/"run.ckpt")
+    whole = model()
+    whole.run(10, 10000, *extra, retain = False, seed = 1)
+
+    model().run(10, 5000, *extra, retain = False, seed = 1, checkpoint = path)
+    resumed = Checkpoint.load(path)
+    resumed.resume(10000)
+
+    assert resumed.blockingProbability() == whole.blockingProbability()
+    assert resumed.serverUtilisation() == whole.serverUtilisation()
+    assert resumed.sim_time == whole.sim_time
+
+def test_fork_continues_original_streams():
+    machine = MMCC()
+    machine.run(10, 5000, False, seed = 1)
+    copy = Checkpoint.fork(machine)
+    machine.resume(10000)
+    copy.resume(10000)
+    assert copy.blockingProbability() == machine.blockingProbability()
+
+def test_checkpoint_refuses_trace(tmp_path):
+    with Trace.TraceWriter(str(tmp_path/"run.trc")) as trace:
+        with pytest.raises(ValueError):
+            MMCC().run(10, 100, checkpoint = str(tmp_path/"run.ckpt"), trace = trace)
+
+def test_checkpoint_refuses_instrument(tmp_path):
+    with pytest.raises(ValueError):
+        MMCC().run(10, 100, checkpoint = str(tmp_path/"run.ckpt"), instrument = Instrument())
+
+def test_resume_refuses_instrumented_run(tmp_path):
+    machine = MMCC()
+    machine.run(10, 1000, seed = 1, instrument = Instrument())
+    with pytest.raises(ValueError):
+        machine.resume(2000, checkpoint = str(tmp_path/"run.ckpt"))
+
+def test_checkpoint_leaves_out_retained_events(tmp_path):
+    sizes = []
+    for arrivals in (10000, 100000):
+        path = tmp_path/"run{}.ckpt".format(arrivals)
+        MMCC().run(10, arrivals, True, seed = 1, checkpoint = str(path))
+        sizes.append(path.stat().st_size)
+    assert sizes[1] < 1.5*sizes[0]
+    assert not Checkpoint.load(str(path)).events.departed
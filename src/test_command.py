@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+import Command
+
+def test_main_writes_a_row_per_run(tmp_path):
+    output = tmp_path/"rows.json"
+    assert Command.main(["MMCC", "--servers", "4", "--arrivals", "100", "--runs", "3",
+                         "--seed", "1", "--output", str(output)]) == 0
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(rows) == 3 and len({row["seed"] for row in rows}) == 3
+
+def test_runs_repeat_from_the_root_seed():
+    first = Command.simulate("MarkovCC", dict(total_servers = 4, total_arrival = 100), 2, 1)
+    second = Command.simulate("MarkovCC", dict(total_servers = 4, total_arrival = 100), 2, 1)
+    assert [r["blocking"] for r in first] == [r["blocking"] for r in second]
+
+@pytest.mark.parametrize("argv", [
+    ["MMCC", "--servers", "4"],
+    ["M1M2CC", "--servers", "4", "--arrivals", "10"],
+    ["MMCC", "--servers", "4", "--arrivals", "10", "--threshold", "2"],
+    ["MarkovCC", "--servers", "4", "--arrivals", "10", "--policy", "random"]
+])
+def test_usage_errors_exit(argv):
+    with pytest.raises(SystemExit):
+        Command.main(argv)
+
+def test_simulation_errors_are_not_usage_errors(monkeypatch):
+    def failing(*args, **kwargs):
+        raise TypeError("inside the simulation")
+    monkeypatch.setattr(Command, "simulate", failing)
+    with pytest.raises(TypeError, match = "inside the simulation"):
+        Command.main(["MMCC", "--servers", "4", "--arrivals", "10"])
@@ -0,0 +1,33 @@
+import numpy
+import pytest
+
+from Distributions import Distribution, Exponential, Erlang, Hyperexponential, \
+                          Lognormal, Deterministic, Empirical
+from Streams import Streams
+from VectorSimulation import VectorMMCC
+
+SHAPES = [Exponential(), Erlang(4), Hyperexponential.balanced(4), Lognormal(2),
+          Deterministic(), Empirical([1.0, 2.0, 6.0])]
+
+@pytest.mark.parametrize("shape", SHAPES, ids = repr)
+def test_shapes_have_unit_mean_and_their_scv(shape):
+    variates = shape.sample(numpy.random.default_rng(1), 400000)
+    assert variates.mean() == pytest.approx(1, rel = 0.02)
+    assert variates.var() == pytest.approx(shape.scv(), rel = 0.1, abs = 1e-9)
+
+def test_shapes_must_give_their_samples_and_scv():
+    with pytest.raises(TypeError):
+        Distribution()
+    with pytest.raises(ValueError):
+        Erlang(0)
+    with pytest.raises(ValueError):
+        Hyperexponential.balanced(0.5)
+
+def test_vector_runs_honour_the_distributions_of_streams():
+    given, carried = VectorMMCC(), VectorMMCC()
+    given.run(10, 20000, seed = 2, arrival = Deterministic(), service = Erlang(2))
+    carried.run(10, 20000, seed = Streams(2, arrival = Deterministic(), service = Erlang(2)))
+    assert carried.blockingProbability() == given.blockingProbability()
+    plain = VectorMMCC()
+    plain.run(10, 20000, seed = 2)
+    assert plain.blockingProbability() != given.blockingProbability()
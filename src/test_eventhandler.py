@@ -0,0 +1,25 @@
+from Event import Event
+from EventHandler import EventHandler
+
+def test_events_leave_in_time_order():
+    handler = EventHandler()
+    times = [5.0, 1.0, 4.0, 2.0, 3.0]
+    for time in times:
+        handler.add(Event.fromCall(time, 1.0))
+    assert len(handler) == len(times)
+    assert [handler.next().time() for _ in times] == sorted(times)
+    assert len(handler) == 0
+
+def test_equal_times_leave_in_insertion_order():
+    handler = EventHandler()
+    events = [Event.fromCall(1.0, service) for service in (3.0, 1.0, 2.0)]
+    for event in events:
+        handler.add(event)
+    assert [handler.next() for _ in events] == events
+
+def test_unretained_events_are_only_counted():
+    handler = EventHandler(retain = False)
+    handler.depart(Event.fromCall(0.0, 2.0))
+    handler.block(Event.fromCall(1.0, 1.0))
+    assert handler.departed == [] and handler.blocked == []
+    assert handler.stats.blocked == 1
@@ -0,0 +1,37 @@
+import pytest
+
+import Analytics
+from Markov import MarkovCC
+
+# A guard channel system, its parameters in the order of Analytics.guardChannel
+GUARD = (16, 2, 0.03, 0.1, 0.01)
+
+def test_markov_mmcc_matches_erlang():
+    machine = MarkovCC()
+    machine.run(10, 200000, arrival_rate = 0.1, departure_rate = 0.01, seed = 1)
+    assert machine.blockingProbability() == pytest.approx(Analytics.erlangB(10, 10), rel = 0.05)
+    assert machine.serverUtilisation() == pytest.approx(Analytics.erlangUtilisation(10, 10),
+                                                        rel = 0.05)
+
+def test_markov_guard_channel_matches_analytic():
+    machine = MarkovCC()
+    servers, threshold, handover_rate, newcall_rate, departure_rate = GUARD
+    machine.run(servers, 200000, threshold, handover_rate, newcall_rate, departure_rate, seed = 1)
+    assert machine.blockingProbability() == pytest.approx(Analytics.aggregatedBlocking(*GUARD),
+                                                          rel = 0.05)
+
+def test_markov_counts_beyond_int16():
+    # Nearly every call is still held at the end, more busy servers than an
+    # int16 can count
+    machine = MarkovCC()
+    machine.run(32800, 32800, arrival_rate = 100, departure_rate = 1e-9, seed = 1,
+                block = 64, chunk = 2**12)
+    assert machine.num_blocked == 0
+    assert 32767 < machine.num_busy <= 32800
+
+def test_markov_runs_are_reproducible():
+    first, second = MarkovCC(), MarkovCC()
+    first.run(10, 10000, seed = 7)
+    second.run(10, 10000, seed = 7)
+    assert first.blockingProbability() == second.blockingProbability()
+    assert first.num_arrival == 10000
@@ -0,0 +1,48 @@
+import pytest
+
+import Analytics
+import Network as network_module
+from Network import Network, ring, torus, torusNetwork
+
+def test_torus_cells_have_four_distinct_neighbours():
+    grid = torus(3, 4)
+    assert len(grid) == 12
+    assert all(len(cells) == 4 for cells in grid)
+    assert grid[0] == [1, 3, 4, 8]
+    assert ring(4)[0] == [1, 3]
+    assert len(torus(2, 4)[0]) == 3    # The cells above and below coincide
+
+def test_isolated_cells_match_erlang():
+    network = Network()
+    network.run([[]], 200000, total_servers = 10, threshold = 0, newcall_rate = 0.1,
+                seed = 1)
+    assert sum(network.handed) == 0
+    assert network.blockingProbability() == pytest.approx(Analytics.erlangB(10, 10),
+                                                          rel = 0.05)
+
+class InlinePool:
+    """ Stand in for a process pool, running the strips in order and keeping
+    their tasks """
+
+    tasks = []
+
+    def __init__(self, processes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        return False
+
+    def map(self, function, tasks):
+        InlinePool.tasks = list(tasks)
+        return map(function, InlinePool.tasks)
+
+def test_strips_are_at_least_three_rows_high(monkeypatch):
+    monkeypatch.setattr(network_module, "ProcessPoolExecutor", InlinePool)
+    network = torusNetwork(7, 3, 4000, processes = 4, seed = 1)
+    assert [task[0] for task in InlinePool.tasks] == [4, 3]
+    assert network.cells == 21
+    assert sum(network.arrived) == 4000
+    assert sum(network.handed) > 0
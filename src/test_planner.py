@@ -0,0 +1,26 @@
+import pytest
+
+import Planner
+
+def test_fewest_confirms_the_count_below():
+    sides = {3: 1, 4: -1, 5: -1}
+    assert Planner.fewest(sides.get, 5) == (4, True)
+    assert Planner.fewest(sides.get, 3) == (4, True)
+
+def test_fewest_never_passes_an_undecided_count():
+    sides = {3: 1, 4: 0, 5: -1}
+    assert Planner.fewest(sides.get, 4) == (5, False)
+    assert Planner.fewest(sides.get, 5) == (5, False)
+
+def test_fewest_refuses_past_the_largest_count():
+    with pytest.raises(ValueError):
+        Planner.fewest(lambda count: 1, 0, 0, 3)
+
+def test_maximum_arrival_rate_within_grid_cost():
+    plan = Planner.maximumArrivalRate(16, seed = 1)
+    assert plan["runs"] < 50 and plan["resolved"]
+    assert plan["bracket"][0] <= plan["analytic"] <= plan["bracket"][1]
+
+def test_minimum_threshold_matches_guard_channel():
+    plan = Planner.minimumThreshold(16, 0.03, 0.1, seed = 1)
+    assert plan["threshold"] == plan["analytic"] and plan["resolved"]
@@ -0,0 +1,46 @@
+import pytest
+
+import Analytics
+from Replication import Estimate, tQuantile, replicate, batchMeans, pairedComparison
+
+def test_t_quantiles_match_the_tables():
+    assert tQuantile(0.975, 1) == pytest.approx(12.7062, rel = 1e-4)
+    assert tQuantile(0.975, 2) == pytest.approx(4.3027, rel = 1e-4)
+    assert tQuantile(0.975, 10) == pytest.approx(2.2281, rel = 1e-3)
+    assert tQuantile(0.975, 30) == pytest.approx(2.0423, rel = 1e-4)
+
+def test_estimate_interval():
+    estimate = Estimate([1.0, 2.0, 3.0])
+    low, high = estimate.interval()
+    assert estimate.mean == 2.0
+    assert high - low == pytest.approx(2*4.3027/3**0.5, rel = 1e-4)
+    assert Estimate([1.0, 1.0]).relativeHalfWidth() == 0.0
+
+def test_replication_stops_at_the_precision():
+    estimates = replicate("MarkovCC", {"total_servers": 10, "total_arrival": 20000,
+                                       "arrival_rate": 0.1, "departure_rate": 0.01},
+                          precision = 0.05, seed = 1, metrics = ("blocking",))
+    blocking = estimates["blocking"]
+    assert blocking.relativeHalfWidth() <= 0.05
+    assert blocking.samples >= 5
+    assert abs(blocking.mean - Analytics.erlangB(10, 10)) < 2*blocking.half_width
+
+def test_batch_means_discard_the_leading_batches():
+    estimates = batchMeans("MMCC", {"total_servers": 10, "total_arrival": 20000,
+                                    "arrival_rate": 0.1, "departure_rate": 0.01},
+                           batches = 10, discard = 2, seed = 1)
+    assert estimates["blocking"].samples == 8
+    with pytest.raises(ValueError):
+        batchMeans("MMCC", {"total_arrival": 100}, batches = 2, discard = 1)
+
+def test_common_random_numbers_reduce_the_variance():
+    configurations = [{"threshold": 1}, {"threshold": 2}]
+    fixed = {"total_servers": 16, "total_arrival": 5000, "handover_rate": 0.03,
+             "newcall_rate": 0.1, "departure_rate": 0.01}
+    comparison = pairedComparison("M1M2CC", configurations, replications = 8, seed = 1,
+                                  **fixed)
+    baseline, other = comparison
+    assert baseline["variance"] == 0
+    independent = baseline["estimate"].half_width**2 + other["estimate"].half_width**2
+    assert other["difference"].half_width**2 < independent/2
+    assert other["difference"].mean < 0    # Guarding more servers spares hand overs
@@ -0,0 +1,38 @@
+import errno
+import os
+
+import numpy
+import pytest
+
+import Results
+
+def test_query_reads_back_rows(tmp_path):
+    with Results.ResultStore(str(tmp_path/"store"), chunk = 2) as store:
+        for rate in (0.1, 0.2, 0.3):
+            store.append({"model": "MMCC", "arrival_rate": rate, "blocking": rate/10})
+        store.append({"model": "M1M2CC", "threshold": 2, "blocking": 0.5})
+
+    assert len(store) == 4 and len(store.chunks()) == 2
+    rows = store.query(["arrival_rate", "blocking"], model = "MMCC")
+    assert rows["arrival_rate"].tolist() == [0.1, 0.2, 0.3]
+    assert numpy.isnan(store.query(["arrival_rate"], model = "M1M2CC")["arrival_rate"]).all()
+    assert store.query(["blocking"], where = lambda c: c["blocking"] > 0.025)["blocking"].size == 2
+
+def test_flush_skips_chunks_taken_by_other_writers(tmp_path):
+    store = Results.ResultStore(str(tmp_path/"store"))
+    os.makedirs(os.path.join(store.directory, "00000000", "taken"))
+    os.makedirs(os.path.join(store.directory, "00000001", "taken"))
+    store.chunks = lambda: []   # As if the other chunks appeared after listing
+    store.append({"blocking": 0.1})
+    store.flush()
+    assert os.path.exists(os.path.join(store.directory, "00000002", "blocking.npy"))
+
+def test_flush_raises_other_errors(tmp_path, monkeypatch):
+    store = Results.ResultStore(str(tmp_path/"store"))
+    def denied(source, destination):
+        raise PermissionError(errno.EACCES, "denied")
+    monkeypatch.setattr(Results.os, "rename", denied)
+    store.append({"blocking": 0.1})
+    with pytest.raises(PermissionError):
+        store.flush()
+    assert not os.listdir(store.directory)
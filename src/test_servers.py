@@ -0,0 +1,34 @@
+import numpy
+import pytest
+
+from Servers import Servers
+
+def test_fifo_allocates_the_longest_free_server():
+    servers = Servers(3)
+    assert [servers.allocate() for _ in range(3)] == [1, 2, 3]
+    assert not servers.isFree()
+    servers.deallocate(2)
+    servers.deallocate(1)
+    assert servers.allocate() == 2
+
+def test_lowest_allocates_the_lowest_free_server():
+    servers = Servers(3, "lowest")
+    assert [servers.allocate() for _ in range(3)] == [1, 2, 3]
+    servers.deallocate(3)
+    servers.deallocate(1)
+    assert servers.allocate() == 1
+
+def test_random_allocation_follows_the_generator():
+    orders = []
+    for _ in range(2):
+        servers = Servers(10, "random", numpy.random.default_rng(3))
+        orders.append([servers.allocate() for _ in range(10)])
+    assert orders[0] == orders[1]
+    assert sorted(orders[0]) == list(range(1, 11))
+
+def test_freeing_an_idle_server_is_refused():
+    servers = Servers(2)
+    with pytest.raises(ValueError):
+        servers.deallocate(1)
+    with pytest.raises(ValueError):
+        Servers(2, "busiest")
@@ -0,0 +1,29 @@
+import numpy
+import pytest
+
+import Sources
+from Event import HANDOVER, NEWCALL
+
+def writeLog(path, paths):
+    path.write_text("arrival,holding,path\n" + "".join(
+        "{},{},{}\n".format(i, 5, p) for i, p in enumerate(paths)))
+
+def test_csv_source_reads_names_and_codes(tmp_path):
+    writeLog(tmp_path/"calls.csv", ["handover", "newcall", "0", "1"])
+    calls = list(Sources.CSVSource(str(tmp_path/"calls.csv")))
+    assert [path for _, _, path in calls] == [HANDOVER, NEWCALL, HANDOVER, NEWCALL]
+    assert [arrival for arrival, _, _ in calls] == [0, 1, 2, 3]
+
+@pytest.mark.parametrize("path", ["2", "-1", "roaming"])
+def test_csv_source_rejects_unknown_paths(tmp_path, path):
+    writeLog(tmp_path/"calls.csv", ["newcall", "handover", path])
+    with pytest.raises(ValueError, match = "row 4"):
+        list(Sources.CSVSource(str(tmp_path/"calls.csv"), chunk = 2))
+
+def test_binary_source_rejects_unknown_paths(tmp_path):
+    class Calls(Sources.CallSource):
+        def chunks(self):
+            yield numpy.arange(3.0), numpy.ones(3), numpy.array([NEWCALL, 7, HANDOVER])
+    Sources.convert(Calls(), str(tmp_path/"calls.trc"))
+    with pytest.raises(ValueError, match = "call 2"):
+        list(Sources.BinarySource(str(tmp_path/"calls.trc")))
@@ -0,0 +1,37 @@
+import statistics
+
+import pytest
+
+import Analytics
+from Simulation import MMCC
+
+def test_occupancy_matches_erlang_distribution():
+    machine = MMCC()
+    machine.run(10, 200000, False, 0.1, 0.01, seed = 1)
+    occupancy = machine.occupancyDistribution()
+    assert sum(occupancy) == pytest.approx(1)
+    expected = Analytics.erlangDistribution(10, 10)
+    assert max(abs(a - b) for a, b in zip(occupancy, expected)) < 0.01
+
+def test_server_utilisations_sum_to_busy_servers():
+    machine = MMCC()
+    machine.run(10, 20000, False, 0.1, 0.01, seed = 1)
+    assert sum(machine.perServerUtilisation().values()) == \
+           pytest.approx(machine.serverUtilisation())
+
+def test_service_moments_match_the_departed_events():
+    machine = MMCC()
+    machine.run(10, 5000, True, 0.1, 0.01, seed = 1)
+    services = [event.serviceTime() for event in machine.events.departed]
+    stats = machine.events.stats
+    assert stats.departed == len(services)
+    assert stats.mean == pytest.approx(statistics.mean(services))
+    assert stats.variance() == pytest.approx(statistics.variance(services))
+
+def test_unretained_runs_give_the_same_results():
+    kept, streamed = MMCC(), MMCC()
+    kept.run(10, 5000, True, 0.1, 0.01, seed = 1)
+    streamed.run(10, 5000, False, 0.1, 0.01, seed = 1)
+    assert streamed.events.departed == [] and streamed.events.blocked == []
+    assert streamed.blockingProbability() == kept.blockingProbability()
+    assert streamed.serverUtilisation() == kept.serverUtilisation()
@@ -0,0 +1,27 @@
+import numpy
+import pytest
+
+from Streams import Streams
+from Simulation import MMCC
+
+def test_equal_seeds_give_equal_streams():
+    first, second = Streams(11), Streams(11)
+    assert [first.arrival.draw(1.0) for _ in range(5)] == \
+           [second.arrival.draw(1.0) for _ in range(5)]
+    reused = numpy.random.SeedSequence(11)
+    assert Streams(reused).service.draw(1.0) == Streams(reused).service.draw(1.0)
+
+def test_streams_of_a_run_are_independent():
+    streams = Streams(11)
+    draws = [numpy.array([stream.draw(1.0) for _ in range(5000)])
+             for stream in (streams.arrival, streams.service) + streams.paths + streams.services]
+    correlation = numpy.corrcoef(draws)
+    assert numpy.abs(correlation[numpy.triu_indices(len(draws), 1)]).max() < 0.05
+    assert numpy.mean(draws[0]) == pytest.approx(1, rel = 0.05)
+
+def test_runs_on_equal_seeds_are_reproducible():
+    first, second = MMCC(), MMCC()
+    first.run(10, 5000, False, 0.1, 0.01, seed = 3)
+    second.run(10, 5000, False, 0.1, 0.01, seed = 3)
+    assert first.blockingProbability() == second.blockingProbability()
+    assert first.sim_time == second.sim_time
@@ -0,0 +1,24 @@
+import pytest
+
+from Sweep import parameterGrid, sweep
+
+def test_grid_varies_the_last_axis_fastest():
+    grid = parameterGrid(total_servers = [8, 16], arrival_rate = [0.1, 0.2])
+    assert grid == [{"total_servers": 8, "arrival_rate": 0.1},
+                    {"total_servers": 8, "arrival_rate": 0.2},
+                    {"total_servers": 16, "arrival_rate": 0.1},
+                    {"total_servers": 16, "arrival_rate": 0.2}]
+
+def test_sweeps_do_not_depend_on_the_workers():
+    points = parameterGrid(total_servers = [8, 16], arrival_rate = [0.1, 0.2])
+    rows = [sweep("MMCC", points, seed = 5, processes = processes, total_arrival = 2000)
+            for processes in (1, 2)]
+    for first, second in zip(*rows):
+        assert first["seed"] == second["seed"]
+        assert first["blocking"] == second["blocking"]
+        assert first["utilisation"] == second["utilisation"]
+    assert len({row["seed"] for row in rows[0]}) == len(points)
+
+def test_unknown_models_are_refused():
+    with pytest.raises(ValueError):
+        sweep("MMMC", [{}])
@@ -0,0 +1,24 @@
+import pytest
+
+import Trace
+from Simulation import MMCC, M1M2CC
+
+@pytest.mark.parametrize("threshold", [None, 2])
+def test_replay_matches_trace(tmp_path, threshold):
+    path = str(tmp_path/"run.trc")
+    machine = MMCC() if threshold is None else M1M2CC()
+    extra = () if threshold is None else (threshold,)
+    with Trace.TraceWriter(path) as trace:
+        machine.run(10, 20000, *extra, retain = False, seed = 3, trace = trace)
+
+    records = Trace.read(path)
+    replay = Trace.Replay()
+    replay.run(10, Trace.calls(records), threshold)
+    assert replay.num_blocked == (records["kind"] == Trace.BLOCK).sum()
+    assert replay.blockingProbability() == machine.blockingProbability()
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path/"other.bin"
+    path.write_bytes(b"not a trace file")
+    with pytest.raises(ValueError):
+        Trace.read(str(path))
@@ -0,0 +1,32 @@
+import numpy
+
+from Simulation import MMCC
+from Statistics import Statistics
+from Warmup import MSERDetector, mser
+
+def test_mser_finds_transient():
+    series = numpy.r_[numpy.linspace(10, 0, 50), numpy.random.default_rng(1).normal(0, 1, 450)]
+    assert 30 <= mser(series) <= 70
+
+def test_mser_keeps_stationary_series():
+    assert mser(numpy.random.default_rng(1).normal(0, 1, 500)) < 50
+
+def test_mser_warmup_of_run():
+    machine = MMCC()
+    machine.run(10, 20000, False, 0.1, 0.01, seed = 1, warmup = "mser")
+    assert 0 < machine.events.stats.warmup < 10000
+
+def test_detector_merges_whole_batches():
+    stats = Statistics(warmup = "mser")
+    stats.detector = MSERDetector(stats.totals(), minimum = 10**9, capacity = 64)
+    for arrival in range(1, 1001):
+        stats.arrive(float(arrival))
+        if arrival % 3 == 0: stats.block()
+
+    detector = stats.detector
+    blocked, arrivals, area, elapsed = numpy.array(detector.series).T
+    assert detector.interval == 20
+    assert (arrivals == detector.interval).all() and (elapsed == detector.interval).all()
+    assert blocked.sum() == stats.blocked
+    assert [s.arrivals for s in detector.snapshots] == \
+           list(range(0, 1001, detector.interval*detector.check))